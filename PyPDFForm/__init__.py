@@ -3,6 +3,14 @@
 
 __version__ = "1.4.36"
 
-from .wrapper import FormWrapper, PdfWrapper
+from .batch import FillError
+from .cache import template_cache
+from .wrapper import CompiledTemplate, FormWrapper, PdfWrapper
 
-__all__ = ["FormWrapper", "PdfWrapper"]
+__all__ = [
+    "CompiledTemplate",
+    "FillError",
+    "FormWrapper",
+    "PdfWrapper",
+    "template_cache",
+]
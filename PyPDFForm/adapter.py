@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 """Contains user input adapters."""
 
-from os.path import isfile
-from typing import Any, BinaryIO, Union
+from contextlib import contextmanager
+from mmap import ACCESS_READ, mmap
+from os import fdopen, remove, replace
+from os.path import dirname, getsize, isfile, realpath
+from shutil import copymode
+from tempfile import mkstemp
+from typing import Any, BinaryIO, Iterator, Union
 
 
 def readable(obj: Any) -> bool:
@@ -12,7 +17,7 @@ def readable(obj: Any) -> bool:
 
 
 def fp_or_f_obj_or_stream_to_stream(
-    fp_or_f_obj_or_stream: Union[bytes, str, BinaryIO]
+    fp_or_f_obj_or_stream: Union[bytes, bytearray, memoryview, str, BinaryIO]
 ) -> bytes:
     """Converts a file path or a file object to a stream."""
 
@@ -20,6 +25,9 @@ def fp_or_f_obj_or_stream_to_stream(
     if isinstance(fp_or_f_obj_or_stream, bytes):
         result = fp_or_f_obj_or_stream
 
+    elif isinstance(fp_or_f_obj_or_stream, (bytearray, memoryview)):
+        result = bytes(fp_or_f_obj_or_stream)
+
     elif readable(fp_or_f_obj_or_stream):
         result = fp_or_f_obj_or_stream.read()
 
@@ -27,6 +35,74 @@ def fp_or_f_obj_or_stream_to_stream(
         if not isfile(fp_or_f_obj_or_stream):
             pass
         else:
-            with open(fp_or_f_obj_or_stream, "rb+") as _file:
+            with open(fp_or_f_obj_or_stream, "rb") as _file:
                 result = _file.read()
     return result
+
+
+def fp_or_f_obj_or_stream_to_buffer(
+    fp_or_f_obj_or_stream: Union[bytes, bytearray, memoryview, str, BinaryIO]
+) -> Union[bytes, memoryview, mmap]:
+    """
+    Converts a file path or a file object to a stream, memory mapping
+    large files read-only instead of reading them and viewing buffers
+    read-only instead of copying them.
+    """
+
+    from .constants import MMAP_THRESHOLD  # pylint: disable=C0415, R0401
+
+    if isinstance(fp_or_f_obj_or_stream, (bytearray, memoryview)):
+        return memoryview(fp_or_f_obj_or_stream).cast("B").toreadonly()
+
+    if (
+        isinstance(fp_or_f_obj_or_stream, str)
+        and isfile(fp_or_f_obj_or_stream)
+        and getsize(fp_or_f_obj_or_stream) >= max(MMAP_THRESHOLD, 1)
+    ):
+        with open(fp_or_f_obj_or_stream, "rb") as _file:
+            return mmap(_file.fileno(), 0, access=ACCESS_READ)
+
+    return fp_or_f_obj_or_stream_to_stream(fp_or_f_obj_or_stream)
+
+
+def buffer_to_stream(buffer: Union[bytes, memoryview, mmap]) -> bytes:
+    """Reads a memory mapped file or a buffer, e.g. so that it can be pickled."""
+
+    return bytes(buffer) if isinstance(buffer, (memoryview, mmap)) else buffer
+
+
+@contextmanager
+def open_fp_or_f_obj(fp_or_f_obj: Union[str, BinaryIO]) -> Iterator[BinaryIO]:
+    """
+    Opens a file path for writing, or passes a file object through. An
+    existing file is not truncated but replaced by a temporary file next
+    to it once written, since truncating a memory mapped file breaks the
+    map of whatever object was created from it.
+    """
+
+    if not isinstance(fp_or_f_obj, str):
+        yield fp_or_f_obj
+        return
+
+    path = realpath(fp_or_f_obj)
+    if not isfile(path):
+        with open(path, "wb+") as _file:
+            yield _file
+        return
+
+    fd, temp_path = mkstemp(dir=dirname(path))
+    try:
+        with fdopen(fd, "wb") as _file:
+            yield _file
+        copymode(path, temp_path)
+        replace(temp_path, path)
+    except BaseException:
+        remove(temp_path)
+        raise
+
+
+def stream_to_fp_or_f_obj(stream: bytes, fp_or_f_obj: Union[str, BinaryIO]) -> None:
+    """Writes a stream to a file path or a file object."""
+
+    with open_fp_or_f_obj(fp_or_f_obj) as _file:
+        _file.write(stream)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Contains helpers for filling a PDF form with many records in parallel."""
+
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                wait)
+from concurrent.futures.process import BrokenProcessPool
+from copy import copy
+from itertools import islice
+from os import cpu_count
+from traceback import format_exc
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .constants import (PARALLEL_FILL_CHUNK_SIZE, PARALLEL_FILL_KWARGS,
+                        WIDGET_TYPES)
+from .filler import simple_fill
+
+worker_state: Dict[str, Callable[[dict], bytes]] = {}
+
+
+class FillError(Exception):
+    """A failure to fill a record, yielded in place of its filled PDF."""
+
+    def __init__(self, index: int, message: str) -> None:
+        """Constructs the failure of the record at an index."""
+
+        super().__init__(index, message)
+        self.index = index
+        self.message = message
+
+    def __str__(self) -> str:
+        """Returns the index of the record and what went wrong."""
+
+        return f"failed to fill record {self.index}: {self.message}"
+
+
+def fill_in_place(
+    wrapper, widgets: Dict[str, WIDGET_TYPES], kwargs: dict, record: dict
+) -> bytes:
+    """
+    Fills a PDF form in place with a record, setting its values on copies
+    of the widgets built once for all records.
+    """
+
+    _widgets = {key: copy(value) for key, value in widgets.items()}
+
+    for key, value in record.items():
+        if key in _widgets:
+            _widgets[key].value = value
+
+    return simple_fill(
+        wrapper.stream,
+        _widgets,
+        flatten=kwargs.get("flatten", False),
+        adobe_mode=kwargs.get("adobe_mode", False),
+    )
+
+
+def fill_kwargs(kwargs: dict) -> dict:
+    """Leaves out the options of the pool of worker processes."""
+
+    return {
+        key: value for key, value in kwargs.items() if key not in PARALLEL_FILL_KWARGS
+    }
+
+
+def init_worker(render: Callable[[dict], bytes]) -> None:
+    """Keeps the function filling records in a worker process."""
+
+    worker_state["render"] = render
+
+
+def fill_chunk(
+    chunk: List[Tuple[int, dict]],
+) -> List[Tuple[int, Union[bytes, FillError]]]:
+    """Fills a chunk of records in a worker process."""
+
+    render = worker_state["render"]
+    result = []
+
+    for index, record in chunk:
+        try:
+            result.append((index, render(record)))
+        except Exception:  # pylint: disable=W0718  # noqa: BLE001
+            result.append((index, FillError(index, format_exc())))
+
+    return result
+
+
+def submit_chunk(
+    executor: ProcessPoolExecutor, chunk: List[Tuple[int, dict]]
+) -> Future:
+    """Submits a chunk of records, failing it instead if the pool is broken."""
+
+    try:
+        return executor.submit(fill_chunk, chunk)
+    except BrokenProcessPool as e:
+        result = Future()
+        result.set_exception(e)
+        return result
+
+
+def collect_chunks(
+    pending: Dict[Future, List[Tuple[int, dict]]], ordered: bool
+) -> Iterator[Tuple[int, Union[bytes, FillError]]]:
+    """
+    Pops the earliest submitted chunk if ordered or otherwise any completed
+    chunks and yields their results. If a chunk failed as a whole, e.g.
+    its worker process died, each of its records is reported as failed.
+    """
+
+    done = (
+        list(pending)[:1]
+        if ordered
+        else wait(pending, return_when=FIRST_COMPLETED).done
+    )
+
+    for future in done:
+        chunk = pending.pop(future)
+        try:
+            yield from future.result()
+        except Exception as e:  # pylint: disable=W0718  # noqa: BLE001
+            for index, _ in chunk:
+                yield index, FillError(index, repr(e))
+
+
+def fill_in_parallel(
+    render: Callable[[dict], bytes],
+    records: Iterable[dict],
+    **kwargs,
+) -> Iterator[Union[bytes, FillError, Tuple[int, Union[bytes, FillError]]]]:
+    """
+    Fills records in chunks with a pool of worker processes, each of which
+    receives the function filling records only once when it starts.
+
+    Only a couple of chunks per worker are pending at any time so records
+    are consumed lazily. Results are yielded in the order of the records,
+    or as soon as they are done together with their indexes if not ordered.
+    """
+
+    max_workers = kwargs.get("max_workers") or cpu_count() or 1
+    chunk_size = kwargs.get("chunk_size") or PARALLEL_FILL_CHUNK_SIZE
+    ordered = kwargs.get("ordered", True)
+
+    indexed_records = enumerate(records)
+    pending = {}
+
+    with ProcessPoolExecutor(
+        max_workers, initializer=init_worker, initargs=(render,)
+    ) as executor:
+        for chunk in iter(lambda: list(islice(indexed_records, chunk_size)), []):
+            pending[submit_chunk(executor, chunk)] = chunk
+            while len(pending) >= max_workers * 2:
+                for index, result in collect_chunks(pending, ordered):
+                    yield result if ordered else (index, result)
+
+        while pending:
+            for index, result in collect_chunks(pending, ordered):
+                yield result if ordered else (index, result)
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""Contains the cache of parsed PDF form templates."""
+
+import os
+import pickle
+from collections import OrderedDict
+from functools import wraps
+from hashlib import blake2b
+from mmap import mmap
+from tempfile import mkstemp
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+import reportlab
+from pypdf import __version__ as pypdf_version
+
+from .constants import TEMPLATE_CACHE_MAX_BYTES
+
+
+def digest(pdf: bytes) -> str:
+    """Returns a digest of a PDF's content to key its cached results."""
+
+    return blake2b(pdf, digest_size=16).hexdigest()
+
+
+class TemplateCache:
+    """
+    A LRU cache of results computed from PDF form templates.
+
+    Each result is charged the byte size of the PDF it was computed from
+    and the least recently used results are evicted once the total goes
+    over the byte budget.
+
+    If a directory is configured, results which can be persisted are also
+    pickled into it so that other processes can load them instead of
+    computing them again.
+
+    A cached result computed from bytes or a memory mapped file keeps it
+    referenced, so that the digest of the same object is looked up by its
+    identity rather than computed again while the result is cached, with
+    the memory it holds charged to the budget with the result.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = TEMPLATE_CACHE_MAX_BYTES,
+        directory: Union[str, None] = None,
+    ) -> None:
+        """Constructs an empty cache with a byte budget."""
+
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._entries = OrderedDict()
+        self._digests = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of cached results."""
+
+        return len(self._entries)
+
+    def digest(self, pdf: bytes) -> str:
+        """
+        Returns the digest of a PDF, computing it only if no result is
+        cached which was computed from the same object.
+        """
+
+        with self._lock:
+            if id(pdf) in self._digests:
+                return self._digests[id(pdf)][0]
+
+        return digest(pdf)
+
+    def get(self, key: Hashable) -> Union[Any, None]:
+        """Returns a cached result and marks it as recently used."""
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+
+    def set(self, key: Hashable, value: Any, size: int, pdf: Any = None) -> None:
+        """
+        Caches a result charged with a byte size. If the bytes or memory
+        mapped file the result was computed from is given, the digest
+        the result is keyed by along with its name is kept for it.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if size > self.max_bytes:
+                return
+
+            if not isinstance(pdf, (bytes, mmap)):
+                pdf = None
+
+            self._entries[key] = (size, value, pdf)
+            self.current_bytes += size
+            if pdf is not None:
+                _, count = self._digests.get(id(pdf), (None, 0))
+                self._digests[id(pdf)] = (key[1], count + 1)
+
+            self._evict()
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        Removes a result, forgetting the digest of the PDF it was computed
+        from once no other result computed from it is cached.
+        """
+
+        size, _, pdf = self._entries.pop(key)
+        self.current_bytes -= size
+
+        if pdf is not None:
+            pdf_digest, count = self._digests.pop(id(pdf))
+            if count > 1:
+                self._digests[id(pdf)] = (pdf_digest, count - 1)
+
+    def _evict(self) -> None:
+        """Evicts the least recently used results until within budget."""
+
+        while self.current_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def path(self, key: Tuple[str, str]) -> str:
+        """
+        Returns the path a result is persisted at, which changes with
+        the content of the PDF and the versions of PyPDFForm and of the
+        libraries the result is made of.
+        """
+
+        # pylint: disable=C0415, R0401
+        from . import __version__
+
+        name, pdf_digest = key
+        return os.path.join(
+            self.directory or "",
+            f"{name}-{pdf_digest}-{__version__}-{pypdf_version}-{reportlab.Version}"
+            ".pickle",
+        )
+
+    def load(self, key: Tuple[str, str]) -> Union[Any, None]:
+        """
+        Loads a result persisted in the cache directory if configured. A
+        result which fails to load, e.g. one pickled with classes since
+        changed, is missed and computed again.
+        """
+
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self.path(key), "rb") as f:
+                result = pickle.load(f)
+        except Exception:  # pylint: disable=W0718  # noqa: BLE001
+            result = None
+
+        with self._lock:
+            if result is None:
+                self.disk_misses += 1
+            else:
+                self.disk_hits += 1
+
+        return result
+
+    def dump(self, key: Tuple[str, str], value: Any) -> None:
+        """
+        Persists a result in the cache directory if configured, leaving
+        nothing behind if it fails to be written or pickled.
+        """
+
+        if self.directory is None:
+            return
+
+        try:
+            fd, path = mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(path, self.path(key))
+        except Exception:  # pylint: disable=W0718  # noqa: BLE001
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def clear(self) -> None:
+        """Removes all cached results and resets the stats."""
+
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.disk_hits = 0
+            self.disk_misses = 0
+
+    def configure(self, **kwargs) -> None:
+        """
+        Changes the byte budget, evicting results over the new budget,
+        and/or the directory results are persisted in.
+        """
+
+        with self._lock:
+            if "max_bytes" in kwargs:
+                self.max_bytes = kwargs["max_bytes"]
+                self._evict()
+
+            if "directory" in kwargs:
+                self.directory = kwargs["directory"]
+                if self.directory is not None:
+                    os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the hits, misses, evictions and usage of the cache."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+        }
+
+
+template_cache = TemplateCache()
+
+
+def cache_by_template(in_memory: bool = True, on_disk: bool = False) -> Callable:
+    """
+    Caches the results of a function of a PDF in the template cache,
+    in memory and/or in its directory. Any further arguments, e.g. the
+    PDF already parsed, are only passed on when the result is computed.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        """Decorates the function with the template cache."""
+
+        @wraps(func)
+        def wrapper(pdf: bytes, *args) -> Any:
+            """Looks up the result by the PDF's digest before computing it."""
+
+            if not in_memory and template_cache.directory is None:
+                return func(pdf, *args)
+
+            key = (func.__name__, template_cache.digest(pdf))
+            result = template_cache.get(key) if in_memory else None
+            if result is not None:
+                return result
+
+            result = template_cache.load(key) if on_disk else None
+            if result is None:
+                result = func(pdf, *args)
+                if on_disk:
+                    template_cache.dump(key, result)
+
+            if in_memory:
+                template_cache.set(key, result, len(pdf), pdf)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -52,6 +52,32 @@ CA = "/CA"
 AS = "/AS"
 Yes = "/Yes"
 Off = "/Off"
+Resources = "/Resources"
+Font = "/Font"
+Subtype = "/Subtype"
+Widget = "/Widget"
+Fields = "/Fields"
+Contents = "/Contents"
+XObject = "/XObject"
+Type = "/Type"
+Type1 = "/Type1"
+ImageXObject = "/Image"
+FormXObject = "/Form"
+BBox = "/BBox"
+BaseFont = "/BaseFont"
+Encoding = "/Encoding"
+Width = "/Width"
+Height = "/Height"
+ColorSpace = "/ColorSpace"
+BitsPerComponent = "/BitsPerComponent"
+Filter = "/Filter"
+DCTDecode = "/DCTDecode"
+Decode = "/Decode"
+Pages = "/Pages"
+Kids = "/Kids"
+Count = "/Count"
+Catalog = "/Catalog"
+Size = "/Size"
 
 # For Adobe Acrobat
 AcroForm = "/AcroForm"
@@ -84,6 +110,45 @@ BUTTON_STYLES = {
 
 COORDINATE_GRID_FONT_SIZE_MARGIN_RATIO = DEFAULT_FONT_SIZE / 100
 
+# Byte budget of the cache of parsed PDF form templates
+TEMPLATE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Size from which a PDF file is memory mapped instead of read
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Number of pages split from a PDF kept in memory at once
+PAGES_CACHE_SIZE = 64
+
+# Number of parsed text field appearance strings kept in memory
+TEXT_APPEARANCE_CACHE_SIZE = 1024
+
+# Number of records sent to a worker process at once when filling in parallel
+PARALLEL_FILL_CHUNK_SIZE = 16
+
+# Options of filling in parallel which configure the pool of worker processes
+PARALLEL_FILL_KWARGS = ("max_workers", "chunk_size", "ordered")
+
+# Header of a merged PDF when no PDF was merged into it
+DEFAULT_PDF_HEADER = "%PDF-1.3"
+
+# Separator between the key of a widget and the number of its copy in a merged PDF
+KEY_SUFFIX_SEPARATOR = "_"
+
+# Engines drawing texts and images on a PDF
+MERGE_ENGINE = "merge"
+DIRECT_ENGINE = "direct"
+XOBJECT_ENGINE = "xobject"
+DEFAULT_ENGINE = MERGE_ENGINE
+
+# For drawing on a PDF with the direct engine
+TEXT_LEADING_RATIO = 1.2
+JPG_COLOR_SPACES = {
+    1: "/DeviceGray",
+    3: "/DeviceRGB",
+    4: "/DeviceCMYK",
+}
+CMYK_JPG_DECODE = [1, 0, 1, 0, 1, 0, 1, 0]
+
 # Used for adjusting paragraph font size
 FONT_SIZE_REDUCE_STEP = 0.5
 MARGIN_BETWEEN_LINES = 2
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Contains helpers for drawing on a PDF by writing content
+operators and resources onto its pages directly.
+"""
+
+import struct
+from io import BytesIO
+from threading import Lock
+from typing import Callable, Dict, List, Tuple, Union
+
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import (ArrayObject, DecodedStreamObject, DictionaryObject,
+                           IndirectObject, NameObject, NumberObject, PdfObject,
+                           StreamObject)
+from reportlab.lib.rl_accel import escapePDF, fp_str
+from reportlab.pdfbase.pdfdoc import PDFError
+from reportlab.pdfbase.pdfmetrics import getFont, standardFonts, unicode2T1
+from reportlab.pdfbase.pdfutils import readJPEGInfo
+
+from .constants import (CMYK_JPG_DECODE, JPG_COLOR_SPACES, TEXT_LEADING_RATIO,
+                        BaseFont, BBox, BitsPerComponent, ColorSpace, Contents,
+                        DCTDecode, Decode, Encoding, Filter, Font, FormXObject,
+                        Height, ImageXObject, Resources, Subtype, Type, Type1,
+                        Width, XObject)
+from .middleware.text import Text
+
+
+def get_jpg_info(image_stream: bytes) -> Tuple[int, int, int]:
+    """Returns the width, height and number of color components of a jpg image."""
+
+    width, height, components, _ = readJPEGInfo(BytesIO(image_stream))
+
+    return width, height, components
+
+
+def is_embeddable_jpg(image_stream: bytes) -> bool:
+    """Checks if a jpg image can be embedded as it is without decoding it."""
+
+    try:
+        return get_jpg_info(image_stream)[2] in JPG_COLOR_SPACES
+    except (PDFError, struct.error):
+        return False
+
+
+def can_draw(action_type: str, actions: List[list]) -> bool:
+    """
+    Checks if some stuffs of an action type can be drawn directly,
+    which is the case for texts of the standard PDF fonts, jpg images,
+    lines and rectangles.
+    """
+
+    if action_type == "text":
+        return all(each[0].font in standardFonts for each in actions)
+    if action_type == "image":
+        return all(is_embeddable_jpg(each[0]) for each in actions)
+
+    return True
+
+
+def can_draw_layers(layers: List[Tuple[str, Dict[int, List[list]]]]) -> bool:
+    """Checks if layers of stuffs of an action type by page can be drawn directly."""
+
+    return all(
+        can_draw(action_type, actions)
+        for action_type, actions_by_page in layers
+        for actions in actions_by_page.values()
+    )
+
+
+def create_font(font_name: str) -> DictionaryObject:
+    """Creates the resource of a standard PDF font."""
+
+    result = DictionaryObject(
+        {
+            NameObject(Type): NameObject(Font),
+            NameObject(Subtype): NameObject(Type1),
+            NameObject(BaseFont): NameObject(f"/{font_name}"),
+        }
+    )
+    if getFont(font_name).encName == "WinAnsiEncoding":
+        result[NameObject(Encoding)] = NameObject("/WinAnsiEncoding")
+
+    return result
+
+
+def create_image(image_stream: bytes) -> StreamObject:
+    """Creates the resource of a jpg image without decoding it."""
+
+    width, height, components = get_jpg_info(image_stream)
+
+    result = StreamObject()
+    result.set_data(image_stream)
+    result.update(
+        {
+            NameObject(Type): NameObject(XObject),
+            NameObject(Subtype): NameObject(ImageXObject),
+            NameObject(Width): NumberObject(width),
+            NameObject(Height): NumberObject(height),
+            NameObject(ColorSpace): NameObject(JPG_COLOR_SPACES[components]),
+            NameObject(BitsPerComponent): NumberObject(8),
+            NameObject(Filter): NameObject(DCTDecode),
+        }
+    )
+    if components == 4:
+        result[NameObject(Decode)] = ArrayObject(
+            [NumberObject(each) for each in CMYK_JPG_DECODE]
+        )
+
+    return result
+
+
+def add_object(output: PdfWriter, obj: PdfObject) -> IndirectObject:
+    """Adds an object to a PDF being written the same way pypdf does."""
+
+    # pylint: disable=W0212
+    return output._add_object(obj)  # noqa: SLF001  # pyright: ignore
+
+
+def create_form(output: PdfWriter, page: PageObject) -> IndirectObject:
+    """
+    Creates a form XObject drawing what a page of another PDF
+    draws, so that it can be drawn without merging the content.
+    """
+
+    contents = page.get_contents()
+
+    result = DecodedStreamObject()
+    result.set_data(contents.get_data() if contents is not None else b"")
+    result.update(
+        {
+            NameObject(Type): NameObject(XObject),
+            NameObject(Subtype): NameObject(FormXObject),
+            NameObject(BBox): ArrayObject(page.mediabox),
+            NameObject(Resources): page.get(Resources, DictionaryObject()),
+        }
+    )
+
+    return add_object(output, result.clone(output))
+
+
+def font_size_operators(font_size: Union[float, int]) -> str:
+    """Returns the operands and operators setting a font size and its leading."""
+
+    return f"{fp_str(font_size)} Tf {fp_str(font_size * TEXT_LEADING_RATIO)} TL"
+
+
+class PageContent:
+    """
+    A class to represent the content operators and resources
+    drawn directly on a page of a PDF being written.
+    """
+
+    def __init__(
+        self, output: PdfWriter, page: PageObject, shared: Dict[tuple, IndirectObject]
+    ) -> None:
+        """Constructs all attributes for the page content."""
+
+        super().__init__()
+        self.output = output
+        self.page = page
+        self.shared = shared
+        self.resources = DictionaryObject()
+        resources = page[Resources].get_object() if Resources in page else None
+        if isinstance(resources, DictionaryObject):
+            self.resources.update(resources)
+        self.names = {}
+        self.operators = []
+        self.restore = False
+        self.stream = DecodedStreamObject()
+
+    def add_resource(
+        self, category: str, key: Union[str, bytes], create: Callable
+    ) -> str:
+        """
+        Adds a resource to the page once and returns its name. The objects
+        of resources are shared between all pages of the PDF.
+        """
+
+        if (category, key) in self.names:
+            return self.names[(category, key)]
+
+        if (category, key) not in self.shared:
+            self.shared[(category, key)] = add_object(self.output, create(key))
+
+        self.names[(category, key)] = self.name_resource(
+            category, self.shared[(category, key)]
+        )
+
+        return self.names[(category, key)]
+
+    def name_resource(self, category: str, obj: IndirectObject) -> str:
+        """Adds an object to the resources of the page under a new name."""
+
+        resources = DictionaryObject()
+        existing = (
+            self.resources[category].get_object()
+            if category in self.resources
+            else None
+        )
+        if isinstance(existing, DictionaryObject):
+            resources.update(existing)
+        prefix = "/PyPDFForm" + category[1]
+        i = len(resources) + 1
+        while f"{prefix}{i}" in resources:
+            i += 1
+
+        name = f"{prefix}{i}"
+        resources[NameObject(name)] = obj
+        self.resources[NameObject(category)] = resources
+
+        return name
+
+    def show_text(self, widget: Text, text: str) -> str:
+        """Returns the operators showing a text, switching fonts if needed."""
+
+        font = getFont(widget.font)
+        size = font_size_operators(widget.font_size)
+
+        result = []
+        current = font
+        for each, segment in unicode2T1(text, [font, *font.substitutionFonts]):
+            if each is not current:
+                result.append(
+                    f"{self.add_resource(Font, each.fontName, create_font)} {size}"
+                )
+                current = each
+            result.append(f"({escapePDF(segment)}) Tj")
+        if current is not font:
+            result.append(
+                f"{self.add_resource(Font, font.fontName, create_font)} {size}"
+            )
+
+        return " ".join(result)
+
+    def draw_text(
+        self, widget: Text, x: Union[float, int], y: Union[float, int]
+    ) -> None:
+        """Draws a text the same way as watermark.draw_text."""
+
+        text = widget.value or ""
+        if widget.max_length is not None:
+            text = text[: widget.max_length]
+
+        font = self.add_resource(Font, widget.font, create_font)
+        font = f"{font} {font_size_operators(widget.font_size)}"
+        self.operators.append(f"{fp_str(*widget.font_color)} rg")
+
+        if widget.comb is True:
+            for i, char in enumerate(text):
+                self.operators.append(
+                    f"BT {font} 1 0 0 1 "
+                    f"{fp_str(x + widget.character_paddings[i], y)} Tm "
+                    f"{self.show_text(widget, char)} T* ET"
+                )
+        elif (
+            widget.text_wrap_length is None or len(text) < widget.text_wrap_length
+        ) and widget.text_lines is None:
+            self.operators.append(
+                f"BT {font} 1 0 0 1 {fp_str(x, y)} Tm "
+                f"{self.show_text(widget, text)} T* ET"
+            )
+        else:
+            lines = []
+            for i, line in enumerate(widget.text_lines):
+                offset = (
+                    widget.text_line_x_coordinates[i] - x
+                    if widget.text_line_x_coordinates is not None
+                    else 0
+                )
+                shown = f"{self.show_text(widget, line)} T*"
+                if offset != 0:
+                    shown = f"{fp_str(offset)} 0 Td {shown} {fp_str(-offset)} 0 Td"
+                lines.append(shown)
+
+            self.operators.append(
+                f"q 1 0 0 1 {fp_str(x, y)} cm BT {font} "
+                f"1 0 0 1 0 0 Tm {' '.join(lines)} ET Q"
+            )
+
+    def draw_image(
+        self,
+        image_stream: bytes,
+        x: Union[float, int],
+        y: Union[float, int],
+        width: Union[float, int],
+        height: Union[float, int],
+    ) -> None:
+        """Draws a jpg image scaled to a width and height."""
+
+        name = self.add_resource(XObject, image_stream, create_image)
+        self.operators.append(f"q {fp_str(width, 0, 0, height, x, y)} cm {name} Do Q")
+
+    def draw_form(self, form: IndirectObject) -> None:
+        """Draws a form XObject once."""
+
+        self.operators.append(f"{self.name_resource(XObject, form)} Do")
+
+    def draw_line(self, *args) -> None:
+        """Draws a line of a color."""
+
+        src_x, src_y, dest_x, dest_y, r, g, b = args
+        self.operators.append(
+            f"q {fp_str(r, g, b)} RG {fp_str(src_x, src_y)} m "
+            f"{fp_str(dest_x, dest_y)} l S Q"
+        )
+
+    def draw_rect(self, *args) -> None:
+        """Draws the outline of a rectangle."""
+
+        self.operators.append(f"{fp_str(*args)} re S")
+
+    def draw(self, action_type: str, actions: List[list]) -> None:
+        """Draws some stuffs of an action type."""
+
+        draw = {
+            "image": self.draw_image,
+            "text": self.draw_text,
+            "line": self.draw_line,
+            "rect": self.draw_rect,
+        }[action_type]
+        for each in actions:
+            draw(*each)
+
+    def save(self) -> None:
+        """Appends the operators to the page if anything was drawn."""
+
+        if self.operators:
+            self.attach()
+
+    def attach(self) -> None:
+        """
+        Appends a stream of the operators to the page after restoring
+        the graphics state its own content may have left, and sets
+        its new resources.
+        """
+
+        contents = self.page.get(Contents)
+        if contents is None:
+            contents = []
+        elif isinstance(contents.get_object(), ArrayObject):
+            contents = list(contents.get_object())
+        else:
+            contents = [contents]
+
+        self.restore = bool(contents)
+        self.stream = DecodedStreamObject()
+        self.update()
+
+        streams = [add_object(self.output, self.stream)]
+        if contents:
+            prefix = DecodedStreamObject()
+            prefix.set_data(b"q")
+            streams = [add_object(self.output, prefix), *contents, *streams]
+
+        self.page[NameObject(Contents)] = ArrayObject(streams)
+        self.page[NameObject(Resources)] = self.resources
+
+    def update(self) -> None:
+        """Replaces the operators of the stream appended to the page."""
+
+        self.stream.set_data(
+            "\n".join(
+                ["Q", *self.operators] if self.restore else self.operators
+            ).encode()
+        )
+
+
+class ContentTemplate:
+    """
+    A class to represent a PDF prepared once to be written many times
+    with different texts drawn directly on its pages. Only the operators
+    of each page are worked out for each time, the standard PDF fonts
+    they may use are added to the prepared PDF once. Rendering is
+    serialized since each time rewrites the same prepared PDF.
+    """
+
+    def __init__(
+        self,
+        pdf_file: PdfReader,
+        fonts_by_page: Dict[int, List[str]],
+        remove_widgets: bool = False,
+    ) -> None:
+        """Prepares the pages of the PDF."""
+
+        super().__init__()
+        self.output = PdfWriter()
+        self.pages = []
+        self._lock = Lock()
+        shared = {}
+
+        for i, page in enumerate(pdf_file.pages):
+            if remove_widgets and page.annotations:
+                page.annotations.clear()
+            content = PageContent(self.output, self.output.add_page(page), shared)
+            for font_name in sorted(set(fonts_by_page.get(i + 1, []))):
+                if font_name in standardFonts:
+                    font = getFont(font_name)
+                    for each in [font, *font.substitutionFonts]:
+                        content.add_resource(Font, each.fontName, create_font)
+            content.attach()
+            self.pages.append(content)
+
+    def render(self, layers: List[Tuple[str, Dict[int, List[list]]]]) -> bytes:
+        """Draws layers of stuffs of an action type by page and writes the PDF."""
+
+        with self._lock:
+            for i, content in enumerate(self.pages):
+                content.operators = []
+                for action_type, actions_by_page in layers:
+                    content.draw(action_type, actions_by_page.get(i + 1, []))
+                content.update()
+
+            with BytesIO() as f:
+                self.output.write(f)
+                return f.getvalue()
+
+
+def draw_on_pages(
+    pdf_file: PdfReader,
+    layers: List[Tuple[str, Dict[int, List[list]]]],
+    remove_widgets: bool = False,
+) -> bytes:
+    """
+    Draws layers of stuffs of an action type by page on a parsed
+    PDF in order, optionally removes all its widgets and writes it once.
+    """
+
+    result = BytesIO()
+    output = PdfWriter()
+    shared = {}
+
+    for i, page in enumerate(pdf_file.pages):
+        if remove_widgets and page.annotations:
+            page.annotations.clear()
+        content = PageContent(output, output.add_page(page), shared)
+        for action_type, actions_by_page in layers:
+            content.draw(action_type, actions_by_page.get(i + 1, []))
+        content.save()
+
+    output.write(result)
+    return result.getvalue()
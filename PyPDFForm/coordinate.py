@@ -5,15 +5,16 @@ from copy import deepcopy
 from typing import List, Tuple, Union
 
 from pypdf import PdfReader
-from reportlab.pdfbase.pdfmetrics import stringWidth
 
 from .constants import (COORDINATE_GRID_FONT_SIZE_MARGIN_RATIO, DEFAULT_FONT,
                         Rect)
+from .metrics import string_width
 from .middleware.text import Text
 from .template import (get_char_rect_width, get_widget_alignment,
                        is_text_multiline)
 from .utils import stream_to_io
-from .watermark import create_watermarks_and_draw, merge_watermarks_with_pdf
+from .watermark import (create_multi_page_watermarks, get_page_size,
+                        merge_watermark_layers)
 
 
 def get_draw_checkbox_radio_coordinates(
@@ -28,7 +29,7 @@ def get_draw_checkbox_radio_coordinates(
 
     return (
         width_mid_point
-        - stringWidth(
+        - string_width(
             widget_middleware.value,
             widget_middleware.font,
             widget_middleware.font_size,
@@ -86,26 +87,26 @@ def get_draw_text_coordinates(
 
     if int(alignment) != 0:
         width_mid_point = (float(widget[Rect][0]) + float(widget[Rect][2])) / 2
-        string_width = stringWidth(
+        text_width = string_width(
             text_value,
             widget_middleware.font,
             widget_middleware.font_size,
         )
         if widget_middleware.comb is True and length:
-            string_width = character_paddings[-1] + stringWidth(
+            text_width = character_paddings[-1] + string_width(
                 text_value[-1],
                 widget_middleware.font,
                 widget_middleware.font_size,
             )
 
         if int(alignment) == 1:
-            x = width_mid_point - string_width / 2
+            x = width_mid_point - text_width / 2
         elif int(alignment) == 2:
-            x = float(widget[Rect][2]) - string_width
+            x = float(widget[Rect][2]) - text_width
             if length > 0 and widget_middleware.comb is True:
                 x -= (
                     get_char_rect_width(widget, widget_middleware)
-                    - stringWidth(
+                    - string_width(
                         text_value[-1],
                         widget_middleware.font,
                         widget_middleware.font_size,
@@ -123,7 +124,7 @@ def get_draw_text_coordinates(
         if length % 2 == 0:
             x -= (
                 character_paddings[0]
-                + stringWidth(
+                + string_width(
                     text_value[:1],
                     widget_middleware.font,
                     widget_middleware.font_size,
@@ -169,13 +170,11 @@ def generate_coordinate_grid(
     pdf_file = PdfReader(stream_to_io(pdf))
     lines_by_page = {}
     texts_by_page = {}
-    watermarks = []
 
     for i, page in enumerate(pdf_file.pages):
         lines_by_page[i + 1] = []
         texts_by_page[i + 1] = []
-        width = float(page.mediabox[2])
-        height = float(page.mediabox[3])
+        width, height = get_page_size(page)
 
         r, g, b = color
 
@@ -202,23 +201,19 @@ def generate_coordinate_grid(
                 texts_by_page[i + 1].append(
                     [
                         text,
-                        x - stringWidth(value, DEFAULT_FONT, font_size),
+                        x - string_width(value, DEFAULT_FONT, font_size),
                         y - font_size,
                     ]
                 )
                 y += margin
             x += margin
 
-    for page, lines in lines_by_page.items():
-        watermarks.append(
-            create_watermarks_and_draw(pdf, page, "line", lines)[page - 1]
-        )
-
-    result = merge_watermarks_with_pdf(pdf, watermarks)
-    watermarks = []
-    for page, texts in texts_by_page.items():
-        watermarks.append(
-            create_watermarks_and_draw(pdf, page, "text", texts)[page - 1]
-        )
+    page_sizes = [get_page_size(page) for page in pdf_file.pages]
 
-    return merge_watermarks_with_pdf(result, watermarks)
+    return merge_watermark_layers(
+        pdf_file,
+        [
+            create_multi_page_watermarks(page_sizes, lines_by_page, "line"),
+            create_multi_page_watermarks(page_sizes, texts_by_page, "text"),
+        ],
+    )
@@ -2,12 +2,14 @@
 """Contains helpers for filling a PDF form."""
 
 from io import BytesIO
-from typing import Dict, Tuple, Union, cast
+from typing import Dict, List, Tuple, Union, cast
 
 from pypdf import PdfReader, PdfWriter
 from pypdf.generic import BooleanObject, DictionaryObject, NameObject
 
-from .constants import WIDGET_TYPES, AcroForm, Annots, NeedAppearances, Root
+from .constants import (DEFAULT_ENGINE, DIRECT_ENGINE, WIDGET_TYPES, AcroForm,
+                        Annots, NeedAppearances, Root)
+from .content import can_draw_layers, draw_on_pages
 from .coordinate import (get_draw_checkbox_radio_coordinates,
                          get_draw_image_coordinates_resolutions,
                          get_draw_text_coordinates,
@@ -26,7 +28,8 @@ from .patterns import (simple_flatten_generic, simple_flatten_radio,
                        simple_update_text_value)
 from .template import get_widget_key, get_widgets_by_page
 from .utils import checkbox_radio_to_draw, stream_to_io
-from .watermark import create_watermarks_and_draw, merge_watermarks_with_pdf
+from .watermark import (create_multi_page_watermarks, get_page_size,
+                        merge_watermark_layers)
 
 
 def check_radio_handler(
@@ -89,33 +92,18 @@ def text_handler(
     return to_draw, x, y, text_needs_to_be_drawn
 
 
-def get_drawn_stream(to_draw: dict, stream: bytes, action: str) -> bytes:
-    """Generates a stream of an input PDF stream with stuff drawn on it."""
-
-    watermark_list = []
-    for page, stuffs in to_draw.items():
-        watermark_list.append(b"")
-        watermarks = create_watermarks_and_draw(stream, page, action, stuffs)
-        for i, watermark in enumerate(watermarks):
-            if watermark:
-                watermark_list[i] = watermark
-
-    return merge_watermarks_with_pdf(stream, watermark_list)
-
-
-def fill(
-    template_stream: bytes,
+def get_drawings(
     widgets: Dict[str, WIDGET_TYPES],
-) -> bytes:
-    """Fills a PDF using watermarks."""
+    widgets_by_page: Dict[int, List[dict]],
+) -> Tuple[Dict[int, List[list]], Dict[int, List[list]]]:
+    """Works out the texts and images to draw on each page to fill a PDF."""
 
     texts_to_draw = {}
     images_to_draw = {}
-    any_image_to_draw = False
 
     radio_button_tracker = {}
 
-    for page, widget_dicts in get_widgets_by_page(template_stream).items():
+    for page, widget_dicts in widgets_by_page.items():
         texts_to_draw[page] = []
         images_to_draw[page] = []
         for widget_dict in widget_dicts:
@@ -128,9 +116,7 @@ def fill(
                     widget_dict, widgets[key], radio_button_tracker
                 )
             elif isinstance(widgets[key], (Signature, Image)):
-                any_image_to_draw |= signature_image_handler(
-                    widget_dict, widgets[key], images_to_draw[page]
-                )
+                signature_image_handler(widget_dict, widgets[key], images_to_draw[page])
             else:
                 to_draw, x, y, text_needs_to_be_drawn = text_handler(
                     widget_dict, widgets[key]
@@ -152,12 +138,69 @@ def fill(
                     ]
                 )
 
-    result = get_drawn_stream(texts_to_draw, template_stream, "text")
+    return texts_to_draw, images_to_draw
+
+
+def draw_drawings(
+    template_stream: bytes,
+    texts_to_draw: Dict[int, List[list]],
+    images_to_draw: Dict[int, List[list]],
+    remove_widgets: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    pdf_file: Union[PdfReader, None] = None,
+) -> bytes:
+    """
+    Draws the texts and images of each page on a PDF. The PDF
+    is parsed and written only once no matter what is drawn on it,
+    and not parsed at all if its parsed file is given.
+    """
+
+    pdf = PdfReader(stream_to_io(template_stream)) if pdf_file is None else pdf_file
+    layers = [("text", texts_to_draw), ("image", images_to_draw)]
+    if engine == DIRECT_ENGINE and can_draw_layers(layers):
+        return draw_on_pages(pdf, layers, remove_widgets)
+
+    page_sizes = [get_page_size(page) for page in pdf.pages]
+    watermark_layers = [
+        create_multi_page_watermarks(page_sizes, texts_to_draw, "text")
+    ]
+
+    if any(images_to_draw.values()):
+        watermark_layers.append(
+            create_multi_page_watermarks(page_sizes, images_to_draw, "image")
+        )
+
+    return merge_watermark_layers(pdf, watermark_layers, remove_widgets, engine)
 
-    if any_image_to_draw:
-        result = get_drawn_stream(images_to_draw, result, "image")
 
-    return result
+def fill(
+    template_stream: bytes,
+    widgets: Dict[str, WIDGET_TYPES],
+    widgets_by_page: Union[Dict[int, List[dict]], None] = None,
+    remove_widgets: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    pdf_file: Union[PdfReader, None] = None,
+) -> bytes:
+    """
+    Fills a PDF using watermarks. The PDF is parsed and
+    written only once no matter what is drawn on it,
+    and not parsed at all if its parsed file is given.
+    With the direct engine, what can be drawn without
+    watermarks is written onto the pages instead.
+    With the xobject engine, the watermarks are drawn
+    as form XObjects instead of being merged.
+    """
+
+    if widgets_by_page is None:
+        widgets_by_page = get_widgets_by_page(template_stream, pdf_file)
+
+    return draw_drawings(
+        template_stream,
+        *get_drawings(widgets, widgets_by_page),
+        remove_widgets,
+        engine,
+        pdf_file,
+    )
 
 
 def enable_adobe_mode(pdf: PdfReader, adobe_mode: bool) -> None:
@@ -214,5 +257,4 @@ def simple_fill(
 
     with BytesIO() as f:
         out.write(f)
-        f.seek(0)
-        return f.read()
+        return f.getvalue()
@@ -1,19 +1,22 @@
 # -*- coding: utf-8 -*-
 """Contains helpers for font."""
 
+from collections import Counter
+from functools import lru_cache
 from io import BytesIO
-from math import sqrt
+from math import ceil, floor, sqrt
 from re import findall
-from typing import Tuple, Union
+from typing import Callable, List, Tuple, Union
 
 from reportlab.pdfbase.acroform import AcroForm
-from reportlab.pdfbase.pdfmetrics import (registerFont, standardFonts,
-                                          stringWidth)
+from reportlab.pdfbase.pdfmetrics import registerFont, standardFonts
 from reportlab.pdfbase.ttfonts import TTFError, TTFont
 
 from .constants import (DEFAULT_FONT, FONT_COLOR_IDENTIFIER,
                         FONT_SIZE_IDENTIFIER, FONT_SIZE_REDUCE_STEP,
-                        MARGIN_BETWEEN_LINES, Rect)
+                        MARGIN_BETWEEN_LINES, NEW_LINE_SYMBOL,
+                        TEXT_APPEARANCE_CACHE_SIZE, Rect)
+from .metrics import clear_font_metrics, get_font_metrics
 from .middleware.text import Text
 from .patterns import TEXT_FIELD_APPEARANCE_PATTERNS
 from .utils import traverse_pattern
@@ -22,12 +25,11 @@ from .utils import traverse_pattern
 def register_font(font_name: str, ttf_stream: bytes) -> bool:
     """Registers a font from a ttf file stream."""
 
-    buff = BytesIO()
-    buff.write(ttf_stream)
-    buff.seek(0)
+    buff = BytesIO(ttf_stream)
 
     try:
         registerFont(TTFont(name=font_name, filename=buff))
+        clear_font_metrics(font_name)
         result = True
     except TTFError:
         result = False
@@ -36,6 +38,16 @@ def register_font(font_name: str, ttf_stream: bytes) -> bool:
     return result
 
 
+@lru_cache(maxsize=None)
+def get_standard_font_segments() -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Returns each standard font with its name split into capitalized segments."""
+
+    return tuple(
+        (font, tuple(findall("[A-Z][^A-Z]*", font.replace("-", ""))))
+        for font in standardFonts
+    )
+
+
 def extract_font_from_text_appearance(text_appearance: str) -> Union[str, None]:
     """
     Uses regex to pattern match out the font from the text
@@ -53,8 +65,7 @@ def extract_font_from_text_appearance(text_appearance: str) -> Union[str, None]:
                     if v == text_segments[0]:
                         return k
 
-            for font in standardFonts:
-                font_segments = findall("[A-Z][^A-Z]*", font.replace("-", ""))
+            for font, font_segments in get_standard_font_segments():
                 if len(font_segments) != len(text_segments):
                     continue
 
@@ -69,22 +80,63 @@ def extract_font_from_text_appearance(text_appearance: str) -> Union[str, None]:
     return None
 
 
-def auto_detect_font(widget: dict) -> str:
-    """Returns the font of the text field if it is one of the standard fonts."""
+@lru_cache(maxsize=TEXT_APPEARANCE_CACHE_SIZE)
+def parse_text_appearance(
+    text_appearance: str,
+) -> Tuple[
+    Union[str, None], Union[float, None], Union[Tuple[float, float, float], None]
+]:
+    """
+    Parses the font, font size and font color out of the text appearance
+    string of a text field widget, each of them none if not presented.
+    """
+
+    properties = text_appearance.split(" ")
+
+    font_size = None
+    for i, val in enumerate(properties):
+        if val.startswith(FONT_SIZE_IDENTIFIER):
+            font_size = float(properties[i - 1])
+            break
+
+    font_color = None
+    if FONT_COLOR_IDENTIFIER in text_appearance:
+        for i, val in enumerate(properties):
+            if val.startswith(FONT_COLOR_IDENTIFIER.replace(" ", "")):
+                font_color = (
+                    float(properties[i - 3]),
+                    float(properties[i - 2]),
+                    float(properties[i - 1]),
+                )
+                break
+
+    return extract_font_from_text_appearance(text_appearance), font_size, font_color
+
 
-    result = DEFAULT_FONT
+def get_text_appearances(
+    widget: dict,
+) -> List[
+    Tuple[Union[str, None], Union[float, None], Union[Tuple[float, float, float], None]]
+]:
+    """Returns the parsed text appearances of a text field and its parent."""
 
-    text_appearance = None
+    result = []
     for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
         text_appearance = traverse_pattern(pattern, widget)
-
         if text_appearance:
-            break
+            result.append(parse_text_appearance(text_appearance))
+
+    return result
+
+
+def auto_detect_font(widget: dict) -> str:
+    """Returns the font of the text field if it is one of the standard fonts."""
 
-    if not text_appearance:
-        return result
+    text_appearances = get_text_appearances(widget)
+    if not text_appearances:
+        return DEFAULT_FONT
 
-    return extract_font_from_text_appearance(text_appearance) or result
+    return text_appearances[0][0] or DEFAULT_FONT
 
 
 def text_field_font_size(widget: dict) -> Union[float, int]:
@@ -114,16 +166,11 @@ def checkbox_radio_font_size(widget: dict) -> Union[float, int]:
 def get_text_field_font_size(widget: dict) -> Union[float, int]:
     """Returns the font size of the text field if presented or zero."""
 
-    result = 0
-    for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
-        text_appearance = traverse_pattern(pattern, widget)
-        if text_appearance:
-            properties = text_appearance.split(" ")
-            for i, val in enumerate(properties):
-                if val.startswith(FONT_SIZE_IDENTIFIER):
-                    return float(properties[i - 1])
+    for _, font_size, _ in get_text_appearances(widget):
+        if font_size is not None:
+            return font_size
 
-    return result
+    return 0
 
 
 def get_text_field_font_color(
@@ -132,53 +179,120 @@ def get_text_field_font_color(
     """Returns the font color tuple of the text field if presented or black."""
 
     result = (0, 0, 0)
-    for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
-        text_appearance = traverse_pattern(pattern, widget)
-        if text_appearance:
-            if FONT_COLOR_IDENTIFIER not in text_appearance:
-                return result
-
-            text_appearance = text_appearance.split(" ")
-            for i, val in enumerate(text_appearance):
-                if val.startswith(FONT_COLOR_IDENTIFIER.replace(" ", "")):
-                    result = (
-                        float(text_appearance[i - 3]),
-                        float(text_appearance[i - 2]),
-                        float(text_appearance[i - 1]),
-                    )
-                    break
+    for _, _, font_color in get_text_appearances(widget):
+        if font_color is None:
+            return result
+        result = font_color
+
+    return result
+
+
+def get_font_size_steps(font_size: Union[float, int]) -> List[Union[float, int]]:
+    """
+    Returns each font size reducing a font size step by step would
+    try, down to the last one no greater than a single step.
+    """
+
+    result = [font_size]
+    while result[-1] > FONT_SIZE_REDUCE_STEP:
+        result.append(result[-1] - FONT_SIZE_REDUCE_STEP)
 
     return result
 
 
+def search_font_size(
+    font_sizes: List[Union[float, int]], fits: Callable[[Union[float, int]], bool]
+) -> int:
+    """
+    Binary searches the index of the largest of the font sizes texts fit
+    with, falling back to the last one if texts fit with none of them.
+    """
+
+    low, high = 0, len(font_sizes) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if fits(font_sizes[middle]):
+            high = middle
+        else:
+            low = middle + 1
+
+    return low
+
+
+def get_paragraph_min_lines(
+    widget_middleware: Text, font_size: Union[float, int], width: float
+) -> int:
+    """
+    Returns how many lines a paragraph field's text wraps into at least.
+    Each line is either no wider than the widget or a single character.
+    """
+
+    if not width:
+        return 0
+
+    metrics = get_font_metrics(widget_middleware.font)
+    total = 0
+    for char, count in Counter(widget_middleware.value or "").items():
+        if char not in (" ", NEW_LINE_SYMBOL):
+            total += count * min(
+                metrics.scale(metrics.char_units(char), font_size), width
+            )
+
+    return floor(total / width)
+
+
 def adjust_paragraph_font_size(widget: dict, widget_middleware: Text) -> None:
-    """Reduces the font size of a paragraph field until texts fits."""
+    """
+    Reduces the font size of a paragraph field until texts fits. Font
+    sizes the text can not fit with for sure are skipped without wrapping.
+    """
 
     # pylint: disable=C0415, R0401
     from .template import get_paragraph_lines
 
+    width = abs(float(widget[Rect][0]) - float(widget[Rect][2]))
     height = abs(float(widget[Rect][1]) - float(widget[Rect][3]))
+    font_sizes = get_font_size_steps(widget_middleware.font_size)
+    text_lines = widget_middleware.text_lines
+
+    index = search_font_size(
+        font_sizes,
+        lambda font_size: get_paragraph_min_lines(widget_middleware, font_size, width)
+        * (font_size + MARGIN_BETWEEN_LINES)
+        <= height,
+    )
+    while True:
+        widget_middleware.font_size = font_sizes[index]
+        if index:
+            text_lines = get_paragraph_lines(widget, widget_middleware)
+        if (
+            index == len(font_sizes) - 1
+            or len(text_lines) * (font_sizes[index] + MARGIN_BETWEEN_LINES) <= height
+        ):
+            break
+        index += 1
 
-    while (
-        widget_middleware.font_size > FONT_SIZE_REDUCE_STEP
-        and len(widget_middleware.text_lines)
-        * (widget_middleware.font_size + MARGIN_BETWEEN_LINES)
-        > height
-    ):
-        widget_middleware.font_size -= FONT_SIZE_REDUCE_STEP
-        widget_middleware.text_lines = get_paragraph_lines(widget, widget_middleware)
+    widget_middleware.text_lines = text_lines
 
 
 def adjust_text_field_font_size(widget: dict, widget_middleware: Text) -> None:
     """Reduces the font size of a text field until texts fits."""
 
     width = abs(float(widget[Rect][0]) - float(widget[Rect][2]))
-
-    while (
-        widget_middleware.font_size > FONT_SIZE_REDUCE_STEP
-        and stringWidth(
-            widget_middleware.value, widget_middleware.font, widget_middleware.font_size
-        )
-        > width
-    ):
-        widget_middleware.font_size -= FONT_SIZE_REDUCE_STEP
+    metrics = get_font_metrics(widget_middleware.font)
+    units = metrics.text_units(widget_middleware.value)
+
+    def fits(font_size: Union[float, int]) -> bool:
+        return metrics.scale(units, font_size) <= width
+
+    font_sizes = get_font_size_steps(widget_middleware.font_size)
+    index = 0
+    if units:
+        index = ceil((font_sizes[0] - width * 1000 / units) / FONT_SIZE_REDUCE_STEP)
+        index = min(max(index, 0), len(font_sizes) - 1)
+    while index and fits(font_sizes[index - 1]):
+        index -= 1
+    while index < len(font_sizes) - 1 and not fits(font_sizes[index]):
+        index += 1
+
+    widget_middleware.font_size = font_sizes[index]
@@ -10,17 +10,14 @@ from PIL import Image
 def rotate_image(image_stream: bytes, rotation: Union[float, int]) -> bytes:
     """Rotates an image by a rotation angle."""
 
-    buff = BytesIO()
-    buff.write(image_stream)
-    buff.seek(0)
+    buff = BytesIO(image_stream)
 
     image = Image.open(buff)
 
     rotated_buff = BytesIO()
     image.rotate(rotation, expand=True).save(rotated_buff, format=image.format)
-    rotated_buff.seek(0)
 
-    result = rotated_buff.read()
+    result = rotated_buff.getvalue()
 
     buff.close()
     rotated_buff.close()
@@ -31,9 +28,7 @@ def rotate_image(image_stream: bytes, rotation: Union[float, int]) -> bytes:
 def any_image_to_jpg(image_stream: bytes) -> bytes:
     """Converts an image of any type to jpg."""
 
-    buff = BytesIO()
-    buff.write(image_stream)
-    buff.seek(0)
+    buff = BytesIO(image_stream)
 
     image = Image.open(buff)
 
@@ -46,8 +41,7 @@ def any_image_to_jpg(image_stream: bytes) -> bytes:
 
     with BytesIO() as _file:
         rgb_image.save(_file, format="JPEG")
-        _file.seek(0)
-        result = _file.read()
+        result = _file.getvalue()
 
     buff.close()
     return result
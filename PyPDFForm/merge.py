@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""Contains helpers for merging many PDFs into one PDF as they are made."""
+
+from collections import deque
+from io import BytesIO
+from re import escape, fullmatch
+from typing import BinaryIO, Deque, Dict, Iterable, List, Set, Tuple, Union
+
+from pypdf import PdfReader
+from pypdf.generic import (ArrayObject, DictionaryObject, IndirectObject,
+                           NameObject, NullObject, NumberObject, PdfObject)
+
+from .adapter import open_fp_or_f_obj
+from .constants import (DEFAULT_PDF_HEADER, KEY_SUFFIX_SEPARATOR, AcroForm,
+                        Annots, Catalog, Count, Fields, Kids, Pages, Parent,
+                        Root, Size, Subtype, Type, Widget)
+from .template import get_widget_key, suffix_widget_keys
+from .utils import stream_to_io
+
+
+class MergedPdfWriter:
+    """
+    Writes the pages of PDFs into one PDF one PDF after another, together
+    with every object they reference, so that only the PDF being appended
+    is held in memory. The form fields of the widgets on the pages are all
+    put in the interactive form of the first PDF which has one.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructs a writer writing to a binary io object."""
+
+        super().__init__()
+        self.stream = stream
+        self.position = 0
+        self.offsets: List[Union[int, None]] = []
+        self.pages: List[int] = []
+        self.fields: List[int] = []
+        self.acro_form: Union[DictionaryObject, None] = None
+        self.acro_form_id = 0
+        self.pages_id = self.reserve()
+        self.root_id = self.reserve()
+
+    def reserve(self) -> int:
+        """Reserves the number of a new object."""
+
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def reference(self, idnum: int) -> IndirectObject:
+        """Returns a reference to an object of the merged PDF."""
+
+        return IndirectObject(idnum, 0, self)
+
+    def write(self, data: bytes) -> None:
+        """Writes data, keeping track of where the next data will be written."""
+
+        self.stream.write(data)
+        self.position += len(data)
+
+    def write_header(self, header: str) -> None:
+        """Writes the header of the merged PDF unless it is written already."""
+
+        if not self.position:
+            self.write(f"{header}\n".encode() + b"%\xe2\xe3\xcf\xd3\n")
+
+    def write_object(self, idnum: int, obj: PdfObject) -> None:
+        """Writes an object under its number, keeping where it starts."""
+
+        self.offsets[idnum - 1] = self.position
+
+        with BytesIO() as f:
+            f.write(f"{idnum} 0 obj\n".encode())
+            obj.write_to_stream(f)
+            f.write(b"\nendobj\n")
+            self.write(f.getvalue())
+
+    def map(
+        self,
+        reference: IndirectObject,
+        ids: Dict[Tuple[int, int], int],
+        pending: Deque[Tuple[int, PdfObject]],
+    ) -> int:
+        """
+        Returns the number of the new object an object of the PDF being
+        appended is written as, queueing it to be written the first time.
+        """
+
+        key = (reference.idnum, reference.generation)
+        if key not in ids:
+            ids[key] = self.reserve()
+            target = reference.get_object()
+            pending.append((ids[key], NullObject() if target is None else target))
+
+        return ids[key]
+
+    def remap(
+        self,
+        obj: PdfObject,
+        ids: Dict[Tuple[int, int], int],
+        pending: Deque[Tuple[int, PdfObject]],
+        visited: Dict[int, PdfObject],
+    ) -> None:
+        """
+        Replaces the references of an object to objects of the PDF being
+        appended with references to new objects, which are queued to be
+        written. Direct objects shared by others are only visited once, and
+        are kept by what was visited so that their ids are not reused.
+        """
+
+        if not isinstance(obj, (DictionaryObject, ArrayObject)) or id(obj) in visited:
+            return
+        visited[id(obj)] = obj
+
+        for key, value in list(
+            obj.items() if isinstance(obj, DictionaryObject) else enumerate(obj)
+        ):
+            if isinstance(value, IndirectObject):
+                if value.pdf is not self:
+                    obj[key] = self.reference(self.map(value, ids, pending))
+            else:
+                self.remap(value, ids, pending, visited)
+
+    def append(self, pdf: PdfReader) -> None:
+        """
+        Writes the pages of a PDF and every object they reference, skipping
+        the page tree they belonged to, and collects the top level fields of
+        their widgets. Widgets which are not indirect objects are made so,
+        since form fields need to be referenced.
+        """
+
+        self.write_header(pdf.pdf_header)
+
+        ids = {}
+        pending = deque()
+        visited = {}
+        fields = set()
+
+        acro_form = pdf.root_object.get(AcroForm)
+        acro_form = acro_form.get_object() if acro_form is not None else None
+        if self.acro_form is None and isinstance(acro_form, DictionaryObject):
+            self.acro_form = DictionaryObject(
+                {key: value for key, value in acro_form.items() if key != Fields}
+            )
+            self.acro_form_id = self.reserve()
+            self.remap(self.acro_form, ids, pending, visited)
+
+        for page in pdf.pages:
+            page[NameObject(Parent)] = self.reference(self.pages_id)
+
+            annots = page.get(Annots)
+            annots = annots.get_object() if annots is not None else None
+            if not isinstance(annots, ArrayObject):
+                annots = ArrayObject()
+
+            for i, annot in enumerate(annots):
+                if isinstance(annot, IndirectObject):
+                    idnum = self.map(annot, ids, pending)
+                    annot = annot.get_object()
+                else:
+                    idnum = self.reserve()
+                    pending.append((idnum, annot))
+                    annots[i] = self.reference(idnum)
+
+                if isinstance(annot, DictionaryObject):
+                    self.collect_field(annot, idnum, ids, pending, fields)
+
+            self.pages.append(self.map(page.indirect_reference, ids, pending))
+
+        while pending:
+            idnum, obj = pending.popleft()
+            self.remap(obj, ids, pending, visited)
+            self.write_object(idnum, obj)
+
+    def collect_field(
+        self,
+        annot: DictionaryObject,
+        idnum: int,
+        ids: Dict[Tuple[int, int], int],
+        pending: Deque[Tuple[int, PdfObject]],
+        fields: Set[int],
+    ) -> None:
+        """
+        Collects the top level field of a widget by the number of the new
+        object it is written as, unless it is collected already.
+        """
+
+        if annot.get(Subtype) != Widget:
+            return
+
+        parent = annot.get(Parent)
+        while isinstance(parent, IndirectObject):
+            idnum = self.map(parent, ids, pending)
+            parent = parent.get_object()
+            parent = (
+                parent.get(Parent) if isinstance(parent, DictionaryObject) else None
+            )
+
+        if idnum not in fields:
+            fields.add(idnum)
+            self.fields.append(idnum)
+
+    def close(self) -> None:
+        """Writes the page tree, the interactive form and the trailer."""
+
+        self.write_header(DEFAULT_PDF_HEADER)
+
+        self.write_object(
+            self.pages_id,
+            DictionaryObject(
+                {
+                    NameObject(Type): NameObject(Pages),
+                    NameObject(Kids): ArrayObject(
+                        [self.reference(each) for each in self.pages]
+                    ),
+                    NameObject(Count): NumberObject(len(self.pages)),
+                }
+            ),
+        )
+
+        root = DictionaryObject(
+            {
+                NameObject(Type): NameObject(Catalog),
+                NameObject(Pages): self.reference(self.pages_id),
+            }
+        )
+        if self.acro_form is not None:
+            self.acro_form[NameObject(Fields)] = ArrayObject(
+                [self.reference(each) for each in self.fields]
+            )
+            self.write_object(self.acro_form_id, self.acro_form)
+            root[NameObject(AcroForm)] = self.reference(self.acro_form_id)
+        self.write_object(self.root_id, root)
+
+        xref = self.position
+        self.write(
+            f"xref\n0 {len(self.offsets) + 1}\n0000000000 65535 f \n".encode()
+            + b"".join(f"{each:010} 00000 n \n".encode() for each in self.offsets)
+        )
+
+        with BytesIO() as f:
+            DictionaryObject(
+                {
+                    NameObject(Size): NumberObject(len(self.offsets) + 1),
+                    NameObject(Root): self.reference(self.root_id),
+                }
+            ).write_to_stream(f)
+            self.write(
+                b"trailer\n" + f.getvalue() + f"\nstartxref\n{xref}\n%%EOF\n".encode()
+            )
+
+
+def get_key_separator(keys: Iterable[str]) -> str:
+    """
+    Returns the shortest run of separators which no key is made of another
+    key and a number joined by, so that suffixing keys with it and a number
+    cannot make a key which is already there.
+    """
+
+    keys = set(keys)
+    result = KEY_SUFFIX_SEPARATOR
+    while any(
+        (match := fullmatch(rf"(.*){escape(result)}\d+", each)) is not None
+        and match.group(1) in keys
+        for each in keys
+    ):
+        result += KEY_SUFFIX_SEPARATOR
+
+    return result
+
+
+def merge_copies(copies: Iterable[bytes], output: Union[str, BinaryIO]) -> None:
+    """
+    Appends copies of a PDF form into one PDF written to the output as
+    each copy comes, suffixing the keys of the widgets of the n-th copy
+    with a separator and n.
+    """
+
+    separator = None
+
+    with open_fp_or_f_obj(output) as _file:
+        writer = MergedPdfWriter(_file)
+
+        for i, each in enumerate(copies):
+            pdf = PdfReader(stream_to_io(each))
+
+            if separator is None:
+                separator = get_key_separator(
+                    key
+                    for page in pdf.pages
+                    for annot in page.get(Annots, [])  # noqa
+                    if isinstance(key := get_widget_key(annot.get_object()), str)
+                )
+
+            suffix_widget_keys(pdf.pages, f"{separator}{i}")
+            writer.append(pdf)
+
+        writer.close()
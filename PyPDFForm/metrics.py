@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Contains the glyph width tables texts are measured with."""
+
+from typing import Dict, Iterable, List, Union
+
+from reportlab.pdfbase.pdfmetrics import getFont, unicode2T1
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+class FontMetrics:
+    """
+    A table of the glyph widths of a font in 1/1000 font size.
+
+    Each character is looked up in the font once. Texts are measured by
+    adding up the widths of their characters from left to right and then
+    scaling the sum by font size, the same way stringWidth does, so
+    the results are identical to it.
+    """
+
+    def __init__(self, font_name: str) -> None:
+        """Constructs an empty table of a registered font."""
+
+        super().__init__()
+        self.font = getFont(font_name)
+        self.is_ttf = isinstance(self.font, TTFont)
+        self.widths: Dict[str, Union[float, int]] = {}
+
+    def char_units(self, char: str) -> Union[float, int]:
+        """Returns the width of a character in 1/1000 font size."""
+
+        result = self.widths.get(char)
+        if result is None:
+            if self.is_ttf:
+                result = self.font.face.charWidths.get(
+                    ord(char), self.font.face.defaultWidth
+                )
+            else:
+                result = sum(
+                    sum(map(font.widths.__getitem__, text))
+                    for font, text in unicode2T1(
+                        char, [self.font, *self.font.substitutionFonts]
+                    )
+                )
+            self.widths[char] = result
+
+        return result
+
+    def text_units(self, text: str) -> Union[float, int]:
+        """Returns the width of a text in 1/1000 font size."""
+
+        result = 0
+        for char in text:
+            result += self.char_units(char)
+
+        return result
+
+    def scale(self, units: Union[float, int], font_size: Union[float, int]) -> float:
+        """Scales a width in 1/1000 font size to points."""
+
+        if self.is_ttf:
+            return 0.001 * font_size * units
+
+        return units * 0.001 * font_size
+
+    def text_width(self, text: str, font_size: Union[float, int]) -> float:
+        """Returns the width of a text in points."""
+
+        return self.scale(self.text_units(text), font_size)
+
+
+FONT_METRICS: Dict[str, FontMetrics] = {}
+
+
+def get_font_metrics(font_name: str) -> FontMetrics:
+    """Returns the glyph width table of a font, creating it the first time."""
+
+    result = FONT_METRICS.get(font_name)
+    if result is None:
+        result = FontMetrics(font_name)
+        FONT_METRICS[font_name] = result
+
+    return result
+
+
+def clear_font_metrics(font_name: str) -> None:
+    """Drops the glyph width table of a font, e.g. once it is registered again."""
+
+    FONT_METRICS.pop(font_name, None)
+
+
+def string_width(text: str, font_name: str, font_size: Union[float, int]) -> float:
+    """Returns the width of a text in a font in points."""
+
+    return get_font_metrics(font_name).text_width(text, font_size)
+
+
+def string_widths(
+    texts: Iterable[str], font_name: str, font_size: Union[float, int]
+) -> List[float]:
+    """Returns the widths of many texts in a font in points at once."""
+
+    metrics = get_font_metrics(font_name)
+
+    return [metrics.text_width(text, font_size) for text in texts]
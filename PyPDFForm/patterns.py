@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 """Contains patterns used for identifying properties of widgets."""
 
+from typing import Any, Union
+
 from pypdf.generic import (DictionaryObject, NameObject, NumberObject,
                            TextStringObject)
 
 from .constants import (AP, AS, CA, DA, DV, FT, IMAGE_FIELD_IDENTIFIER, JS, MK,
                         MULTILINE, READ_ONLY, A, Btn, Ch, Ff, N, Off, Opt,
-                        Parent, Q, Sig, T, Tx, V, Yes)
+                        Parent, Q, Sig, Subtype, T, Tx, V, Widget, Yes)
 from .middleware.checkbox import Checkbox
 from .middleware.dropdown import Dropdown
 from .middleware.image import Image
@@ -93,6 +95,53 @@ BUTTON_STYLE_PATTERNS = [
 ]
 
 
+def resolve_value(widget: dict, key: str) -> Any:
+    """Returns the resolved value of a key of a PDF dict or None if missing."""
+
+    value = widget.get(key)
+    return value.get_object() if value is not None else None
+
+
+def get_widget_type(widget: dict) -> Union[type, None]:
+    """
+    Classifies an annotation like matching it against WIDGET_TYPE_PATTERNS
+    in order does, but looking up each key directly and only once.
+    Annotations of other subtypes than widget, e.g. links, are skipped.
+    """
+
+    # pylint: disable=R0911
+    subtype = resolve_value(widget, Subtype)
+    if subtype is not None and subtype != Widget:
+        return None
+
+    action = resolve_value(widget, A)
+    if isinstance(action, dict) and resolve_value(action, JS) == IMAGE_FIELD_IDENTIFIER:
+        return Image
+
+    field_type = resolve_value(widget, FT)
+    if field_type == Sig:
+        return Signature
+    if field_type == Tx:
+        return Text
+
+    is_checked_or_off = resolve_value(widget, AS) in (Yes, Off)
+    if field_type == Btn and is_checked_or_off:
+        return Checkbox
+    if field_type == Ch:
+        return Dropdown
+
+    parent = resolve_value(widget, Parent)
+    parent_field_type = resolve_value(parent, FT) if isinstance(parent, dict) else None
+    if parent_field_type == Ch:
+        return Dropdown
+    if parent_field_type == Tx:
+        return Text
+    if parent_field_type == Btn and is_checked_or_off:
+        return Checkbox if resolve_value(parent, DV) in (Yes, Off) else Radio
+
+    return None
+
+
 def simple_update_checkbox_value(annot: DictionaryObject, check: bool = False) -> None:
     """Patterns to update values for checkbox annotations."""
 
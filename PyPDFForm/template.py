@@ -1,38 +1,41 @@
 # -*- coding: utf-8 -*-
 """Contains helpers for generic template related processing."""
 
-from functools import lru_cache
+from functools import partial
 from io import BytesIO
 from sys import maxsize
 from typing import Dict, List, Tuple, Union, cast
 
-from pypdf import PdfReader, PdfWriter
-from pypdf.generic import DictionaryObject
-from reportlab.pdfbase.pdfmetrics import stringWidth
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import (ArrayObject, DictionaryObject, FloatObject,
+                           NameObject, NumberObject)
 
-from .constants import (COMB, DEFAULT_FONT_SIZE, MULTILINE, NEW_LINE_SYMBOL,
-                        WIDGET_TYPES, Annots, MaxLen, Rect)
+from .cache import cache_by_template
+from .constants import (COMB, DA, DEFAULT_FONT_SIZE, MULTILINE,
+                        NEW_LINE_SYMBOL, WIDGET_TYPES, Annots, Ff, MaxLen,
+                        Parent, Q, Rect, Subtype, T, Widget)
 from .font import (adjust_paragraph_font_size, adjust_text_field_font_size,
                    auto_detect_font, get_text_field_font_color,
                    get_text_field_font_size, text_field_font_size)
+from .metrics import get_font_metrics, string_widths
 from .middleware.checkbox import Checkbox
 from .middleware.dropdown import Dropdown
 from .middleware.radio import Radio
 from .middleware.text import Text
 from .patterns import (BUTTON_STYLE_PATTERNS, DROPDOWN_CHOICE_PATTERNS,
                        TEXT_FIELD_FLAG_PATTERNS, WIDGET_ALIGNMENT_PATTERNS,
-                       WIDGET_KEY_PATTERNS, WIDGET_TYPE_PATTERNS,
+                       WIDGET_KEY_PATTERNS, get_widget_type,
                        update_annotation_name)
-from .utils import find_pattern_match, stream_to_io, traverse_pattern
-from .watermark import create_watermarks_and_draw
+from .utils import stream_to_io, traverse_pattern
+from .watermark import create_multi_page_watermarks, get_page_size
 
 
 def set_character_x_paddings(
-    pdf_stream: bytes, widgets: Dict[str, WIDGET_TYPES]
+    widgets_by_page: Dict[int, List[dict]], widgets: Dict[str, WIDGET_TYPES]
 ) -> Dict[str, WIDGET_TYPES]:
     """Sets paddings between characters for combed text fields."""
 
-    for _widgets in get_widgets_by_page(pdf_stream).values():
+    for _widgets in widgets_by_page.values():
         for widget in _widgets:
             key = get_widget_key(widget)
             _widget = widgets[key]
@@ -43,12 +46,15 @@ def set_character_x_paddings(
     return widgets
 
 
-def build_widgets(pdf_stream: bytes) -> Dict[str, WIDGET_TYPES]:
-    """Builds a widget dict given a PDF form stream."""
+@cache_by_template(in_memory=False, on_disk=True)
+def build_widgets(
+    pdf_stream: bytes, pdf_file: Union[PdfReader, None] = None
+) -> Dict[str, WIDGET_TYPES]:
+    """Builds a widget dict given a PDF form stream and optionally its parsed file."""
 
     results = {}
 
-    for widgets in get_widgets_by_page(pdf_stream).values():
+    for widgets in get_widgets_by_page(pdf_stream, pdf_file).values():
         for widget in widgets:
             key = get_widget_key(widget)
 
@@ -78,13 +84,13 @@ def build_widgets(pdf_stream: bytes) -> Dict[str, WIDGET_TYPES]:
     return results
 
 
-def widget_rect_watermarks(pdf: bytes) -> List[bytes]:
+def widget_rect_watermarks(pdf: bytes) -> List[Union[PageObject, None]]:
     """Draws the rectangular border of each widget and returns watermarks."""
 
-    watermarks = []
+    rects_by_page = {}
 
     for page, widgets in get_widgets_by_page(pdf).items():
-        to_draw = []
+        rects_by_page[page] = []
         for widget in widgets:
             rect = widget[Rect]
             x = rect[0]
@@ -92,12 +98,13 @@ def widget_rect_watermarks(pdf: bytes) -> List[bytes]:
             width = abs(rect[0] - rect[2])
             height = abs(rect[1] - rect[3])
 
-            to_draw.append([x, y, width, height])
-        watermarks.append(
-            create_watermarks_and_draw(pdf, page, "rect", to_draw)[page - 1]
-        )
+            rects_by_page[page].append([x, y, width, height])
 
-    return watermarks
+    return create_multi_page_watermarks(
+        [get_page_size(page) for page in PdfReader(stream_to_io(pdf)).pages],
+        rects_by_page,
+        "rect",
+    )
 
 
 def dropdown_to_text(dropdown: Dropdown) -> Text:
@@ -116,12 +123,12 @@ def dropdown_to_text(dropdown: Dropdown) -> Text:
 
 
 def update_text_field_attributes(
-    template_stream: bytes,
+    widgets_by_page: Dict[int, List[dict]],
     widgets: Dict[str, WIDGET_TYPES],
 ) -> None:
     """Auto updates text fields' attributes."""
 
-    for _widgets in get_widgets_by_page(template_stream).values():
+    for _widgets in widgets_by_page.values():
         for _widget in _widgets:
             key = get_widget_key(_widget)
 
@@ -154,11 +161,113 @@ def update_text_field_attributes(
                         adjust_text_field_font_size(_widget, widgets[key])
 
 
-@lru_cache()
-def get_widgets_by_page(pdf: bytes) -> Dict[int, List[dict]]:
-    """Iterates through a PDF and returns all widgets found grouped by page."""
+def get_text_field_appearance(
+    widget: dict,
+) -> Tuple[str, Union[float, int], Union[Tuple[float, float, float], None]]:
+    """Returns the font, font size and font color a text field specifies."""
+
+    return (
+        auto_detect_font(widget),
+        get_text_field_font_size(widget),
+        get_text_field_font_color(widget),
+    )
+
+
+def get_text_field_appearances(
+    pdf: bytes, widgets: Dict[str, WIDGET_TYPES]
+) -> Dict[
+    str, Tuple[str, Union[float, int], Union[Tuple[float, float, float], None]]
+]:
+    """
+    Returns the appearance of each text and dropdown field
+    taken from the first widget with its key.
+    """
+
+    result = {}
+
+    for _widgets in compile_widgets_by_page(pdf).values():
+        for widget in _widgets:
+            key = get_widget_key(widget)
+            if key not in result and isinstance(widgets.get(key), (Text, Dropdown)):
+                result[key] = get_text_field_appearance(widget)
+
+    return result
+
+
+def set_text_field_appearance(
+    widget_middleware: Text,
+    appearance: Tuple[
+        str, Union[float, int], Union[Tuple[float, float, float], None]
+    ],
+) -> None:
+    """
+    Sets a text field's font, font size and font color to the ones
+    its PDF widget specifies unless they are already set.
+    """
+
+    font, font_size, font_color = appearance
+
+    if widget_middleware.font is None:
+        widget_middleware.font = font
+    if widget_middleware.font_size is None and font_size:
+        widget_middleware.font_size = font_size
+    if widget_middleware.font_color is None:
+        widget_middleware.font_color = font_color
+
+
+def compile_widget(widget: dict) -> dict:
+    """
+    Resolves the key, rectangle, alignment and field flag of a widget,
+    including the ones inherited from its parent, into a standalone dict
+    which also keeps the text appearances of the widget and its parent.
+    """
+
+    result = {
+        T: get_widget_key(widget),
+        Rect: ArrayObject([FloatObject(each) for each in widget[Rect]]),
+    }
+
+    alignment = get_widget_alignment(widget)
+    if alignment:
+        result[Q] = NumberObject(alignment)
+
+    field_flag = get_field_flag(widget)
+    if field_flag:
+        result[Ff] = NumberObject(field_flag)
+
+    if widget.get(DA):
+        result[DA] = widget[DA].get_object()
+
+    parent = widget[Parent].get_object() if Parent in widget else {}
+    if parent.get(DA):
+        result[Parent] = DictionaryObject({NameObject(DA): parent[DA]})
+
+    return result
+
+
+@cache_by_template(on_disk=True)
+def compile_widgets_by_page(
+    pdf: bytes, pdf_file: Union[PdfReader, None] = None
+) -> Dict[int, List[dict]]:
+    """Returns all widgets of a PDF grouped by page and compiled."""
+
+    return {
+        page: [compile_widget(widget) for widget in widgets]
+        for page, widgets in get_widgets_by_page(pdf, pdf_file).items()
+    }
 
-    pdf_file = PdfReader(stream_to_io(pdf))
+
+@cache_by_template()
+def get_widgets_by_page(
+    pdf: bytes, pdf_file: Union[PdfReader, None] = None
+) -> Dict[int, List[dict]]:
+    """
+    Iterates through a PDF and returns all widgets found grouped by page,
+    parsing the PDF unless its parsed file is given.
+    """
+
+    if pdf_file is None:
+        pdf_file = PdfReader(stream_to_io(pdf))
 
     result = {}
 
@@ -168,14 +277,8 @@ def get_widgets_by_page(pdf: bytes) -> Dict[int, List[dict]]:
         if widgets:
             for widget in widgets:
                 widget = dict(widget.get_object())
-                for each in WIDGET_TYPE_PATTERNS:
-                    patterns = each[0]
-                    check = True
-                    for pattern in patterns:
-                        check = check and find_pattern_match(pattern, widget)
-                    if check:
-                        result[i + 1].append(widget)
-                        break
+                if get_widget_type(widget) is not None:
+                    result[i + 1].append(widget)
 
     return result
 
@@ -207,16 +310,8 @@ def get_widget_alignment(widget: dict) -> Union[str, list, None]:
 def construct_widget(widget: dict, key: str) -> Union[WIDGET_TYPES, None]:
     """Finds a PDF widget's annotated type by pattern matching."""
 
-    result = None
-    for each in WIDGET_TYPE_PATTERNS:
-        patterns, _type = each
-        check = True
-        for pattern in patterns:
-            check = check and find_pattern_match(pattern, widget)
-        if check:
-            result = _type(key)
-            break
-    return result
+    _type = get_widget_type(widget)
+    return _type(key) if _type is not None else None
 
 
 def get_text_field_max_length(widget: dict) -> Union[int, None]:
@@ -225,8 +320,8 @@ def get_text_field_max_length(widget: dict) -> Union[int, None]:
     return int(widget[MaxLen]) or None if MaxLen in widget else None
 
 
-def check_field_flag_bit(widget: dict, bit: int) -> bool:
-    """Checks if a bit is set in a widget's field flag."""
+def get_field_flag(widget: dict) -> Union[str, list, None]:
+    """Finds a PDF widget's field flag by pattern matching."""
 
     field_flag = None
     for pattern in TEXT_FIELD_FLAG_PATTERNS:
@@ -234,6 +329,14 @@ def check_field_flag_bit(widget: dict, bit: int) -> bool:
         if field_flag is not None:
             break
 
+    return field_flag
+
+
+def check_field_flag_bit(widget: dict, bit: int) -> bool:
+    """Checks if a bit is set in a widget's field flag."""
+
+    field_flag = get_field_flag(widget)
+
     if field_flag is None:
         return False
 
@@ -294,12 +397,13 @@ def get_character_x_paddings(widget: dict, widget_middleware: Text) -> List[floa
     result = []
 
     current_x = 0
-    for char in (widget_middleware.value or "")[:length]:
+    for char_width in string_widths(
+        (widget_middleware.value or "")[:length],
+        widget_middleware.font,
+        widget_middleware.font_size,
+    ):
         current_mid_point = current_x + char_rect_width / 2
-        result.append(
-            current_mid_point
-            - stringWidth(char, widget_middleware.font, widget_middleware.font_size) / 2
-        )
+        result.append(current_mid_point - char_width / 2)
         current_x += char_rect_width
 
     return result
@@ -311,27 +415,41 @@ def split_characters_into_lines(
     """
     Given a long string meant to be filled for a paragraph widget
     split by the new line symbol already, splits it further into lines
-    where each line would fit into the widget's width.
+    where each line would fit into the widget's width. Each character
+    is measured once and lines are measured by adding up their widths.
     """
 
+    metrics = get_font_metrics(middleware.font)
+    char_width = metrics.char_units
+    to_width = partial(metrics.scale, font_size=middleware.font_size)
+    space = char_width(" ")
+
     lines = []
     for line in split_by_new_line_symbol:
         characters = line.split(" ")
-        current_line = ""
+        current_line = []
+        current_units = 0
         for each in characters:
-            line_extended = f"{current_line} {each}" if current_line else each
-            if (
-                stringWidth(line_extended, middleware.font, middleware.font_size)
-                <= width
-            ):
-                current_line = line_extended
+            extended = bool(current_line) and current_line[0] != ""
+            units = current_units + space if extended else 0
+            for char in each:
+                units += char_width(char)
+            if to_width(units) <= width:
+                if extended:
+                    current_line.append(each)
+                else:
+                    current_line = [each]
+                current_units = units
             else:
-                lines.append(current_line)
-                current_line = each
+                lines.append(" ".join(current_line))
+                current_line = [each]
+                current_units = 0
+                for char in each:
+                    current_units += char_width(char)
         lines.append(
-            current_line + NEW_LINE_SYMBOL
+            " ".join(current_line) + NEW_LINE_SYMBOL
             if len(split_by_new_line_symbol) > 1
-            else current_line
+            else " ".join(current_line)
         )
 
     return lines
@@ -345,32 +463,34 @@ def adjust_each_line(lines: List[str], middleware: Text, width: float) -> List[s
     unnecessary lines.
     """
 
+    metrics = get_font_metrics(middleware.font)
+    char_width = metrics.char_units
+    to_width = partial(metrics.scale, font_size=middleware.font_size)
+    space = char_width(" ")
+
     result = []
     for each in lines:
-        tracker = ""
-        for char in each:
-            check = tracker + char
-            if stringWidth(check, middleware.font, middleware.font_size) > width:
-                result.append(tracker)
-                tracker = char
+        start = 0
+        tracker_units = 0
+        for i, char in enumerate(each):
+            check_units = tracker_units + char_width(char)
+            if to_width(check_units) > width:
+                result.append(each[start:i])
+                start = i
+                tracker_units = char_width(char)
             else:
-                tracker = check
+                tracker_units = check_units
 
-        each = tracker
+        each = each[start:]
         if each:
-            if (
-                result
-                and stringWidth(
-                    f"{each} {result[-1]}",
-                    middleware.font,
-                    middleware.font_size,
-                )
-                <= width
-                and NEW_LINE_SYMBOL not in result[-1]
-            ):
-                result[-1] = f"{result[-1]}{each} "
-            else:
-                result.append(f"{each} ")
+            if result and NEW_LINE_SYMBOL not in result[-1]:
+                units = tracker_units + space
+                for char in result[-1]:
+                    units += char_width(char)
+                if to_width(units) <= width:
+                    result[-1] = f"{result[-1]}{each} "
+                    continue
+            result.append(f"{each} ")
 
     for i, each in enumerate(result):
         result[i] = each.replace(NEW_LINE_SYMBOL, "")
@@ -408,21 +528,27 @@ def get_paragraph_auto_wrap_length(widget_middleware: Text) -> int:
     return result
 
 
-def update_widget_key(
+def update_widget_keys(
     template: bytes,
     widgets: Dict[str, WIDGET_TYPES],
-    old_key: str,
-    new_key: str,
-    index: int,
+    new_keys: Dict[Tuple[str, int], str],
 ) -> bytes:
-    """Updates the key of a widget."""
+    """
+    Updates the keys of widgets given the new key of each old key and index.
+    Every key is matched against the PDF as it was before any update, since
+    the new key of each widget is found before any widget is renamed.
+    """
     # pylint: disable=R0801
 
     pdf = PdfReader(stream_to_io(template))
     out = PdfWriter()
     out.append(pdf)
 
-    tracker = -1
+    radio_new_keys = {}
+    for (old_key, _), new_key in new_keys.items():
+        radio_new_keys.setdefault(old_key, new_key)
+    trackers = {}
+    renames = []
 
     for page in out.pages:
         for annot in page.get(Annots, []):  # noqa
@@ -433,16 +559,37 @@ def update_widget_key(
             if widget is None:
                 continue
 
-            if old_key != key:
+            if key not in radio_new_keys:
                 continue
 
-            tracker += 1
-            if not isinstance(widget, Radio) and tracker != index:
-                continue
+            trackers[key] = trackers.get(key, -1) + 1
+            new_key = (
+                radio_new_keys[key]
+                if isinstance(widget, Radio)
+                else new_keys.get((key, trackers[key]))
+            )
+
+            if new_key is not None:
+                renames.append((annot, new_key))
 
-            update_annotation_name(annot, new_key)
+    for annot, new_key in renames:
+        update_annotation_name(annot, new_key)
 
     with BytesIO() as f:
         out.write(f)
-        f.seek(0)
-        return f.read()
+        return f.getvalue()
+
+
+def suffix_widget_keys(pages: List[PageObject], suffix: str) -> None:
+    """Appends a suffix to the key of each widget on the pages."""
+
+    widgets = []
+    for page in pages:
+        for annot in page.get(Annots, []):  # noqa
+            annot = cast(DictionaryObject, annot.get_object())
+            key = get_widget_key(annot)
+            if annot.get(Subtype) == Widget and key:
+                widgets.append((annot, key))
+
+    for annot, key in widgets:
+        update_annotation_name(annot, f"{key}{suffix}")
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 """Contains utility helpers."""
 
-from io import BytesIO
-from typing import BinaryIO, List, Union
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BufferedReader, BytesIO, RawIOBase
+from typing import Any, BinaryIO, Iterable, Union
 
 from pypdf import PdfReader, PdfWriter
 from pypdf.generic import DictionaryObject
@@ -15,14 +15,59 @@ from .middleware.radio import Radio
 from .middleware.text import Text
 
 
-def stream_to_io(stream: bytes) -> BinaryIO:
-    """Converts a byte stream to a binary io object."""
+class BufferIO(RawIOBase):
+    """A binary io object reading from a buffer, e.g. a memory map, without copying it."""
 
-    result = BytesIO()
-    result.write(stream)
-    result.seek(0)
+    def __init__(self, buffer: Any) -> None:
+        """Constructs the object at the start of the buffer."""
+
+        super().__init__()
+        self.buffer = memoryview(buffer)
+        self.position = 0
+
+    def readable(self) -> bool:
+        """Returns true since the buffer can be read."""
+
+        return True
+
+    def seekable(self) -> bool:
+        """Returns true since the buffer can be read at any position."""
+
+        return True
+
+    def tell(self) -> int:
+        """Returns the current position in the buffer."""
+
+        return self.position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Moves to a position in the buffer."""
+
+        if whence == SEEK_CUR:
+            offset += self.position
+        elif whence == SEEK_END:
+            offset += len(self.buffer)
+
+        self.position = max(offset, 0)
+        return self.position
+
+    def readinto(self, b: Any) -> int:
+        """Reads from the current position in the buffer into another buffer."""
+
+        data = self.buffer[self.position : self.position + len(b)]
+        b[: len(data)] = data
+        self.position += len(data)
+
+        return len(data)
+
+
+def stream_to_io(stream: Any) -> BinaryIO:
+    """Wraps a byte stream or a buffer in a binary io object without copying it."""
 
-    return result
+    if isinstance(stream, bytes):
+        return BytesIO(stream)
+
+    return BufferedReader(BufferIO(stream))
 
 
 def checkbox_radio_to_draw(
@@ -71,25 +116,17 @@ def remove_all_widgets(pdf: bytes) -> bytes:
         writer.add_page(page)
 
     writer.write(result_stream)
-    result_stream.seek(0)
-    return result_stream.read()
-
+    return result_stream.getvalue()
 
-def get_page_streams(pdf: bytes) -> List[bytes]:
-    """Returns a list of streams where each is a page of the input PDF."""
-
-    pdf_file = PdfReader(stream_to_io(pdf))
-    result = []
 
-    for page in pdf_file.pages:
-        writer = PdfWriter()
-        writer.add_page(page)
-        with BytesIO() as f:
-            writer.write(f)
-            f.seek(0)
-            result.append(f.read())
+def get_page_stream(pdf_file: PdfReader, page_number: int) -> bytes:
+    """Returns a stream of a single page of a parsed PDF."""
 
-    return result
+    writer = PdfWriter()
+    writer.add_page(pdf_file.pages[page_number])
+    with BytesIO() as f:
+        writer.write(f)
+        return f.getvalue()
 
 
 def merge_two_pdfs(pdf: bytes, other: bytes) -> bytes:
@@ -106,8 +143,25 @@ def merge_two_pdfs(pdf: bytes, other: bytes) -> bytes:
         output.add_page(page)
 
     output.write(result)
-    result.seek(0)
-    return result.read()
+    return result.getvalue()
+
+
+def merge_pdfs(pdfs: Iterable[bytes]) -> bytes:
+    """
+    Merges PDFs into one PDF, parsing each of them and writing the result
+    only once, with identical objects such as fonts shared across them.
+    """
+
+    output = PdfWriter()
+    result = BytesIO()
+
+    for pdf in pdfs:
+        for page in PdfReader(stream_to_io(pdf)).pages:
+            output.add_page(page)
+
+    output.compress_identical_objects()
+    output.write(result)
+    return result.getvalue()
 
 
 def find_pattern_match(pattern: dict, widget: Union[dict, DictionaryObject]) -> bool:
@@ -2,12 +2,16 @@
 """Contains helpers for watermark."""
 
 from io import BytesIO
-from typing import List
+from re import findall
+from typing import Dict, List, Tuple, Union, cast
 
-from pypdf import PdfReader, PdfWriter
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen.canvas import Canvas
 
+from .constants import DEFAULT_ENGINE, XOBJECT_ENGINE, Font, Resources
+from .content import PageContent, create_form
 from .utils import stream_to_io
 
 
@@ -112,9 +116,7 @@ def draw_image(*args) -> None:
     width = args[4]
     height = args[5]
 
-    image_buff = BytesIO()
-    image_buff.write(image_stream)
-    image_buff.seek(0)
+    image_buff = BytesIO(image_stream)
 
     canvas.drawImage(
         ImageReader(image_buff),
@@ -127,24 +129,8 @@ def draw_image(*args) -> None:
     image_buff.close()
 
 
-def create_watermarks_and_draw(
-    pdf: bytes,
-    page_number: int,
-    action_type: str,
-    actions: List[list],
-) -> List[bytes]:
-    """Creates a canvas watermark and draw some stuffs on it."""
-
-    pdf_file = PdfReader(stream_to_io(pdf))
-    buff = BytesIO()
-
-    canvas = Canvas(
-        buff,
-        pagesize=(
-            float(pdf_file.pages[page_number - 1].mediabox[2]),
-            float(pdf_file.pages[page_number - 1].mediabox[3]),
-        ),
-    )
+def draw_on_canvas(canvas: Canvas, action_type: str, actions: List[list]) -> None:
+    """Draws some stuffs of an action type on the current page of a canvas."""
 
     if action_type == "image":
         for each in actions:
@@ -159,34 +145,166 @@ def create_watermarks_and_draw(
         for each in actions:
             draw_rect(*([canvas, *each]))
 
+
+def get_page_size(page: PageObject) -> Tuple[float, float]:
+    """Returns the width and height of a PDF page."""
+
+    return float(page.mediabox[2]), float(page.mediabox[3])
+
+
+def create_watermark(
+    page_size: Tuple[float, float],
+    action_type: str,
+    actions: List[list],
+) -> bytes:
+    """Creates a canvas watermark of a page size and draw some stuffs on it."""
+
+    buff = BytesIO()
+
+    canvas = Canvas(
+        buff,
+        pagesize=page_size,
+    )
+
+    draw_on_canvas(canvas, action_type, actions)
+
     canvas.save()
-    buff.seek(0)
 
-    watermark = buff.read()
+    watermark = buff.getvalue()
     buff.close()
 
+    return watermark
+
+
+def create_watermarks_and_draw(
+    pdf_file: PdfReader,
+    page_number: int,
+    action_type: str,
+    actions: List[list],
+) -> List[bytes]:
+    """Creates a canvas watermark and draw some stuffs on it."""
+
+    watermark = create_watermark(
+        get_page_size(pdf_file.pages[page_number - 1]), action_type, actions
+    )
+
     return [
         watermark if i == page_number - 1 else b"" for i in range(len(pdf_file.pages))
     ]
 
 
-def merge_watermarks_with_pdf(
-    pdf: bytes,
-    watermarks: list,
+def remove_unused_fonts(page: PageObject) -> PageObject:
+    """
+    Limits the fonts of a watermark page to the ones its content uses
+    since a multi-page canvas shares all its fonts between its pages.
+    """
+
+    resources = cast(DictionaryObject, page[NameObject(Resources)].get_object())
+    contents = page.get_contents()
+    used = set(
+        findall(
+            rb"/[^\s/\[\]<>(){}%]+",
+            contents.get_data() if contents is not None else b"",
+        )
+    )
+    fonts = DictionaryObject(
+        {
+            key: value
+            for key, value in cast(
+                DictionaryObject, resources[Font].get_object()
+            ).items()
+            if key.encode() in used
+        }
+    )
+
+    resources = DictionaryObject(resources)
+    resources[NameObject(Font)] = fonts
+    page[NameObject(Resources)] = resources
+
+    return page
+
+
+def create_multi_page_watermarks(
+    page_sizes: List[Tuple[float, float]],
+    actions_by_page: Dict[int, List[list]],
+    action_type: str,
+) -> List[Union[PageObject, None]]:
+    """
+    Draws the stuffs of all pages on one multi-page canvas and
+    returns its watermark page for each page of the PDF.
+    """
+
+    buff = BytesIO()
+    canvas = Canvas(buff)
+
+    page_numbers = sorted(actions_by_page)
+    for page_number in page_numbers:
+        canvas.setPageSize(page_sizes[page_number - 1])
+        draw_on_canvas(canvas, action_type, actions_by_page[page_number])
+        canvas.showPage()
+
+    canvas.save()
+    buff.seek(0)
+
+    watermark = PdfReader(buff)
+    result: List[Union[PageObject, None]] = [None for _ in page_sizes]
+    for i, page_number in enumerate(page_numbers):
+        result[page_number - 1] = remove_unused_fonts(watermark.pages[i])
+
+    return result
+
+
+def merge_watermark_layers(
+    pdf_file: PdfReader,
+    watermark_layers: List[list],
+    remove_widgets: bool = False,
+    engine: str = DEFAULT_ENGINE,
 ) -> bytes:
-    """Merges watermarks with PDF."""
+    """
+    Merges layers of watermarks in order with a parsed PDF,
+    optionally removes all its widgets and writes it once.
+    With the xobject engine, each watermark without widgets is drawn
+    as a form XObject instead of having its content merged into the page.
+    """
 
     result = BytesIO()
-    pdf_file = PdfReader(stream_to_io(pdf))
     output = PdfWriter()
 
     for i, page in enumerate(pdf_file.pages):
-        if watermarks[i]:
-            watermark = PdfReader(stream_to_io(watermarks[i]))
-            if watermark.pages:
-                page.merge_page(watermark.pages[0])
-        output.add_page(page)
+        watermark_pages = []
+        for watermarks in watermark_layers:
+            if isinstance(watermarks[i], PageObject):
+                watermark_pages.append(watermarks[i])
+            elif watermarks[i]:
+                watermark = PdfReader(stream_to_io(watermarks[i]))
+                watermark_pages.extend(watermark.pages[:1])
+
+        forms = []
+        for each in watermark_pages:
+            if engine == XOBJECT_ENGINE and not each.annotations:
+                forms.append(each)
+            else:
+                page.merge_page(each)
+        if remove_widgets and page.annotations:
+            page.annotations.clear()
+        page = output.add_page(page)
+
+        content = PageContent(output, page, {})
+        for each in forms:
+            content.draw_form(create_form(output, each))
+        content.save()
 
     output.write(result)
-    result.seek(0)
-    return result.read()
+    return result.getvalue()
+
+
+def merge_watermarks_with_pdf(
+    pdf: bytes,
+    watermarks: list,
+    engine: str = DEFAULT_ENGINE,
+) -> bytes:
+    """Merges watermarks with PDF."""
+
+    return merge_watermark_layers(
+        PdfReader(stream_to_io(pdf)), [watermarks], engine=engine
+    )
@@ -2,7 +2,7 @@
 """Contains base class for all widgets to create."""
 
 from io import BytesIO
-from typing import List, cast
+from typing import Dict, List, cast
 
 from pypdf import PdfReader, PdfWriter
 from pypdf.generic import DictionaryObject
@@ -64,35 +64,42 @@ class Widget:
                     ((type(self).__name__, each), kwargs.get(each))
                 )
 
-    def watermarks(self, stream: bytes) -> List[bytes]:
-        """Returns a list of watermarks after creating the widget."""
 
-        pdf = PdfReader(stream_to_io(stream))
-        page_count = len(pdf.pages)
+def create_widgets_watermarks(pdf: PdfReader, widgets: List[Widget]) -> List[bytes]:
+    """
+    Returns a list of watermarks after creating widgets, where
+    the widgets on the same page are created on one canvas.
+    """
+
+    widgets_by_page = {}
+    for each in widgets:
+        widgets_by_page.setdefault(each.page_number - 1, []).append(each)
+
+    result = [b""] * len(pdf.pages)
+    for i, page_widgets in widgets_by_page.items():
         watermark = BytesIO()
 
         canvas = Canvas(
             watermark,
             pagesize=(
-                float(pdf.pages[self.page_number - 1].mediabox[2]),
-                float(pdf.pages[self.page_number - 1].mediabox[3]),
+                float(pdf.pages[i].mediabox[2]),
+                float(pdf.pages[i].mediabox[3]),
             ),
         )
 
-        getattr(canvas.acroForm, self.ACRO_FORM_FUNC)(**self.acro_form_params)
+        for each in page_widgets:
+            getattr(canvas.acroForm, each.ACRO_FORM_FUNC)(**each.acro_form_params)
 
         canvas.showPage()
         canvas.save()
-        watermark.seek(0)
 
-        return [
-            watermark.read() if i == self.page_number - 1 else b""
-            for i in range(page_count)
-        ]
+        result[i] = watermark.getvalue()
 
+    return result
 
-def handle_non_acro_form_params(pdf: bytes, key: str, params: list) -> bytes:
-    """Handles non acro form parameters when creating a widget."""
+
+def handle_non_acro_form_params(pdf: bytes, params: Dict[str, list]) -> bytes:
+    """Handles non acro form parameters of each key when creating widgets."""
 
     pdf_file = PdfReader(stream_to_io(pdf))
     out = PdfWriter()
@@ -103,12 +110,13 @@ def handle_non_acro_form_params(pdf: bytes, key: str, params: list) -> bytes:
             annot = cast(DictionaryObject, annot.get_object())
             _key = get_widget_key(annot.get_object())
 
-            if _key == key:
-                for param in params:
-                    if param[0] in NON_ACRO_FORM_PARAM_TO_FUNC:
-                        NON_ACRO_FORM_PARAM_TO_FUNC[param[0]](annot, param[1])
+            if _key not in params:
+                continue
+
+            for param in params[_key]:
+                if param[0] in NON_ACRO_FORM_PARAM_TO_FUNC:
+                    NON_ACRO_FORM_PARAM_TO_FUNC[param[0]](annot, param[1])
 
     with BytesIO() as f:
         out.write(f)
-        f.seek(0)
-        return f.read()
+        return f.getvalue()
@@ -3,26 +3,41 @@
 
 from __future__ import annotations
 
-from functools import cached_property
-from typing import BinaryIO, Dict, List, Tuple, Union
-
-from .adapter import fp_or_f_obj_or_stream_to_stream
-from .constants import (DEFAULT_FONT, DEFAULT_FONT_COLOR, DEFAULT_FONT_SIZE,
-                        NEW_LINE_SYMBOL, VERSION_IDENTIFIER_PREFIX,
-                        VERSION_IDENTIFIERS)
+from collections import OrderedDict
+from collections.abc import Sequence
+from copy import copy
+from functools import cached_property, partial
+from typing import (BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union,
+                    overload)
+
+from pypdf import PdfReader
+
+from .adapter import (buffer_to_stream, fp_or_f_obj_or_stream_to_buffer,
+                      fp_or_f_obj_or_stream_to_stream, stream_to_fp_or_f_obj)
+from .batch import FillError, fill_in_parallel, fill_in_place, fill_kwargs
+from .constants import (DEFAULT_ENGINE, DEFAULT_FONT, DEFAULT_FONT_COLOR,
+                        DEFAULT_FONT_SIZE, DIRECT_ENGINE, NEW_LINE_SYMBOL,
+                        PAGES_CACHE_SIZE, VERSION_IDENTIFIER_PREFIX,
+                        VERSION_IDENTIFIERS, WIDGET_TYPES)
+from .content import ContentTemplate, can_draw, can_draw_layers, draw_on_pages
 from .coordinate import generate_coordinate_grid
-from .filler import fill, simple_fill
+from .filler import draw_drawings, fill, get_drawings
 from .font import register_font
 from .image import any_image_to_jpg, rotate_image
+from .merge import merge_copies
 from .middleware.dropdown import Dropdown
 from .middleware.text import Text
-from .template import (build_widgets, dropdown_to_text,
-                       set_character_x_paddings, update_text_field_attributes,
-                       update_widget_key, widget_rect_watermarks)
-from .utils import (get_page_streams, merge_two_pdfs, preview_widget_to_draw,
-                    remove_all_widgets)
-from .watermark import create_watermarks_and_draw, merge_watermarks_with_pdf
-from .widgets.base import handle_non_acro_form_params
+from .template import (build_widgets, compile_widgets_by_page,
+                       dropdown_to_text, get_text_field_appearances,
+                       get_widget_key, set_character_x_paddings,
+                       set_text_field_appearance, update_text_field_attributes,
+                       update_widget_keys, widget_rect_watermarks)
+from .utils import (get_page_stream, merge_pdfs, merge_two_pdfs,
+                    preview_widget_to_draw, remove_all_widgets, stream_to_io)
+from .watermark import (create_watermarks_and_draw, merge_watermark_layers,
+                        merge_watermarks_with_pdf)
+from .widgets.base import (create_widgets_watermarks,
+                           handle_non_acro_form_params)
 from .widgets.checkbox import CheckBoxWidget
 from .widgets.dropdown import DropdownWidget
 from .widgets.text import TextWidget
@@ -33,17 +48,40 @@ class FormWrapper:
 
     def __init__(
         self,
-        template: Union[bytes, str, BinaryIO] = b"",
+        template: Union[bytes, bytearray, memoryview, str, BinaryIO] = b"",
     ) -> None:
         """Constructs all attributes for the object."""
 
         super().__init__()
-        self.stream = fp_or_f_obj_or_stream_to_stream(template)
+        self.stream = fp_or_f_obj_or_stream_to_buffer(template)
+
+    def __getstate__(self) -> dict:
+        """
+        Reads a memory mapped file stream, which cannot be pickled, and
+        leaves out the pages split from it.
+        """
+
+        state = {
+            key: buffer_to_stream(value) for key, value in self.__dict__.items()
+        }
+        state.pop("pages", None)
+
+        return state
 
     def read(self) -> bytes:
         """Reads the file stream of a PDF form."""
 
-        return self.stream
+        return buffer_to_stream(self.stream)
+
+    def write(self, fp_or_f_obj: Union[str, BinaryIO]) -> FormWrapper:
+        """
+        Writes the file stream of a PDF form to a file path or a file object
+        without the copy read would make of a memory mapped PDF.
+        """
+
+        stream_to_fp_or_f_obj(self.stream, fp_or_f_obj)
+
+        return self
 
     def fill(
         self,
@@ -52,45 +90,129 @@ class FormWrapper:
     ) -> FormWrapper:
         """Fills a PDF form."""
 
+        self.stream = next(self.fill_many([data], **kwargs))
+
+        return self
+
+    def fill_many(
+        self,
+        records: Iterable[Dict[str, Union[str, bool, int]]],
+        **kwargs,
+    ) -> Iterator[bytes]:
+        """Fills a PDF form with each record and yields the filled PDFs."""
+
         widgets = build_widgets(self.stream) if self.stream else {}
 
-        for key, value in data.items():
-            if key in widgets:
-                widgets[key].value = value
+        for record in records:
+            yield fill_in_place(self, widgets, kwargs, record)
 
-        self.stream = simple_fill(
-            self.read(),
-            widgets,
-            flatten=kwargs.get("flatten", False),
-            adobe_mode=kwargs.get("adobe_mode", False),
+    def fill_parallel(
+        self,
+        records: Iterable[Dict[str, Union[str, bool, int]]],
+        **kwargs,
+    ) -> Iterator[Union[bytes, FillError, Tuple[int, Union[bytes, FillError]]]]:
+        """
+        Fills a PDF form with each record in worker processes, which all
+        fill from the widgets built once here.
+        """
+
+        return fill_in_parallel(
+            partial(
+                fill_in_place,
+                self,
+                build_widgets(self.stream) if self.stream else {},
+                fill_kwargs(kwargs),
+            ),
+            records,
+            **kwargs,
         )
 
-        return self
+    def fill_merged(
+        self,
+        records: Iterable[Dict[str, Union[str, bool, int]]],
+        output: Union[str, BinaryIO],
+        **kwargs,
+    ) -> None:
+        """Fills a PDF form with each record and writes all copies as one PDF."""
+
+        merge_copies(self.fill_many(records, **kwargs), output)
 
 
 class PdfWrapper(FormWrapper):
     """A class to represent a PDF form."""
+    # pylint: disable=R0904
 
     def __init__(
         self,
-        template: Union[bytes, str, BinaryIO] = b"",
+        template: Union[bytes, bytearray, memoryview, str, BinaryIO] = b"",
         **kwargs,
     ) -> None:
         """Constructs all attributes for the object."""
 
         super().__init__(template)
-        self.widgets = build_widgets(self.stream) if self.stream else {}
+        self._widgets = None
 
         self.global_font = kwargs.get("global_font")
         self.global_font_size = kwargs.get("global_font_size")
         self.global_font_color = kwargs.get("global_font_color")
+        self.deferred = kwargs.get("deferred", False)
+        self.engine = kwargs.get("engine", DEFAULT_ENGINE)
+
+    @property
+    def stream(self) -> bytes:
+        """The file stream of the PDF form with all deferred operations drawn."""
+
+        if self._operations:
+            self.flush()
+
+        return self._stream
+
+    @stream.setter
+    def stream(self, value: bytes) -> None:
+        """Replaces the file stream of the PDF form."""
+
+        self._stream = value
+        self._operations = []
+
+    @property
+    def widgets(self) -> Dict[str, WIDGET_TYPES]:
+        """
+        Discovers the widgets of the PDF form the first time they are needed,
+        after creating the widgets deferred so far.
+        """
+
+        if any(isinstance(each, list) for each in self._operations):
+            self.flush()
 
-        for each in self.widgets.values():
+        if self._widgets is None:
+            self._widgets = self._build_widgets()
+
+        return self._widgets
+
+    def _build_widgets(
+        self, pdf_file: Union[PdfReader, None] = None
+    ) -> Dict[str, WIDGET_TYPES]:
+        """
+        Discovers the widgets of the PDF form, from its parsed file if given,
+        and applies the global font settings to its text fields.
+        """
+
+        result = build_widgets(self.stream, pdf_file) if self.stream else {}
+
+        for each in result.values():
             if isinstance(each, Text):
                 each.font = self.global_font
                 each.font_size = self.global_font_size
                 each.font_color = self.global_font_color
 
+        return result
+
+    @widgets.setter
+    def widgets(self, value: Dict[str, WIDGET_TYPES]) -> None:
+        """Replaces the widgets of the PDF form."""
+
+        self._widgets = value
+
     @property
     def sample_data(self) -> dict:
         """Returns a valid sample data that can be filled into the PDF form."""
@@ -102,21 +224,21 @@ class PdfWrapper(FormWrapper):
         """Gets the version of the PDF."""
 
         for each in VERSION_IDENTIFIERS:
-            if self.stream.startswith(each):
+            if self.stream[: len(each)] == each:
                 return each.replace(VERSION_IDENTIFIER_PREFIX, b"").decode()
 
         return None
 
     @cached_property
-    def pages(self) -> List[PdfWrapper]:
-        """Returns a list of pdf wrapper objects where each is a page of the PDF form."""
+    def pages(self) -> Pages:
+        """Returns a sequence of pdf wrapper objects where each is a page of the PDF form."""
 
-        return [self.__class__(each) for each in get_page_streams(self.stream)]
+        return Pages(self.__class__, self.stream)
 
     def change_version(self, version: str) -> PdfWrapper:
         """Changes the version of the PDF."""
 
-        self.stream = self.stream.replace(
+        self.stream = bytes(self.stream).replace(
             VERSION_IDENTIFIER_PREFIX + bytes(self.version, "utf-8"),
             VERSION_IDENTIFIER_PREFIX + bytes(version, "utf-8"),
             1,
@@ -138,6 +260,26 @@ class PdfWrapper(FormWrapper):
 
         return new_obj
 
+    def __radd__(self, other: int) -> PdfWrapper:
+        """Supports merging PDFs with sum, which starts by adding to 0."""
+
+        if other != 0:
+            return NotImplemented
+
+        return self
+
+    @classmethod
+    def merge(cls, pdfs: Iterable[PdfWrapper]) -> PdfWrapper:
+        """Merges PDFs into one by parsing each of them and writing only once."""
+
+        streams = [each.stream for each in pdfs if each.stream]
+
+        new_obj = cls()
+        if streams:
+            new_obj.stream = merge_pdfs(streams)
+
+        return new_obj
+
     @property
     def preview(self) -> bytes:
         """Inspects all supported widgets' names for the PDF form."""
@@ -151,7 +293,7 @@ class PdfWrapper(FormWrapper):
                         for key, value in self.widgets.items()
                     },
                 ),
-                widget_rect_watermarks(self.read()),
+                widget_rect_watermarks(self.stream),
             )
         )
 
@@ -162,7 +304,7 @@ class PdfWrapper(FormWrapper):
 
         self.stream = generate_coordinate_grid(
             merge_watermarks_with_pdf(
-                remove_all_widgets(self.read()), widget_rect_watermarks(self.read())
+                remove_all_widgets(self.stream), widget_rect_watermarks(self.stream)
             ),
             color,
             margin,
@@ -175,7 +317,14 @@ class PdfWrapper(FormWrapper):
         data: Dict[str, Union[str, bool, int]],
         **kwargs,
     ) -> PdfWrapper:
-        """Fills a PDF form."""
+        """
+        Fills a PDF form. The PDF is parsed once, for discovering its
+        widgets if not cached as well as for filling them.
+        """
+
+        pdf_file = PdfReader(stream_to_io(self.stream)) if self.stream else None
+        if self._widgets is None:
+            self._widgets = self._build_widgets(pdf_file)
 
         for key, value in data.items():
             if key in self.widgets:
@@ -185,14 +334,48 @@ class PdfWrapper(FormWrapper):
             if isinstance(value, Dropdown):
                 self.widgets[key] = dropdown_to_text(value)
 
-        update_text_field_attributes(self.stream, self.widgets)
-        if self.read():
-            self.widgets = set_character_x_paddings(self.stream, self.widgets)
+        widgets_by_page = compile_widgets_by_page(self.stream, pdf_file)
+        update_text_field_attributes(widgets_by_page, self.widgets)
+        if self.stream:
+            self.widgets = set_character_x_paddings(widgets_by_page, self.widgets)
 
-        self.stream = remove_all_widgets(fill(self.stream, self.widgets))
+        self.stream = fill(
+            self.stream,
+            self.widgets,
+            widgets_by_page,
+            remove_widgets=True,
+            engine=self.engine,
+            pdf_file=pdf_file,
+        )
 
         return self
 
+    def fill_many(
+        self,
+        records: Iterable[Dict[str, Union[str, bool, int]]],
+        **kwargs,
+    ) -> Iterator[bytes]:
+        """Fills a PDF form with each record and yields the filled PDFs."""
+
+        compiled = self.compile()
+
+        for record in records:
+            yield compiled.render(record)
+
+    def fill_parallel(
+        self,
+        records: Iterable[Dict[str, Union[str, bool, int]]],
+        **kwargs,
+    ) -> Iterator[Union[bytes, FillError, Tuple[int, Union[bytes, FillError]]]]:
+        """Fills a PDF form with each record in worker processes."""
+
+        return fill_in_parallel(self.compile().render, records, **kwargs)
+
+    def compile(self) -> CompiledTemplate:
+        """Does the data independent work of filling the PDF form once."""
+
+        return CompiledTemplate(self.stream, self.widgets, engine=self.engine)
+
     def create_widget(
         self,
         widget_type: str,
@@ -204,49 +387,76 @@ class PdfWrapper(FormWrapper):
     ) -> PdfWrapper:
         """Creates a new widget on a PDF form."""
 
-        _class = None
-        if widget_type == "text":
-            _class = TextWidget
-        if widget_type == "checkbox":
-            _class = CheckBoxWidget
-        if widget_type == "dropdown":
-            _class = DropdownWidget
-        if _class is None:
-            return self
-
-        obj = _class(name=name, page_number=page_number, x=x, y=y, **kwargs)
-        watermarks = obj.watermarks(self.read())
+        return self.create_widgets(
+            [
+                {
+                    "widget_type": widget_type,
+                    "name": name,
+                    "page_number": page_number,
+                    "x": x,
+                    "y": y,
+                    **kwargs,
+                }
+            ]
+        )
 
-        self.stream = merge_watermarks_with_pdf(self.read(), watermarks)
-        if obj.non_acro_form_params:
-            self.stream = handle_non_acro_form_params(
-                self.stream, name, obj.non_acro_form_params
-            )
+    def create_widgets(self, specs: Iterable[dict]) -> PdfWrapper:
+        """
+        Creates new widgets on a PDF form given the parameters of create_widget
+        for each. The widgets on the same page are drawn on one canvas.
+        """
+
+        widgets = []
+        for spec in specs:
+            params = dict(spec)
+            widget_type = params.pop("widget_type")
+
+            _class = None
+            if widget_type == "text":
+                _class = TextWidget
+            if widget_type == "checkbox":
+                _class = CheckBoxWidget
+            if widget_type == "dropdown":
+                _class = DropdownWidget
+            if _class is not None:
+                widgets.append(_class(**params))
+
+        if not widgets:
+            return self
 
-        new_widgets = build_widgets(self.read())
-        for k, v in self.widgets.items():
-            if k in new_widgets:
-                new_widgets[k] = v
-        self.widgets = new_widgets
-        if widget_type in ("text", "dropdown"):
-            self.widgets[name].font = self.global_font
-            self.widgets[name].font_size = self.global_font_size
-            self.widgets[name].font_color = self.global_font_color
+        self._operations.append(widgets)
 
-        return self
+        return self if self.deferred else self.flush()
 
     def update_widget_key(
         self, old_key: str, new_key: str, index: int = 0
     ) -> PdfWrapper:
         """Updates the key of an existed widget on a PDF form."""
 
+        return self.update_widget_keys({(old_key, index): new_key})
+
+    def update_widget_keys(
+        self, new_keys: Dict[Union[str, Tuple[str, int]], str]
+    ) -> PdfWrapper:
+        """
+        Updates the keys of existed widgets on a PDF form in one pass given
+        the new key of each old key, or of each old key and index.
+        """
+
         self.__init__(
-            template=update_widget_key(
-                self.read(), self.widgets, old_key, new_key, index
+            template=update_widget_keys(
+                self.stream,
+                self.widgets,
+                {
+                    key if isinstance(key, tuple) else (key, 0): value
+                    for key, value in new_keys.items()
+                },
             ),
             global_font=self.global_font,
             global_font_size=self.global_font_size,
             global_font_color=self.global_font_color,
+            deferred=self.deferred,
+            engine=self.engine,
         )
 
         return self
@@ -270,22 +480,9 @@ class PdfWrapper(FormWrapper):
         if NEW_LINE_SYMBOL in text:
             new_widget.text_lines = text.split(NEW_LINE_SYMBOL)
 
-        watermarks = create_watermarks_and_draw(
-            self.stream,
-            page_number,
-            "text",
-            [
-                [
-                    new_widget,
-                    x,
-                    y,
-                ]
-            ],
-        )
-
-        self.stream = merge_watermarks_with_pdf(self.stream, watermarks)
+        self._operations.append((page_number, "text", [[new_widget, x, y]]))
 
-        return self
+        return self if self.deferred else self.flush()
 
     def draw_image(
         self,
@@ -302,11 +499,89 @@ class PdfWrapper(FormWrapper):
         image = fp_or_f_obj_or_stream_to_stream(image)
         image = any_image_to_jpg(image)
         image = rotate_image(image, rotation)
-        watermarks = create_watermarks_and_draw(
-            self.stream, page_number, "image", [[image, x, y, width, height]]
-        )
+        self._operations.append((page_number, "image", [[image, x, y, width, height]]))
 
-        self.stream = merge_watermarks_with_pdf(self.stream, watermarks)
+        return self if self.deferred else self.flush()
+
+    def flush(self) -> PdfWrapper:
+        """
+        Draws the deferred texts, images and widgets in the order they were
+        added. The PDF is parsed and written once, plus once more after each
+        batch of created widgets that needs their annotations updated.
+        """
+
+        operations, self._operations = self._operations, []
+        if not operations:
+            return self
+
+        created = [
+            widget
+            for each in operations
+            if isinstance(each, list)
+            for widget in each
+        ]
+        widgets = self.widgets if created else {}
+
+        stream = self._stream
+        pdf_file = PdfReader(stream_to_io(stream))
+
+        if (
+            self.engine == DIRECT_ENGINE
+            and not created
+            and all(
+                can_draw(action_type, actions) for _, action_type, actions in operations
+            )
+        ):
+            self._stream = draw_on_pages(
+                pdf_file,
+                [
+                    (action_type, {page_number: actions})
+                    for page_number, action_type, actions in operations
+                ],
+            )
+            return self
+
+        watermark_layers = []
+        for each in operations:
+            if not isinstance(each, list):
+                watermark_layers.append(create_watermarks_and_draw(pdf_file, *each))
+                continue
+
+            watermark_layers.append(create_widgets_watermarks(pdf_file, each))
+            non_acro_form_params = {
+                widget.acro_form_params["name"]: widget.non_acro_form_params
+                for widget in each
+                if widget.non_acro_form_params
+            }
+            if non_acro_form_params:
+                stream = handle_non_acro_form_params(
+                    merge_watermark_layers(
+                        pdf_file, watermark_layers, engine=self.engine
+                    ),
+                    non_acro_form_params,
+                )
+                pdf_file = PdfReader(stream_to_io(stream))
+                watermark_layers = []
+
+        if watermark_layers:
+            stream = merge_watermark_layers(
+                pdf_file, watermark_layers, engine=self.engine
+            )
+        self._stream = stream
+
+        if created:
+            new_widgets = build_widgets(stream)
+            for k, v in widgets.items():
+                if k in new_widgets:
+                    new_widgets[k] = v
+            self.widgets = new_widgets
+
+            for each in created:
+                if isinstance(each, (TextWidget, DropdownWidget)):
+                    name = each.acro_form_params["name"]
+                    self.widgets[name].font = self.global_font
+                    self.widgets[name].font_size = self.global_font_size
+                    self.widgets[name].font_color = self.global_font_color
 
         return self
 
@@ -330,3 +605,157 @@ class PdfWrapper(FormWrapper):
         ttf_file = fp_or_f_obj_or_stream_to_stream(ttf_file)
 
         return register_font(font_name, ttf_file) if ttf_file is not None else False
+
+
+class Pages(Sequence):
+    """
+    Pages of a PDF split into pdf wrapper objects only when accessed.
+
+    The PDF is parsed once, and the most recently accessed pages are kept
+    so that accessing them again returns the same objects.
+    """
+
+    def __init__(self, wrapper_class: type, pdf: bytes) -> None:
+        """Constructs the sequence without splitting any page."""
+
+        super().__init__()
+        self.wrapper_class = wrapper_class
+        self.stream = pdf
+        self._pages = OrderedDict()
+
+    @cached_property
+    def reader(self) -> PdfReader:
+        """Parses the PDF the first time a page is needed."""
+
+        return PdfReader(stream_to_io(self.stream))
+
+    def __len__(self) -> int:
+        """Returns the number of pages without splitting any."""
+
+        return len(self.reader.pages)
+
+    @overload
+    def __getitem__(self, index: int) -> PdfWrapper: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PdfWrapper]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[PdfWrapper, List[PdfWrapper]]:
+        """Splits and returns a page, or a list of pages for a slice."""
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError
+
+        if index in self._pages:
+            self._pages.move_to_end(index)
+        else:
+            self._pages[index] = self.wrapper_class(
+                get_page_stream(self.reader, index)
+            )
+            if len(self._pages) > PAGES_CACHE_SIZE:
+                self._pages.popitem(last=False)
+
+        return self._pages[index]
+
+
+class CompiledTemplate:
+    """A PDF form parsed once so that it can be filled with many records."""
+
+    def __init__(
+        self,
+        template: bytes,
+        widgets: Dict[str, WIDGET_TYPES],
+        engine: str = DEFAULT_ENGINE,
+    ) -> None:
+        """Constructs the filling plan of the PDF form."""
+
+        super().__init__()
+        self.stream = template
+        self.engine = engine
+        self.widgets = {key: copy(value) for key, value in widgets.items()}
+        self.widgets_by_page = compile_widgets_by_page(template) if template else {}
+        self.text_field_appearances = (
+            get_text_field_appearances(template, self.widgets) if template else {}
+        )
+
+        for key, value in self.widgets.items():
+            if isinstance(value, Text):
+                set_text_field_appearance(value, self.text_field_appearances[key])
+
+    def __getstate__(self) -> dict:
+        """
+        Leaves out the prepared PDF, which is prepared again when needed,
+        and reads a memory mapped file stream, which cannot be pickled.
+        """
+
+        state = self.__dict__.copy()
+        state.pop("content_template", None)
+        state["stream"] = buffer_to_stream(self.stream)
+
+        return state
+
+    @cached_property
+    def content_template(self) -> Union[ContentTemplate, None]:
+        """
+        The PDF form prepared once for the direct engine, on which
+        only the texts of each record are worked out and drawn.
+        """
+
+        if self.engine != DIRECT_ENGINE or not self.stream:
+            return None
+
+        fonts_by_page = {}
+        for page, widgets in self.widgets_by_page.items():
+            fonts_by_page[page] = [DEFAULT_FONT]
+            for widget in widgets:
+                key = get_widget_key(widget)
+                if isinstance(self.widgets[key], Text):
+                    fonts_by_page[page].append(self.widgets[key].font)
+                elif key in self.text_field_appearances:
+                    fonts_by_page[page].append(self.text_field_appearances[key][0])
+
+        return ContentTemplate(
+            PdfReader(stream_to_io(self.stream)), fonts_by_page, remove_widgets=True
+        )
+
+    def render(self, data: Dict[str, Union[str, bool, int]]) -> bytes:
+        """Fills the PDF form with a record and returns the filled PDF."""
+
+        widgets = {key: copy(value) for key, value in self.widgets.items()}
+
+        for key, value in data.items():
+            if key in widgets:
+                widgets[key].value = value
+
+        for key, value in widgets.items():
+            if isinstance(value, Dropdown):
+                widgets[key] = dropdown_to_text(value)
+                set_text_field_appearance(
+                    widgets[key], self.text_field_appearances[key]
+                )
+
+        update_text_field_attributes(self.widgets_by_page, widgets)
+        set_character_x_paddings(self.widgets_by_page, widgets)
+
+        texts_to_draw, images_to_draw = get_drawings(widgets, self.widgets_by_page)
+        if (
+            self.content_template is not None
+            and not any(images_to_draw.values())
+            and can_draw_layers([("text", texts_to_draw)])
+        ):
+            return self.content_template.render([("text", texts_to_draw)])
+
+        return draw_drawings(
+            self.stream,
+            texts_to_draw,
+            images_to_draw,
+            remove_widgets=True,
+            engine=self.engine,
+        )
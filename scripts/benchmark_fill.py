@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Measures the time filling the same PDF form with many records takes."""
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=C0413
+from PyPDFForm import PdfWrapper  # noqa: E402
+
+TEMPLATE = os.path.join(
+    os.path.dirname(__file__), "..", "pdf_samples", "sample_template.pdf"
+)
+
+
+def records(count: int) -> list:
+    """Creates records which fill every widget of the sample template."""
+
+    return [
+        {
+            "test": f"test_1_{i}",
+            "check": bool(i % 2),
+            "test_2": f"test_2_{i}",
+            "check_2": not i % 2,
+            "test_3": f"test_3_{i}",
+            "check_3": True,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(name: str, data: list, func) -> None:
+    """Prints the time a function filling each record takes per record."""
+
+    start = perf_counter()
+    for each in data:
+        func(each)
+    elapsed = perf_counter() - start
+
+    print(f"{name}: {elapsed / len(data) * 1000:.2f}ms per record")
+
+
+if __name__ == "__main__":
+    data = records(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    print(f"records: {len(data)}")
+
+    measure(
+        "PdfWrapper.fill", data, lambda record: PdfWrapper(TEMPLATE).fill(record).read()
+    )
+    measure("CompiledTemplate.render", data, PdfWrapper(TEMPLATE).compile().render)
+    measure(
+        "CompiledTemplate.render (direct engine)",
+        data,
+        PdfWrapper(TEMPLATE, engine="direct").compile().render,
+    )
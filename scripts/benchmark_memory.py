@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Measures the peak memory of filling a large PDF form."""
+
+import os
+import sys
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, BinaryIO, Callable, Iterator, Tuple
+from unittest.mock import patch
+
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen.canvas import Canvas
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=C0413
+from PyPDFForm import FormWrapper, PdfWrapper, template_cache  # noqa: E402
+from PyPDFForm.adapter import fp_or_f_obj_or_stream_to_stream  # noqa: E402
+
+DATA = {
+    "test": "test_1",
+    "check": True,
+    "test_2": "test_2",
+    "check_2": False,
+    "test_3": "test_3",
+    "check_3": True,
+}
+
+
+def large_template(size: int) -> bytes:
+    """
+    Puts a noise image of roughly a size in MB behind the first page
+    of the sample template, like a scanned PDF form.
+    """
+
+    side = int((size * 1024 * 1024 / 3) ** 0.5)
+    image = BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(
+        image, format="PNG"
+    )
+
+    background = BytesIO()
+    canvas = Canvas(background)
+    canvas.drawImage(ImageReader(image), 0, 0, width=612, height=792)
+    canvas.save()
+
+    writer = PdfWriter(
+        clone_from=os.path.join(
+            os.path.dirname(__file__), "..", "pdf_samples", "sample_template.pdf"
+        )
+    )
+    writer.pages[0].merge_page(PdfReader(background).pages[0], over=False)
+
+    with BytesIO() as f:
+        writer.write(f)
+        return f.getvalue()
+
+
+def copying_stream_to_io(data: Any) -> BinaryIO:
+    """The previous stream_to_io, which copied the stream into a new buffer."""
+
+    result = BytesIO()
+    result.write(data)
+    result.seek(0)
+
+    return result
+
+
+@contextmanager
+def copying_io() -> Iterator[None]:
+    """
+    Patches in the previous I/O helpers, which copied every template
+    into bytes and every stream into a new buffer.
+    """
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "PyPDFForm.wrapper.fp_or_f_obj_or_stream_to_buffer",
+                lambda t: bytes(fp_or_f_obj_or_stream_to_stream(t)),
+            )
+        )
+        for module in list(sys.modules.values()):
+            if module.__name__.startswith("PyPDFForm") and hasattr(
+                module, "stream_to_io"
+            ):
+                stack.enter_context(
+                    patch.object(module, "stream_to_io", copying_stream_to_io)
+                )
+        yield
+
+
+def measure(template: Any, func: Callable[[Any], Any]) -> Tuple[int, float]:
+    """Returns the peak memory and the time a function takes."""
+
+    template_cache.clear()
+
+    tracemalloc.start()
+    start = perf_counter()
+    func(template)
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak, elapsed
+
+
+def compare(name: str, template: Any, size: int, func: Callable[[Any], Any]) -> None:
+    """
+    Prints the peak memory and the time a function takes with the
+    previous copying I/O helpers and with the current ones.
+    """
+
+    with copying_io():
+        before = measure(template, func)
+    after = measure(template, func)
+
+    print(
+        f"{name}: peak {before[0] / 1024 / 1024:.1f} MB "
+        f"({before[0] / size:.2f}x the template), {before[1]:.2f}s before, "
+        f"peak {after[0] / 1024 / 1024:.1f} MB "
+        f"({after[0] / size:.2f}x the template), {after[1]:.2f}s after"
+    )
+
+
+if __name__ == "__main__":
+    stream = large_template(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
+    print(f"template: {len(stream) / 1024 / 1024:.1f} MB")
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "template.pdf")
+        with open(path, "wb+") as template_file:
+            template_file.write(stream)
+
+        for kind, each in (
+            ("bytes", stream),
+            ("bytearray", bytearray(stream)),
+            ("path", path),
+        ):
+            compare(
+                f"PdfWrapper.fill from {kind}",
+                each,
+                len(stream),
+                lambda t: PdfWrapper(t).fill(DATA).read(),
+            )
+            compare(
+                f"FormWrapper.fill from {kind}",
+                each,
+                len(stream),
+                lambda t: FormWrapper(t).fill(DATA).read(),
+            )
+            compare(
+                f"PdfWrapper.compile().render from {kind}",
+                each,
+                len(stream),
+                lambda t: PdfWrapper(t).compile().render(DATA),
+            )
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Measures the time wrapping long texts of a paragraph field takes."""
+
+import os
+import sys
+from time import perf_counter
+
+from pypdf.generic import ArrayObject, FloatObject
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=C0413
+from PyPDFForm.constants import DEFAULT_FONT, Rect  # noqa: E402
+from PyPDFForm.middleware.text import Text  # noqa: E402
+from PyPDFForm.template import get_paragraph_lines  # noqa: E402
+
+WORDS = [
+    "lorem",
+    "ipsum",
+    "dolor",
+    "sit",
+    "amet",
+    "consectetur",
+    "adipiscing",
+    "elit",
+]
+
+
+def paragraph(length: int) -> Text:
+    """Creates a paragraph field middleware with a text of a length."""
+
+    text = []
+    while sum(len(each) + 1 for each in text) < length:
+        text.append(WORDS[len(text) % len(WORDS)])
+
+    result = Text("comments", " ".join(text)[:length])
+    result.font = DEFAULT_FONT
+    result.font_size = 12
+
+    return result
+
+
+def measure(length: int, repeat: int) -> None:
+    """Prints the time wrapping a text of a length into a 300pt wide field takes."""
+
+    widget = {Rect: ArrayObject([FloatObject(each) for each in (0, 0, 300, 800)])}
+    middleware = paragraph(length)
+
+    lines = get_paragraph_lines(widget, middleware)
+    start = perf_counter()
+    for _ in range(repeat):
+        get_paragraph_lines(widget, middleware)
+    elapsed = perf_counter() - start
+
+    print(
+        f"{length} characters: {elapsed / repeat * 1000:.2f}ms "
+        f"for {len(lines)} lines"
+    )
+
+
+if __name__ == "__main__":
+    for each in (250, 1000, 4000, 16000):
+        measure(each, int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -2,6 +2,9 @@
 # pylint: disable=line-too-long
 
 import os
+from io import BytesIO
+
+from pypdf import PdfReader
 
 from PyPDFForm import PdfWrapper
 
@@ -247,3 +250,49 @@ def test_update_key(issue_pdf_directory, request):
         expected = f.read()
         assert len(obj.preview) == len(expected)
         assert obj.preview == expected
+
+
+def test_update_keys(issue_pdf_directory):
+    obj = PdfWrapper(os.path.join(issue_pdf_directory, "733.pdf")).update_widget_keys(
+        {
+            (f"{key}[0]", i): f"{key}[{i}]"
+            for key in (
+                "Description",
+                "symbol",
+                "tradedate",
+                "settlementdate",
+                "quantity",
+                "costperunit",
+                "costabasis",
+            )
+            for i in range(1, 10)
+        }
+    )
+
+    expected_path = os.path.join(issue_pdf_directory, "733_expected.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+        assert len(obj.preview) == len(expected)
+        assert obj.preview == expected
+
+
+def test_update_keys_swapped(issue_pdf_directory):
+    obj = PdfWrapper(os.path.join(issue_pdf_directory, "733.pdf")).update_widget_keys(
+        {
+            ("Description[0]", 1): "symbol[0]",
+            ("symbol[0]", 1): "Description[0]",
+            ("Description[0]", 2): "Description[0]",
+        }
+    )
+
+    keys = {}
+    for page in PdfReader(BytesIO(obj.read())).pages:
+        for annot in page.get("/Annots", []):
+            annot = annot.get_object()
+            keys[float(annot["/Rect"][0]), float(annot["/Rect"][1])] = annot["/T"]
+
+    assert keys[62, 393.408] == "Description[0]"
+    assert keys[192, 393.408] == "symbol[0]"
+    assert keys[62, 373.407] == "symbol[0]"
+    assert keys[192, 373.407] == "Description[0]"
+    assert keys[62, 353.406] == "Description[0]"
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+import pytest
+import reportlab
+from pypdf import __version__ as pypdf_version
+
+from PyPDFForm import (PdfWrapper, __version__, constants, template,
+                       template_cache)
+from PyPDFForm.cache import TemplateCache, digest
+
+
+@pytest.fixture
+def cache():
+    return TemplateCache(max_bytes=10)
+
+
+def test_digest(template_stream, sejda_template):
+    assert digest(template_stream) == digest(bytes(template_stream))
+    assert digest(template_stream) != digest(sejda_template)
+
+
+def test_get_and_set(cache):
+    assert cache.get("foo") is None
+    cache.set("foo", 1, 4)
+    assert cache.get("foo") == 1
+
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 1,
+        "current_bytes": 4,
+        "max_bytes": 10,
+        "disk_hits": 0,
+        "disk_misses": 0,
+    }
+
+
+def test_set_existed_key(cache):
+    cache.set("foo", 1, 4)
+    cache.set("foo", 2, 6)
+
+    assert len(cache) == 1
+    assert cache.get("foo") == 2
+    assert cache.current_bytes == 6
+
+
+def test_evicts_least_recently_used(cache):
+    cache.set("foo", 1, 4)
+    cache.set("bar", 2, 4)
+    assert cache.get("foo") == 1
+
+    cache.set("baz", 3, 4)
+
+    assert cache.get("bar") is None
+    assert cache.get("foo") == 1
+    assert cache.get("baz") == 3
+    assert cache.evictions == 1
+    assert cache.current_bytes == 8
+
+
+def test_does_not_cache_over_budget(cache):
+    cache.set("foo", 1, 4)
+    cache.set("bar", 2, 11)
+
+    assert cache.get("bar") is None
+    assert cache.get("foo") == 1
+    assert cache.current_bytes == 4
+
+
+def test_configure(cache):
+    cache.set("foo", 1, 4)
+    cache.set("bar", 2, 4)
+
+    cache.configure(max_bytes=5)
+
+    assert cache.max_bytes == 5
+    assert cache.get("foo") is None
+    assert cache.get("bar") == 2
+    assert cache.evictions == 1
+
+
+def test_clear(cache):
+    cache.set("foo", 1, 4)
+    cache.get("foo")
+
+    cache.clear()
+
+    assert not len(cache)
+    assert cache.stats == {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "entries": 0,
+        "current_bytes": 0,
+        "max_bytes": 10,
+        "disk_hits": 0,
+        "disk_misses": 0,
+    }
+
+
+def test_digest_by_identity(cache, template_stream, monkeypatch):
+    digested = []
+
+    def _digest(pdf):
+        digested.append(pdf)
+        return digest(pdf)
+
+    monkeypatch.setattr("PyPDFForm.cache.digest", _digest)
+
+    key = ("foo", cache.digest(template_stream))
+    assert key[1] == digest(template_stream)
+    assert cache.digest(template_stream) == key[1]
+    assert len(digested) == 2
+
+    cache.set(key, 1, 4, template_stream)
+    cache.set(("bar", key[1]), 2, 4, template_stream)
+    assert cache.digest(template_stream) == key[1]
+    assert len(digested) == 2
+
+    cache.set(key, 1, 4, template_stream)
+    cache.set("baz", 3, 4)
+    assert cache.get(("bar", key[1])) is None
+    assert cache.digest(template_stream) == key[1]
+    assert len(digested) == 2
+
+    cache.set("qux", 4, 4)
+    assert cache.get(key) is None
+    assert cache.digest(template_stream) == key[1]
+    assert len(digested) == 3
+
+    cache.set(key, 1, 4, template_stream)
+    cache.clear()
+    cache.digest(template_stream)
+    assert len(digested) == 4
+
+
+def test_digest_of_buffer_not_kept(cache, template_stream, monkeypatch):
+    digested = []
+
+    def _digest(pdf):
+        digested.append(len(pdf))
+        return digest(pdf)
+
+    monkeypatch.setattr("PyPDFForm.cache.digest", _digest)
+
+    buffer = bytearray(template_stream)
+    key = ("foo", cache.digest(memoryview(buffer)))
+    cache.set(key, 1, 4, memoryview(buffer))
+    assert cache.digest(memoryview(buffer)) == key[1]
+    assert len(digested) == 2
+
+    buffer.extend(b"foo")
+    assert cache.get(key) == 1
+
+
+def test_get_widgets_by_page_cached(template_stream):
+    template_cache.clear()
+
+    result = template.get_widgets_by_page(template_stream)
+    assert template_cache.stats["misses"] == 1
+    assert template_cache.stats["entries"] == 1
+    assert template_cache.current_bytes == len(template_stream)
+
+    assert template.get_widgets_by_page(bytes(template_stream)) is result
+    assert template_cache.stats["hits"] == 1
+
+
+def test_get_widgets_by_page_over_budget(template_stream):
+    template_cache.clear()
+    template_cache.configure(max_bytes=len(template_stream) - 1)
+
+    try:
+        assert template.get_widgets_by_page(
+            template_stream
+        ) is not template.get_widgets_by_page(template_stream)
+        assert template_cache.stats["misses"] == 2
+        assert not len(template_cache)
+    finally:
+        template_cache.configure(max_bytes=constants.TEMPLATE_CACHE_MAX_BYTES)
+
+
+def test_fill_looks_up_cached_layout(template_stream, data_dict):
+    template_cache.clear()
+    PdfWrapper(template_stream).fill(data_dict)
+    misses = template_cache.stats["misses"]
+
+    obj = PdfWrapper(template_stream)
+    assert obj.widgets
+    hits = template_cache.stats["hits"]
+    obj.fill(data_dict)
+
+    assert template_cache.stats["hits"] == hits + 1
+    assert template_cache.stats["misses"] == misses
+
+
+def test_fill_digests_template_once(template_stream, data_dict, monkeypatch):
+    template_cache.clear()
+    digested = []
+
+    def _digest(pdf):
+        digested.append(pdf)
+        return digest(pdf)
+
+    monkeypatch.setattr("PyPDFForm.cache.digest", _digest)
+
+    obj = PdfWrapper(template_stream)
+    obj.compile()
+    obj.fill(data_dict)
+
+    assert len([each for each in digested if each is template_stream]) == 1
+
+
+@pytest.fixture
+def cache_directory(tmp_path):
+    directory = os.path.join(tmp_path, "cache")
+    template_cache.clear()
+    template_cache.configure(directory=directory)
+
+    yield directory
+
+    template_cache.configure(directory=None)
+    template_cache.clear()
+
+
+def test_configure_directory(cache_directory):
+    assert template_cache.directory == cache_directory
+    assert os.path.isdir(cache_directory)
+
+    assert template_cache.path(("foo", "bar")) == os.path.join(
+        cache_directory,
+        f"foo-bar-{__version__}-{pypdf_version}-{reportlab.Version}.pickle",
+    )
+
+
+def test_load_and_dump(cache_directory):
+    key = ("foo", "bar")
+
+    assert template_cache.load(key) is None
+    template_cache.dump(key, {"foo": [1, 2]})
+    assert template_cache.load(key) == {"foo": [1, 2]}
+
+    assert template_cache.stats["disk_hits"] == 1
+    assert template_cache.stats["disk_misses"] == 1
+    assert os.listdir(cache_directory) == [os.path.basename(template_cache.path(key))]
+
+
+def test_load_and_dump_without_directory():
+    template_cache.dump(("foo", "bar"), 1)
+
+    assert template_cache.load(("foo", "bar")) is None
+    assert template_cache.stats["disk_misses"] == 0
+
+
+def test_load_corrupted(cache_directory):
+    key = ("foo", "bar")
+    with open(template_cache.path(key), "wb+") as f:
+        f.write(b"foo")
+
+    assert template_cache.load(key) is None
+    assert template_cache.stats["disk_misses"] == 1
+
+
+@pytest.mark.parametrize(
+    "stale", [b"cPyPDFForm.removed_module\nfoo\n.", b"cPyPDFForm\nremoved_attr\n."]
+)
+def test_load_stale(cache_directory, stale):
+    key = ("foo", "bar")
+    with open(template_cache.path(key), "wb+") as f:
+        f.write(stale)
+
+    assert template_cache.load(key) is None
+    assert template_cache.stats["disk_misses"] == 1
+
+
+def test_dump_unpicklable(cache_directory):
+    key = ("foo", "bar")
+
+    template_cache.dump(key, lambda: None)
+
+    assert template_cache.load(key) is None
+    assert not os.listdir(cache_directory)
+
+
+def test_dump_to_removed_directory(cache_directory):
+    shutil.rmtree(cache_directory)
+
+    template_cache.dump(("foo", "bar"), 1)
+
+    assert template_cache.load(("foo", "bar")) is None
+
+
+def test_build_widgets_without_directory(template_stream, monkeypatch):
+    template_cache.clear()
+    digested = []
+
+    def _digest(pdf):
+        digested.append(pdf)
+        return digest(pdf)
+
+    monkeypatch.setattr(template_cache, "digest", _digest)
+
+    assert template.build_widgets(template_stream)
+    assert len(digested) == 1
+
+
+def test_fill_persists_to_directory(template_stream, data_dict, cache_directory):
+    PdfWrapper(template_stream).fill(data_dict)
+
+    assert sorted(os.listdir(cache_directory)) == [
+        os.path.basename(
+            template_cache.path(("build_widgets", digest(template_stream)))
+        ),
+        os.path.basename(
+            template_cache.path(("compile_widgets_by_page", digest(template_stream)))
+        ),
+    ]
+
+
+def test_fill_loads_from_directory(
+    template_stream, pdf_samples, data_dict, cache_directory, monkeypatch
+):
+    PdfWrapper(template_stream).fill(data_dict)
+    template_cache.clear()
+
+    def _get_widgets_by_page(pdf):
+        raise AssertionError
+
+    monkeypatch.setattr(template, "get_widgets_by_page", _get_widgets_by_page)
+
+    obj = PdfWrapper(template_stream)
+    assert obj.compile().render(data_dict) == obj.fill(data_dict).read()
+    assert template_cache.stats["disk_hits"] == 2
+    assert template_cache.stats["disk_misses"] == 0
+
+    with open(os.path.join(pdf_samples, "sample_filled.pdf"), "rb+") as f:
+        assert obj.read() == f.read()
+
+
+def test_new_version_invalidates_directory(
+    template_stream, cache_directory, monkeypatch
+):
+    assert PdfWrapper(template_stream).widgets
+    template_cache.clear()
+
+    monkeypatch.setattr("PyPDFForm.__version__", "0.0.0")
+    assert PdfWrapper(template_stream).widgets
+
+    assert template_cache.stats["disk_hits"] == 0
+    assert template_cache.stats["disk_misses"] == 1
+    assert len(os.listdir(cache_directory)) == 2
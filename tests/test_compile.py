@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyPDFForm import CompiledTemplate, PdfWrapper
+
+
+def test_compile(template_stream):
+    obj = PdfWrapper(template_stream)
+    compiled = obj.compile()
+
+    assert isinstance(compiled, CompiledTemplate)
+    assert compiled.stream == obj.read()
+    assert compiled.widgets.keys() == obj.widgets.keys()
+    for key, value in compiled.widgets.items():
+        assert value is not obj.widgets[key]
+
+
+def test_compile_render(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        compiled = PdfWrapper(template_stream).compile()
+
+        expected = f.read()
+
+        for _ in range(3):
+            result = compiled.render(data_dict)
+            assert len(result) == len(expected)
+            assert result == expected
+
+
+def test_compile_render_does_not_mutate(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        obj = PdfWrapper(template_stream)
+        compiled = obj.compile()
+
+        assert compiled.render({"test": "foo", "check_3": False}) != f.read()
+        assert compiled.render({}) == PdfWrapper(template_stream).fill({}).read()
+        assert compiled.stream == template_stream
+        assert obj.widgets["test"].value is None
+        assert compiled.widgets["test"].value is None
+
+
+def test_compile_render_global_font_size(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled_font_20.pdf")
+    with open(expected_path, "rb+") as f:
+        result = (
+            PdfWrapper(template_stream, global_font_size=20).compile().render(data_dict)
+        )
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_customized_widgets(
+    template_stream, pdf_samples, font_samples, data_dict
+):
+    PdfWrapper.register_font(
+        "LiberationSerif-Italic",
+        os.path.join(font_samples, "LiberationSerif-Italic.ttf"),
+    )
+
+    expected_path = os.path.join(pdf_samples, "sample_filled_customized_widgets.pdf")
+    with open(expected_path, "rb+") as f:
+        obj = PdfWrapper(template_stream)
+
+        obj.widgets["test"].font = "LiberationSerif-Italic"
+        obj.widgets["test"].font_size = 20
+        obj.widgets["test"].font_color = (1, 0, 0)
+        obj.widgets["test_2"].font_color = (0, 1, 0)
+
+        result = obj.compile().render(data_dict)
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_sejda(sejda_template, pdf_samples, sejda_data):
+    expected_path = os.path.join(pdf_samples, "sample_filled_sejda.pdf")
+    with open(expected_path, "rb+") as f:
+        result = PdfWrapper(sejda_template).compile().render(sejda_data)
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_sejda_complex(sejda_template_complex, pdf_samples):
+    expected_path = os.path.join(
+        pdf_samples, "paragraph", "sample_filled_sejda_complex.pdf"
+    )
+    with open(expected_path, "rb+") as f:
+        result = (
+            PdfWrapper(sejda_template_complex)
+            .compile()
+            .render(
+                {
+                    "checkbox": True,
+                    "radio": 0,
+                    "dropdown_font_auto_left": 0,
+                    "dropdown_font_auto_center": 1,
+                    "dropdown_font_auto_right": 2,
+                    "dropdown_font_ten_left": 0,
+                    "dropdown_font_ten_center": 1,
+                    "dropdown_font_ten_right": 2,
+                    "paragraph_font_auto_left": "paragraph_font_auto_left",
+                    "paragraph_font_auto_center": "paragraph_font_auto_center",
+                    "paragraph_font_auto_right": "paragraph_font_auto_right",
+                    "paragraph_font_ten_left": "paragraph_font_ten_left",
+                    "paragraph_font_ten_center": "paragraph_font_ten_center",
+                    "paragraph_font_ten_right": "paragraph_font_ten_right",
+                    "text__font_auto_left": "test text",
+                    "text_font_auto_center": "test text",
+                    "text_font_auto_right": "test text",
+                    "text_font_ten_left": "text_font_ten_left",
+                    "text_font_ten_center": "text_font_ten_center",
+                    "text_font_ten_right": "text_font_ten_right",
+                }
+            )
+        )
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_dropdown(sample_template_with_dropdown, pdf_samples):
+    expected_path = os.path.join(pdf_samples, "dropdown", "dropdown_one.pdf")
+    with open(expected_path, "rb+") as f:
+        result = (
+            PdfWrapper(sample_template_with_dropdown)
+            .compile()
+            .render(
+                {
+                    "test_1": "test_1",
+                    "test_2": "test_2",
+                    "test_3": "test_3",
+                    "check_1": True,
+                    "check_2": True,
+                    "check_3": True,
+                    "radio_1": 1,
+                    "dropdown_1": 0,
+                },
+            )
+        )
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_comb_text_field(
+    sample_template_with_comb_text_field, max_length_expected_directory
+):
+    expected_path = os.path.join(
+        max_length_expected_directory, "comb_text_field_all_chars.pdf"
+    )
+    with open(expected_path, "rb+") as f:
+        result = (
+            PdfWrapper(sample_template_with_comb_text_field)
+            .compile()
+            .render(
+                {
+                    "FirstName": "John",
+                    "MiddleName": "Joe",
+                    "LastName": "XXXXXXXXXX",
+                    "Awesomeness": True,
+                    "Gender": 0,
+                }
+            )
+        )
+
+        expected = f.read()
+
+        assert len(result) == len(expected)
+        assert result == expected
+
+
+def test_compile_render_signature(pdf_samples, image_samples):
+    expected_path = os.path.join(pdf_samples, "signature", "test_fill_signature.pdf")
+    with open(expected_path, "rb+") as f:
+        result = (
+            PdfWrapper(
+                os.path.join(
+                    pdf_samples, "signature", "sample_template_with_signature.pdf"
+                )
+            )
+            .compile()
+            .render({"signature": os.path.join(image_samples, "sample_signature.png")})
+        )
+
+        expected = f.read()
+
+        if os.name != "nt":
+            assert len(result) == len(expected)
+            assert result == expected
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import os
+from io import BytesIO
 
-from PyPDFForm import PdfWrapper
+from pypdf import PdfReader
+
+from PyPDFForm import PdfWrapper, wrapper
 
 
 def test_create_radio_not_working(template_stream):
@@ -482,3 +485,108 @@ def test_create_dropdown(template_stream, pdf_samples, request):
 
         assert len(obj.stream) == len(expected)
         assert obj.stream == expected
+
+
+def _annots_by_key(stream):
+    return {
+        annot.get_object()["/T"]: annot.get_object()
+        for page in PdfReader(BytesIO(stream)).pages
+        for annot in page.get("/Annots", [])
+    }
+
+
+def test_create_widgets(template_stream, monkeypatch):
+    specs = [
+        {"widget_type": "text", "name": "foo", "page_number": 1, "x": 100, "y": 100},
+        {
+            "widget_type": "text",
+            "name": "bar",
+            "page_number": 1,
+            "x": 100,
+            "y": 300,
+            "alignment": 2,
+            "multiline": True,
+        },
+        {
+            "widget_type": "checkbox",
+            "name": "baz",
+            "page_number": 2,
+            "x": 100,
+            "y": 100,
+        },
+        {"widget_type": "radio", "name": "qux", "page_number": 2, "x": 100, "y": 300},
+        {
+            "widget_type": "dropdown",
+            "name": "quux",
+            "page_number": 3,
+            "x": 100,
+            "y": 100,
+            "options": ["a", "b"],
+            "alignment": 1,
+        },
+    ]
+
+    handled = []
+    handle_non_acro_form_params = wrapper.handle_non_acro_form_params
+
+    def _handle_non_acro_form_params(pdf, params):
+        handled.append(params)
+        return handle_non_acro_form_params(pdf, params)
+
+    monkeypatch.setattr(
+        wrapper, "handle_non_acro_form_params", _handle_non_acro_form_params
+    )
+
+    obj = PdfWrapper(template_stream, global_font_size=20).create_widgets(specs)
+    assert len(handled) == 1
+    assert list(handled[0]) == ["bar", "quux"]
+
+    expected = PdfWrapper(template_stream, global_font_size=20)
+    for spec in specs:
+        expected.create_widget(**spec)
+
+    assert obj.widgets.keys() == expected.widgets.keys()
+    assert "qux" not in obj.widgets
+    assert obj.widgets["foo"].font_size == 20
+    assert obj.widgets["quux"].font_size == 20
+    assert obj.schema == expected.schema
+
+    annots = _annots_by_key(obj.read())
+    expected_annots = _annots_by_key(expected.read())
+    for key in ("foo", "bar", "baz", "quux"):
+        for each in ("/FT", "/Ff", "/Q", "/Rect"):
+            assert annots[key].get(each) == expected_annots[key].get(each)
+
+    filled = PdfReader(BytesIO(obj.fill(obj.sample_data).read()))
+    expected_filled = PdfReader(BytesIO(expected.fill(expected.sample_data).read()))
+    for i, page in enumerate(filled.pages):
+        assert page.extract_text() == expected_filled.pages[i].extract_text()
+
+
+def test_create_widgets_not_working(template_stream):
+    obj = PdfWrapper(template_stream)
+    stream = obj.stream
+
+    assert (
+        obj.create_widgets(
+            [{"widget_type": "radio", "name": "foo", "page_number": 1, "x": 1, "y": 1}]
+        ).stream
+        == stream
+    )
+
+
+def test_create_widgets_deferred(template_stream):
+    spec = {"widget_type": "text", "name": "foo", "page_number": 1, "x": 100, "y": 100}
+
+    obj = (
+        PdfWrapper(template_stream, deferred=True)
+        .create_widgets([spec])
+        .draw_text("bar", 1, 100, 300)
+    )
+    assert (
+        obj.read()
+        == PdfWrapper(template_stream)
+        .create_widget(**spec)
+        .draw_text("bar", 1, 100, 300)
+        .read()
+    )
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyPDFForm import PdfWrapper, wrapper
+
+
+def _draw(obj, image_samples):
+    return (
+        obj.draw_text("foo", 1, 100, 100)
+        .create_widget("text", "created_text", 1, 100, 300, alignment=1)
+        .draw_image(
+            os.path.join(image_samples, "sample_image.jpg"), 2, 100, 100, 400, 225
+        )
+        .create_widget("checkbox", "created_check", 2, 100, 500)
+        .draw_text("bar\nbaz", 3, 200, 200, font_size=20, font_color=(1, 0, 0))
+        .create_widget("dropdown", "created_dropdown", 1, 300, 300, options=["a", "b"])
+        .draw_text("qux", 1, 300, 600)
+    )
+
+
+def test_deferred(template_stream, image_samples):
+    eager = _draw(PdfWrapper(template_stream, global_font_size=20), image_samples)
+    deferred = _draw(
+        PdfWrapper(template_stream, global_font_size=20, deferred=True),
+        image_samples,
+    )
+
+    assert deferred.read() == eager.read()
+    assert deferred.widgets.keys() == eager.widgets.keys()
+    for key, value in eager.widgets.items():
+        assert type(deferred.widgets[key]) is type(value)
+        assert getattr(deferred.widgets[key], "font_size", None) == getattr(
+            value, "font_size", None
+        )
+
+    assert deferred.widgets["created_text"].font_size == 20
+    assert deferred.widgets["created_dropdown"].font_size == 20
+
+
+def test_deferred_writes_once(template_stream, image_samples, monkeypatch):
+    merged = []
+    merge_watermark_layers = wrapper.merge_watermark_layers
+
+    def _merge_watermark_layers(pdf_file, watermark_layers, **kwargs):
+        merged.append(len(watermark_layers))
+        return merge_watermark_layers(pdf_file, watermark_layers, **kwargs)
+
+    monkeypatch.setattr(wrapper, "merge_watermark_layers", _merge_watermark_layers)
+
+    obj = PdfWrapper(template_stream, deferred=True)
+    stream = obj.stream
+    for i in range(10):
+        obj.draw_text(str(i), 1, 100, 100 + i * 20)
+
+    assert not merged
+    assert obj.flush() is obj
+    assert merged == [10]
+
+    assert obj.flush().stream != stream
+    assert merged == [10]
+
+    _draw(obj, image_samples).read()
+    assert merged == [10, 2, 5]
+
+
+def test_deferred_is_flushed_when_used(template_stream, data_dict):
+    obj = PdfWrapper(template_stream, deferred=True).draw_text("foo", 1, 100, 100)
+
+    assert obj.fill(data_dict).read() == (
+        PdfWrapper(template_stream).draw_text("foo", 1, 100, 100).fill(data_dict).read()
+    )
+
+
+def test_deferred_update_widget_key(template_stream):
+    obj = (
+        PdfWrapper(template_stream, deferred=True)
+        .create_widget("text", "foo", 1, 100, 100)
+        .update_widget_key("foo", "bar")
+    )
+
+    assert obj.deferred
+    assert "bar" in obj.widgets
+    assert "foo" not in obj.widgets
+
+
+def test_deferred_discarded_by_new_stream(template_stream):
+    obj = PdfWrapper(template_stream, deferred=True).draw_text("foo", 1, 100, 100)
+    obj.stream = template_stream
+
+    assert obj.read() == template_stream
+
+
+def test_deferred_create_widget_after_widgets(template_stream):
+    obj = PdfWrapper(template_stream, deferred=True)
+    assert "new_field" not in obj.widgets
+
+    obj.create_widget("text", "new_field", 1, 100, 100)
+    assert "new_field" in obj.widgets
+    assert "new_field" in obj.schema["properties"]
+    assert "new_field" in obj.sample_data
+
+    obj.fill({"new_field": "HELLO"})
+    assert obj.widgets["new_field"].value == "HELLO"
+    assert obj.read() == (
+        PdfWrapper(template_stream)
+        .create_widget("text", "new_field", 1, 100, 100)
+        .fill({"new_field": "HELLO"})
+        .read()
+    )
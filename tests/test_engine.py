@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject, NullObject
+
+from PyPDFForm import PdfWrapper, constants, content, watermark
+from PyPDFForm.middleware.text import Text
+
+
+def _texts(stream):
+    return [page.extract_text() for page in PdfReader(BytesIO(stream)).pages]
+
+
+def _jpg(mode):
+    with BytesIO() as f:
+        Image.new(mode, (4, 2)).save(f, format="JPEG")
+        return f.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("template", "data"),
+    [
+        ("sample_template.pdf", {"test": "test_1 (é€)", "check": True}),
+        ("sample_template_sejda.pdf", {"date": "01-01", "year": "21", "buy_1": True}),
+        (
+            "sample_template_with_radio_button.pdf",
+            {"radio_1": 0, "radio_2": 1, "radio_3": 2},
+        ),
+        (
+            os.path.join("dropdown", "sample_template_with_dropdown.pdf"),
+            {"dropdown_1": 1},
+        ),
+        (
+            "sample_template_with_comb_text_field.pdf",
+            {"LastName": "Smith"},
+        ),
+        (
+            os.path.join("paragraph", "sample_template_paragraph_complex.pdf"),
+            {
+                "paragraph_1": "test paragraph " * 10,
+                "paragraph_2": "test paragraph\nwith a new line",
+            },
+        ),
+    ],
+)
+def test_fill_direct(pdf_samples, template, data):
+    template = os.path.join(pdf_samples, template)
+    obj = PdfWrapper(template, engine="direct").fill(data)
+    expected = PdfWrapper(template).fill(data)
+
+    assert _texts(obj.read()) == _texts(expected.read())
+    assert obj.read() != expected.read()
+    for page in PdfReader(BytesIO(obj.read())).pages:
+        assert not page.annotations
+
+
+def test_fill_direct_image(sample_template_with_image_field, image_samples):
+    image = os.path.join(image_samples, "sample_image.jpg")
+    obj = PdfWrapper(sample_template_with_image_field, engine="direct").fill(
+        {"image_1": image}
+    )
+
+    xobjects = PdfReader(BytesIO(obj.read())).pages[0][constants.Resources][
+        constants.XObject
+    ]
+    images = [value for key, value in xobjects.items() if "PyPDFForm" in key]
+    assert len(images) == 1
+    with open(image, "rb") as f:
+        assert images[0].get_object().get_data() == f.read()
+
+
+def test_fill_direct_falls_back(template_stream, font_samples, data_dict):
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb") as f:
+        PdfWrapper.register_font("LiberationSerif-Italic", f.read())
+
+    obj = PdfWrapper(
+        template_stream, global_font="LiberationSerif-Italic", engine="direct"
+    ).fill(data_dict)
+    expected = PdfWrapper(template_stream, global_font="LiberationSerif-Italic").fill(
+        data_dict
+    )
+
+    assert obj.read() == expected.read()
+
+
+def test_fill_many_direct(template_stream, data_dict):
+    obj = PdfWrapper(template_stream, engine="direct")
+    expected = PdfWrapper(template_stream)
+
+    assert obj.compile().engine == constants.DIRECT_ENGINE
+    assert [_texts(each) for each in obj.fill_many([data_dict, {}])] == [
+        _texts(each) for each in expected.fill_many([data_dict, {}])
+    ]
+
+
+def test_draw_direct(template_stream, image_samples):
+    def _draw(obj):
+        return (
+            obj.draw_text("foo", 1, 100, 100)
+            .draw_text("bar\nbaz", 2, 200, 200, font_size=20, font_color=(1, 0, 0))
+            .draw_image(
+                os.path.join(image_samples, "sample_image.jpg"), 2, 100, 100, 400, 225
+            )
+            .draw_image(
+                os.path.join(image_samples, "sample_image.jpg"), 3, 100, 100, 400, 225
+            )
+        )
+
+    obj = _draw(PdfWrapper(template_stream, engine="direct", deferred=True))
+    expected = _draw(PdfWrapper(template_stream))
+
+    assert _texts(obj.read()) == _texts(expected.read())
+    assert len(obj.read()) < len(expected.read())
+
+
+def test_draw_direct_twice(template_stream):
+    obj = (
+        PdfWrapper(template_stream, engine="direct")
+        .draw_text("foo", 1, 100, 100)
+        .draw_text("bar", 1, 100, 200)
+    )
+    expected = (
+        PdfWrapper(template_stream)
+        .draw_text("foo", 1, 100, 100)
+        .draw_text("bar", 1, 100, 200)
+    )
+
+    assert _texts(obj.read()) == _texts(expected.read())
+
+
+def test_draw_direct_with_created_widgets(template_stream):
+    def _draw(obj):
+        return obj.draw_text("foo", 1, 100, 100).create_widget(
+            "text", "foo", 1, 100, 300
+        )
+
+    obj = _draw(PdfWrapper(template_stream, engine="direct", deferred=True))
+    expected = _draw(PdfWrapper(template_stream, deferred=True))
+
+    assert obj.read() == expected.read()
+    assert "foo" in obj.widgets
+
+
+def test_update_widget_key_keeps_engine(template_stream):
+    obj = PdfWrapper(template_stream, engine="direct").update_widget_key("test", "foo")
+
+    assert obj.engine == constants.DIRECT_ENGINE
+
+
+def test_can_draw():
+    assert content.can_draw("image", [[_jpg("L")], [_jpg("RGB")], [_jpg("CMYK")]])
+    assert not content.can_draw("image", [[b"foo"]])
+    assert not content.can_draw("image", [[b"\xff\xd8"]])
+    assert content.can_draw("line", [[0, 0, 100, 100, 1, 0, 0]])
+
+
+@pytest.mark.parametrize(
+    ("mode", "color_space"),
+    [("L", "/DeviceGray"), ("RGB", "/DeviceRGB"), ("CMYK", "/DeviceCMYK")],
+)
+def test_create_image(mode, color_space):
+    image = content.create_image(_jpg(mode))
+
+    assert image[constants.ColorSpace] == color_space
+    assert (image[constants.Width], image[constants.Height]) == (4, 2)
+    assert (constants.Decode in image) is (mode == "CMYK")
+
+
+def test_draw_on_pages_without_contents():
+    writer = PdfWriter()
+    writer.add_blank_page(200, 200)
+    writer.add_blank_page(200, 200)
+    with BytesIO() as f:
+        writer.write(f)
+        pdf = PdfReader(BytesIO(f.getvalue()))
+
+    result = PdfReader(
+        BytesIO(
+            content.draw_on_pages(
+                pdf,
+                [
+                    ("line", {1: [[0, 0, 100, 100, 1, 0, 0]]}),
+                    ("rect", {1: [[10, 10, 50, 50]]}),
+                ],
+            )
+        )
+    )
+
+    contents = result.pages[0].get_contents()
+    assert contents is not None
+    assert contents.get_data() == (
+        b"q 1 0 0 RG 0 0 m 100 100 l S Q\n10 10 50 50 re S\n"
+    )
+    assert result.pages[1].get_contents() is None
+
+
+def test_draw_on_pages_moves_lines(template_stream):
+    widget = Text("foo", "foo bar")
+    widget.font = constants.DEFAULT_FONT
+    widget.font_size = 10
+    widget.font_color = constants.DEFAULT_FONT_COLOR
+    widget.text_wrap_length = 4
+    widget.text_lines = ["foo", "bar"]
+    widget.text_line_x_coordinates = [110, 100]
+
+    result = PdfReader(
+        BytesIO(
+            content.draw_on_pages(
+                PdfReader(BytesIO(template_stream)),
+                [("text", {1: [[widget, 100, 100]]})],
+            )
+        )
+    )
+
+    contents = result.pages[0].get_contents()
+    assert contents is not None
+    assert b"10 0 Td (foo) Tj T* -10 0 Td (bar) Tj T*" in contents.get_data()
+
+
+def test_add_resource_unique_names():
+    writer = PdfWriter()
+    page = writer.add_blank_page(200, 200)
+    page[NameObject(constants.Resources)] = DictionaryObject(
+        {
+            NameObject(constants.Font): DictionaryObject(
+                {NameObject("/PyPDFFormF2"): NullObject()}
+            )
+        }
+    )
+    page_content = content.PageContent(writer, page, {})
+
+    assert (
+        page_content.add_resource(constants.Font, "Helvetica", content.create_font)
+        == "/PyPDFFormF3"
+    )
+    assert (
+        page_content.add_resource(constants.Font, "ZapfDingbats", content.create_font)
+        == "/PyPDFFormF4"
+    )
+    assert (
+        page_content.add_resource(constants.Font, "Helvetica", content.create_font)
+        == "/PyPDFFormF3"
+    )
+
+
+def _words(stream):
+    return ["".join(each.split()) for each in _texts(stream)]
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "sample_template.pdf",
+        "sample_template_sejda.pdf",
+        os.path.join("paragraph", "sample_template_paragraph_complex.pdf"),
+    ],
+)
+def test_fill_xobject(pdf_samples, template):
+    template = os.path.join(pdf_samples, template)
+    data = {
+        key: value.sample_value for key, value in PdfWrapper(template).widgets.items()
+    }
+    obj = PdfWrapper(template, engine="xobject").fill(data)
+    expected = PdfWrapper(template).fill(data)
+
+    assert _words(obj.read()) == _words(expected.read())
+    for page in PdfReader(BytesIO(obj.read())).pages:
+        assert not page.annotations
+        forms = [
+            value.get_object()
+            for key, value in page[constants.Resources][constants.XObject].items()
+            if "PyPDFForm" in key
+        ]
+        assert len(forms) == 1
+        assert forms[0][constants.Subtype] == constants.FormXObject
+        contents = page.get_contents()
+        assert contents is not None
+        assert contents.get_data().endswith(b"Do\n")
+
+
+def test_draw_xobject(template_stream, image_samples):
+    def _draw(obj):
+        return (
+            obj.draw_text("foo", 1, 100, 100)
+            .draw_image(
+                os.path.join(image_samples, "sample_image.jpg"), 1, 100, 100, 400, 225
+            )
+            .create_widget("text", "foo", 2, 100, 300)
+        )
+
+    obj = _draw(PdfWrapper(template_stream, engine="xobject", deferred=True))
+    expected = _draw(PdfWrapper(template_stream, deferred=True))
+
+    assert _words(obj.read()) == _words(expected.read())
+    assert obj.widgets.keys() == expected.widgets.keys()
+    assert len(PdfReader(BytesIO(obj.read())).pages[0].images) == len(
+        PdfReader(BytesIO(expected.read())).pages[0].images
+    )
+
+
+def test_merge_watermarks_xobject(template_stream):
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    with BytesIO() as f:
+        writer.write(f)
+        watermarks = [f.getvalue(), b"", b""]
+
+    result = PdfReader(
+        BytesIO(
+            watermark.merge_watermarks_with_pdf(
+                template_stream, watermarks, engine="xobject"
+            )
+        )
+    )
+
+    contents = result.pages[0].get_contents()
+    assert contents is not None
+    assert contents.get_data().endswith(b"/PyPDFFormX1 Do\n")
+    assert constants.XObject not in result.pages[1][constants.Resources]
+
+
+def test_compile_direct(template_stream, data_dict):
+    compiled = PdfWrapper(template_stream, engine="direct").compile()
+    expected = PdfWrapper(template_stream).compile()
+
+    filled = compiled.render(data_dict)
+    empty = compiled.render({})
+
+    assert _texts(filled) == _texts(expected.render(data_dict))
+    assert _texts(empty) == _texts(expected.render({}))
+    assert compiled.render(data_dict) == filled
+    assert pickle.loads(pickle.dumps(compiled)).render({}) == empty
+    for page in PdfReader(BytesIO(filled)).pages:
+        assert not page.annotations
+
+
+def test_compile_direct_threads(template_stream):
+    compiled = PdfWrapper(template_stream, engine="direct").compile()
+    records = [
+        {"test": f"test_{i}", "check": bool(i % 2), "test_2": f"test_2_{i}"}
+        for i in range(200)
+    ]
+    expected = [compiled.render(each) for each in records]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(compiled.render, records)) == expected
+
+
+def test_compile_direct_dropdown(sample_template_with_dropdown):
+    compiled = PdfWrapper(sample_template_with_dropdown, engine="direct").compile()
+    expected = PdfWrapper(sample_template_with_dropdown).compile()
+
+    assert _texts(compiled.render({"dropdown_1": 1})) == _texts(
+        expected.render({"dropdown_1": 1})
+    )
+
+
+def test_compile_direct_falls_back(
+    template_stream, sample_template_with_image_field, image_samples, font_samples
+):
+    compiled = PdfWrapper(sample_template_with_image_field, engine="direct").compile()
+    image = os.path.join(image_samples, "sample_image.jpg")
+
+    assert _texts(compiled.render({"image_1": image})) == _texts(
+        PdfWrapper(sample_template_with_image_field)
+        .compile()
+        .render({"image_1": image})
+    )
+
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb") as f:
+        PdfWrapper.register_font("LiberationSerif-Italic", f.read())
+
+    assert PdfWrapper(
+        template_stream, global_font="LiberationSerif-Italic", engine="direct"
+    ).compile().render({"test": "foo"}) == PdfWrapper(
+        template_stream, global_font="LiberationSerif-Italic"
+    ).compile().render(
+        {"test": "foo"}
+    )
+
+
+def test_compile_direct_without_template():
+    assert PdfWrapper(engine="direct").compile().content_template is None
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyPDFForm import FormWrapper, PdfWrapper
+
+
+def test_fill_many(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        obj = PdfWrapper(template_stream)
+
+        expected = f.read()
+
+        results = list(obj.fill_many([data_dict, {}, data_dict]))
+
+        assert len(results) == 3
+        assert results[0] == expected
+        assert results[1] == PdfWrapper(template_stream).fill({}).read()
+        assert results[2] == expected
+        assert obj.read() == template_stream
+        assert obj.widgets["test"].value is None
+
+
+def test_fill_many_sejda(sejda_template, pdf_samples, sejda_data):
+    expected_path = os.path.join(pdf_samples, "sample_filled_sejda.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        for each in PdfWrapper(sejda_template).fill_many([sejda_data] * 2):
+            assert len(each) == len(expected)
+            assert each == expected
+
+
+def test_fill_many_is_lazy(template_stream, data_dict):
+    consumed = []
+
+    def _records():
+        for i in range(3):
+            consumed.append(i)
+            yield data_dict
+
+    for wrapper in (PdfWrapper, FormWrapper):
+        consumed.clear()
+        results = wrapper(template_stream).fill_many(_records())
+        assert not consumed
+
+        next(results)
+        assert consumed == [0]
+
+
+def test_fill_many_simple(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "simple", "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        obj = FormWrapper(template_stream)
+
+        expected = f.read()
+
+        results = list(obj.fill_many([data_dict, {}, data_dict]))
+
+        assert len(results) == 3
+        assert results[0] == expected
+        assert results[1] == FormWrapper(template_stream).fill({}).read()
+        assert results[2] == expected
+        assert obj.read() == template_stream
+
+
+def test_fill_many_simple_flatten(sample_template_with_dropdown):
+    data = {"dropdown_1": 0}
+    results = list(
+        FormWrapper(sample_template_with_dropdown).fill_many(
+            [data, data], flatten=True, adobe_mode=True
+        )
+    )
+
+    assert results[0] == results[1]
+    assert (
+        results[0]
+        == FormWrapper(sample_template_with_dropdown)
+        .fill(data, flatten=True, adobe_mode=True)
+        .read()
+    )
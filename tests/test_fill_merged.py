@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import os
+from io import BytesIO
+from mmap import mmap
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import IndirectObject, NameObject, NullObject
+
+from PyPDFForm import FormWrapper, PdfWrapper, constants
+from PyPDFForm.merge import get_key_separator, merge_copies
+
+
+def test_fill_merged(template_stream, data_dict):
+    output = BytesIO()
+    PdfWrapper(template_stream).fill_merged([data_dict, {}, data_dict], output)
+
+    merged = PdfReader(output)
+    assert len(merged.pages) == 3 * 3
+    assert merged.get_fields() is None
+
+    filled = PdfReader(BytesIO(PdfWrapper(template_stream).fill(data_dict).read()))
+    for i, page in enumerate(filled.pages):
+        assert merged.pages[i].extract_text() == page.extract_text()
+        assert merged.pages[i + 6].extract_text() == page.extract_text()
+
+
+def test_fill_merged_to_path(template_stream, data_dict, tmp_path):
+    path = os.path.join(tmp_path, "merged.pdf")
+    PdfWrapper(template_stream).fill_merged([data_dict] * 2, path)
+
+    with open(path, "rb+") as f:
+        assert len(PdfReader(f).pages) == 3 * 2
+
+
+def test_fill_merged_over_memory_mapped(
+    template_stream, data_dict, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    path = os.path.join(tmp_path, "template.pdf")
+    with open(path, "wb+") as f:
+        f.write(template_stream)
+
+    obj = PdfWrapper(path)
+    assert isinstance(obj.stream, mmap)
+
+    obj.fill_merged([data_dict] * 2, path)
+    with open(path, "rb+") as f:
+        assert len(PdfReader(f).pages) == 3 * 2
+
+    assert obj.read() == template_stream
+
+
+def test_fill_merged_simple(template_with_radiobutton_stream):
+    output = BytesIO()
+    FormWrapper(template_with_radiobutton_stream).fill_merged(
+        [
+            {"test": "foo", "check": True, "radio_1": 0},
+            {"test": "bar", "radio_1": 1},
+        ],
+        output,
+        flatten=True,
+    )
+
+    merged = PdfReader(output)
+    fields = merged.get_fields()
+    assert fields is not None
+    template = PdfReader(BytesIO(template_with_radiobutton_stream))
+
+    assert len(merged.pages) == 2 * len(template.pages)
+    assert len(merged.trailer["/Root"]["/AcroForm"]["/Fields"]) == len(fields)
+    assert len(fields) == 2 * 9
+    assert fields["test__0"]["/V"] == "foo"
+    assert fields["check__0"]["/V"] == "/Yes"
+    assert fields["radio_1__0"]["/V"] == "/0"
+    assert fields["test__1"]["/V"] == "bar"
+    assert fields["check__1"].get("/V") is None
+    assert fields["radio_1__1"]["/V"] == "/1"
+
+    for page in merged.pages:
+        for annot in page.get("/Annots", []):
+            annot = annot.get_object()
+            if annot["/Subtype"] != "/Widget":
+                assert "/T" not in annot
+
+
+def test_fill_merged_simple_sejda(sejda_template, sejda_data):
+    output = BytesIO()
+    FormWrapper(sejda_template).fill_merged([sejda_data] * 3, output)
+
+    fields = PdfReader(output).get_fields()
+    assert fields is not None
+    for i in range(3):
+        for key, value in sejda_data.items():
+            assert f"{key}_{i}" in fields
+            if isinstance(value, str):
+                assert fields[f"{key}_{i}"]["/V"] == value
+
+
+def test_fill_merged_streams(template_stream, data_dict):
+    output = BytesIO()
+    written = []
+
+    def records():
+        for _ in range(3):
+            written.append(output.tell())
+            yield data_dict
+
+    PdfWrapper(template_stream).fill_merged(records(), output)
+
+    assert written[0] == 0
+    assert written[0] < written[1] < written[2] < output.tell()
+    assert len(PdfReader(output).pages) == 3 * 3
+
+
+def test_fill_merged_empty(template_stream):
+    output = BytesIO()
+    PdfWrapper(template_stream).fill_merged([], output)
+
+    merged = PdfReader(output, strict=True)
+    assert len(merged.pages) == 0
+    assert merged.pdf_header == constants.DEFAULT_PDF_HEADER
+
+
+def test_merge_copies_direct_annotations(template_with_radiobutton_stream):
+    writer = PdfWriter(clone_from=BytesIO(template_with_radiobutton_stream))
+    for page in writer.pages:
+        annots = page["/Annots"]
+        for i, annot in enumerate(annots):
+            annots[i] = annot.get_object()
+    with BytesIO() as f:
+        writer.write(f)
+        template = f.getvalue()
+
+    output = BytesIO()
+    merge_copies([template] * 2, output)
+
+    fields = PdfReader(output, strict=True).get_fields()
+    assert fields is not None
+    assert len(fields) == 2 * 9
+    for i in range(2):
+        assert f"test__{i}" in fields
+        assert f"radio_1__{i}" in fields
+
+
+def test_merge_copies_dangling_reference_and_blank_page(template_stream):
+    writer = PdfWriter(clone_from=BytesIO(template_stream))
+    writer.pages[0][NameObject("/Dangling")] = IndirectObject(9999, 0, writer)
+    writer.add_blank_page()
+    with BytesIO() as f:
+        writer.write(f)
+        template = f.getvalue()
+
+    output = BytesIO()
+    merge_copies([template], output)
+
+    merged = PdfReader(output, strict=True)
+    assert len(merged.pages) == 3 + 1
+    assert isinstance(merged.pages[0]["/Dangling"], NullObject)
+
+
+def test_get_key_separator():
+    assert get_key_separator([]) == "_"
+    assert get_key_separator(["test", "check"]) == "_"
+    assert get_key_separator(["a_1"]) == "_"
+    assert get_key_separator(["test", "test_1"]) == "__"
+    assert get_key_separator(["a", "a_1", "a__2"]) == "___"
+    assert get_key_separator(["a", "a_b"]) == "_"
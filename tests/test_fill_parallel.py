@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from PyPDFForm import (FillError, FormWrapper, PdfWrapper, batch, template,
+                       wrapper)
+
+
+def _exit_worker(record):
+    os._exit(1)
+
+
+def test_fill_parallel(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        results = list(
+            PdfWrapper(template_stream).fill_parallel(
+                [data_dict] * 5 + [{}], max_workers=2, chunk_size=2
+            )
+        )
+
+        assert len(results) == 6
+        for each in results[:-1]:
+            assert each == expected
+        assert results[-1] == PdfWrapper(template_stream).fill({}).read()
+
+
+def test_fill_parallel_unordered(template_stream, data_dict):
+    records = [data_dict, {}] * 3
+    results = list(
+        PdfWrapper(template_stream).fill_parallel(
+            records, max_workers=2, chunk_size=1, ordered=False
+        )
+    )
+
+    assert sorted(index for index, _ in results) == list(range(6))
+    for index, each in results:
+        assert each == PdfWrapper(template_stream).fill(records[index]).read()
+
+
+def test_fill_parallel_simple(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "simple", "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        results = list(
+            FormWrapper(template_stream).fill_parallel([data_dict] * 3, max_workers=2)
+        )
+
+        assert results == [expected] * 3
+
+
+def test_fill_parallel_simple_builds_widgets_once(
+    template_stream, data_dict, monkeypatch
+):
+    expected = FormWrapper(template_stream).fill(data_dict, flatten=True).read()
+    build_widgets = wrapper.build_widgets
+    built = []
+
+    def _build_widgets(pdf):
+        if built:
+            raise RuntimeError
+        built.append(pdf)
+        return build_widgets(pdf)
+
+    monkeypatch.setattr(wrapper, "build_widgets", _build_widgets)
+
+    results = list(
+        FormWrapper(template_stream).fill_parallel(
+            [data_dict] * 4, max_workers=2, chunk_size=1, flatten=True
+        )
+    )
+
+    assert len(built) == 1
+    assert results == [expected] * 4
+
+
+def test_fill_kwargs():
+    assert batch.fill_kwargs(
+        {"flatten": True, "max_workers": 2, "chunk_size": 1, "ordered": False}
+    ) == {"flatten": True}
+
+
+def test_fill_parallel_reports_failed_records(template_stream, data_dict):
+    results = list(
+        PdfWrapper(template_stream).fill_parallel(
+            [data_dict, {"test": object()}, data_dict], max_workers=2, chunk_size=2
+        )
+    )
+
+    assert results[0] == results[2]
+    assert isinstance(results[1], FillError)
+    assert results[1].index == 1
+    assert "TypeError" in results[1].message
+    assert str(results[1]).startswith("failed to fill record 1: ")
+
+
+def test_fill_parallel_reports_failed_chunks(template_stream, data_dict):
+    results = list(
+        PdfWrapper(template_stream).fill_parallel(
+            [data_dict, {"test": lambda: None}, data_dict],
+            max_workers=1,
+            chunk_size=1,
+        )
+    )
+
+    assert results[0] == results[2]
+    assert isinstance(results[1], FillError)
+    assert results[1].index == 1
+
+
+def test_fill_parallel_reports_broken_pool():
+    results = list(
+        batch.fill_in_parallel(_exit_worker, [{}] * 4, max_workers=1, chunk_size=1)
+    )
+
+    assert len(results) == 4
+    for i, each in enumerate(results):
+        assert isinstance(each, FillError)
+        assert each.index == i
+        assert "BrokenProcessPool" in each.message
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(batch, "worker_state", {})
+
+
+def test_fill_chunk(template_stream, data_dict, worker):
+    obj = FormWrapper(template_stream)
+    widgets = template.build_widgets(template_stream)
+    batch.init_worker(
+        lambda record: batch.fill_in_place(obj, widgets, {"flatten": True}, record)
+    )
+
+    results = batch.fill_chunk([(3, data_dict), (4, {"test": object()})])
+
+    assert results[0] == (
+        3,
+        FormWrapper(template_stream).fill(data_dict, flatten=True).read(),
+    )
+    assert results[1][0] == 4
+    assert isinstance(results[1][1], FillError)
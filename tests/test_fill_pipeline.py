@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+from reportlab.pdfgen.canvas import Canvas
+
+from PyPDFForm import PdfWrapper, template_cache, watermark
+
+
+@pytest.fixture
+def pdf_operations(monkeypatch):
+    result = {"parsed": [], "written": 0}
+
+    reader_init = PdfReader.__init__
+    writer_write = PdfWriter.write
+
+    def _reader_init(self, stream, *args, **kwargs):
+        result["parsed"].append(stream.getvalue())
+        reader_init(self, stream, *args, **kwargs)
+
+    def _writer_write(self, stream):
+        result["written"] += 1
+        return writer_write(self, stream)
+
+    monkeypatch.setattr(PdfReader, "__init__", _reader_init)
+    monkeypatch.setattr(PdfWriter, "write", _writer_write)
+
+    return result
+
+
+def test_fill_parses_and_writes_once(
+    template_stream, pdf_samples, data_dict, pdf_operations
+):
+    template_cache.clear()
+    obj = PdfWrapper(template_stream)
+    pdf_operations["parsed"].clear()
+
+    obj.fill(data_dict)
+
+    assert pdf_operations["parsed"].count(template_stream) == 1
+    assert pdf_operations["written"] == 1
+
+    with open(os.path.join(pdf_samples, "sample_filled.pdf"), "rb+") as f:
+        assert obj.read() == f.read()
+
+
+def test_fill_with_image_parses_and_writes_once(
+    pdf_samples, image_samples, pdf_operations
+):
+    template_cache.clear()
+    with open(
+        os.path.join(pdf_samples, "signature", "sample_template_with_signature.pdf"),
+        "rb+",
+    ) as f:
+        template = f.read()
+
+    obj = PdfWrapper(template)
+    pdf_operations["parsed"].clear()
+
+    obj.fill({"signature": os.path.join(image_samples, "sample_signature.png")})
+
+    assert pdf_operations["parsed"].count(template) == 1
+    assert pdf_operations["written"] == 1
+
+
+def test_compiled_render_parses_and_writes_once(
+    template_stream, data_dict, pdf_operations
+):
+    compiled = PdfWrapper(template_stream).compile()
+    pdf_operations["parsed"].clear()
+    pdf_operations["written"] = 0
+
+    for _ in range(3):
+        compiled.render(data_dict)
+
+    assert pdf_operations["parsed"].count(template_stream) == 3
+    assert pdf_operations["written"] == 3
+
+
+def test_merge_parses_each_and_writes_once(
+    template_stream, sejda_template, pdf_operations
+):
+    pdfs = [PdfWrapper(template_stream), PdfWrapper(sejda_template)] * 5
+    pdf_operations["parsed"].clear()
+
+    PdfWrapper.merge(pdfs)
+
+    assert len(pdf_operations["parsed"]) == 10
+    assert pdf_operations["written"] == 1
+
+
+@pytest.fixture
+def canvases(monkeypatch):
+    result = []
+
+    def _canvas(*args, **kwargs):
+        result.append(Canvas(*args, **kwargs))
+        return result[-1]
+
+    monkeypatch.setattr(watermark, "Canvas", _canvas)
+
+    return result
+
+
+def test_fill_draws_on_one_canvas(template_stream, data_dict, canvases):
+    obj = PdfWrapper(template_stream)
+    assert len(obj.pages) == 3
+
+    obj.fill(data_dict)
+
+    assert len(canvases) == 1
+    assert canvases[0].getPageNumber() == 4
+
+
+def test_fill_with_image_draws_on_two_canvases(pdf_samples, image_samples, canvases):
+    PdfWrapper(
+        os.path.join(pdf_samples, "signature", "sample_template_with_signature.pdf")
+    ).fill({"signature": os.path.join(image_samples, "sample_signature.png")})
+
+    assert len(canvases) == 2
+
+
+def test_generate_coordinate_grid_draws_on_one_canvas_per_action(
+    template_stream, canvases
+):
+    PdfWrapper(template_stream).generate_coordinate_grid()
+
+    assert len(canvases) == 3
+    for each in canvases:
+        assert each.getPageNumber() == 4
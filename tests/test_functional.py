@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
 
 import os
+import pickle
+from io import SEEK_CUR, SEEK_END, BytesIO
+from mmap import mmap
 
+import pytest
 from jsonschema import ValidationError, validate
+from pypdf import PdfReader
 
-from PyPDFForm import PdfWrapper, constants, template
+from PyPDFForm import (FormWrapper, PdfWrapper, adapter, constants, template,
+                       wrapper)
 from PyPDFForm.middleware.base import Widget
 from PyPDFForm.middleware.text import Text
+from PyPDFForm.utils import stream_to_io
 
 
 def test_base_schema_definition():
@@ -200,6 +207,24 @@ def test_fill_sejda_and_read(sejda_template, pdf_samples, sejda_data, request):
         assert obj.stream == expected
 
 
+def test_widgets_are_discovered_lazily(template_stream, monkeypatch):
+    def _build_widgets(pdf_stream):
+        raise AssertionError
+
+    monkeypatch.setattr(wrapper, "build_widgets", _build_widgets)
+
+    obj = PdfWrapper(template_stream, global_font_size=20)
+    assert obj.version == "1.7"
+    assert len(obj.pages) == 3
+    obj.draw_text("drawn_text", 1, 300, 225).change_version("2.0")
+    assert (obj + PdfWrapper(template_stream)).read()
+
+    monkeypatch.undo()
+
+    assert obj.widgets["test"].font_size == 20
+    assert obj.widgets is obj.widgets
+
+
 def test_draw_text_on_one_page(template_stream, pdf_samples, request):
     expected_path = os.path.join(pdf_samples, "sample_pdf_with_drawn_text.pdf")
     with open(expected_path, "rb+") as f:
@@ -265,6 +290,16 @@ def test_draw_image_on_one_page(template_stream, image_samples, pdf_samples, req
             assert obj.stream == expected
 
 
+def test_draw_image_from_buffer(template_stream, image_samples):
+    with open(os.path.join(image_samples, "sample_image.jpg"), "rb+") as f:
+        image = f.read()
+
+    expected = PdfWrapper(template_stream).draw_image(image, 2, 100, 100, 400, 225)
+    for each in (bytearray(image), memoryview(image)):
+        obj = PdfWrapper(template_stream).draw_image(each, 2, 100, 100, 400, 225)
+        assert obj.read() == expected.read()
+
+
 def test_draw_png_image_on_one_page(
     template_stream, image_samples, pdf_samples, request
 ):
@@ -347,6 +382,242 @@ def test_addition_operator_3_times_sejda(
         assert result.read() == expected
 
 
+def test_fill_buffer(template_stream, pdf_samples, data_dict):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        for each in (bytearray(template_stream), memoryview(template_stream)):
+            obj = PdfWrapper(each)
+            assert isinstance(obj.stream, memoryview)
+            assert obj.stream.readonly
+            assert obj.stream.obj is (
+                each.obj if isinstance(each, memoryview) else each
+            )
+            assert obj.read() == template_stream
+            assert isinstance(obj.read(), bytes)
+            assert obj.version == PdfWrapper(template_stream).version
+            assert len(obj.pages) == len(PdfWrapper(template_stream).pages)
+
+            result = pickle.loads(pickle.dumps(obj))
+            assert isinstance(result.stream, bytes)
+            assert result.read() == template_stream
+
+            assert obj.fill(data_dict).read() == expected
+            assert (
+                FormWrapper(each).fill(data_dict).read()
+                == FormWrapper(template_stream).fill(data_dict).read()
+            )
+
+
+def test_fill_memory_mapped(pdf_samples, data_dict, monkeypatch):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        template_path = os.path.join(pdf_samples, "sample_template.pdf")
+        obj = PdfWrapper(template_path)
+        assert isinstance(obj.stream, mmap)
+        assert isinstance(obj.read(), bytes)
+        with open(template_path, "rb+") as template_file:
+            assert obj.read() == template_file.read()
+
+        assert obj.fill(data_dict).read() == expected
+        assert isinstance(obj.stream, bytes)
+
+
+def test_version_memory_mapped(pdf_samples, monkeypatch):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    obj = PdfWrapper(os.path.join(pdf_samples, "versions", "1.4.pdf"))
+    assert isinstance(obj.stream, mmap)
+    assert obj.version == "1.4"
+    assert obj.change_version("2.0").version == "2.0"
+
+
+def test_read_memory_mapped_io(pdf_samples, monkeypatch):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    obj = PdfWrapper(os.path.join(pdf_samples, "sample_template.pdf"))
+    buff = stream_to_io(obj.stream)
+
+    assert buff.read(5) == obj.read()[:5]
+    assert buff.seek(-5, SEEK_END) == len(obj.read()) - 5
+    assert buff.read() == obj.read()[-5:]
+    assert buff.seek(-10, SEEK_CUR) == len(obj.read()) - 10
+    assert buff.seek(-1) == 0
+    assert buff.read() == obj.read()
+
+
+def test_pickle_memory_mapped(pdf_samples, data_dict, monkeypatch):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    template_path = os.path.join(pdf_samples, "sample_template.pdf")
+    for each in (PdfWrapper, FormWrapper):
+        obj = each(template_path)
+        assert isinstance(obj.stream, mmap)
+        if isinstance(obj, PdfWrapper):
+            assert len(obj.pages)
+
+        result = pickle.loads(pickle.dumps(obj))
+        assert isinstance(result.stream, bytes)
+        assert result.read() == obj.read()
+        assert result.fill(data_dict).read() == obj.fill(data_dict).read()
+
+    compiled = PdfWrapper(template_path).compile()
+    assert isinstance(compiled.stream, mmap)
+    assert pickle.loads(pickle.dumps(compiled)).render(data_dict) == compiled.render(
+        data_dict
+    )
+
+
+def test_write_memory_mapped_to_itself(
+    template_stream, pdf_samples, data_dict, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    path = os.path.join(tmp_path, "template.pdf")
+    with open(path, "wb+") as f:
+        f.write(template_stream)
+
+    obj = PdfWrapper(path)
+    assert isinstance(obj.stream, mmap)
+    obj.write(path)
+    assert obj.read() == template_stream
+    with open(path, "rb+") as f:
+        assert f.read() == template_stream
+
+    obj.fill(data_dict).write(path)
+    with open(os.path.join(pdf_samples, "sample_filled.pdf"), "rb+") as f:
+        expected = f.read()
+    with open(path, "rb+") as f:
+        assert f.read() == expected
+    assert os.listdir(tmp_path) == ["template.pdf"]
+
+
+def test_write_memory_mapped_to_itself_fails(template_stream, tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    def _copymode(*_):
+        raise PermissionError
+
+    monkeypatch.setattr(adapter, "copymode", _copymode)
+
+    path = os.path.join(tmp_path, "template.pdf")
+    with open(path, "wb+") as f:
+        f.write(template_stream)
+
+    obj = PdfWrapper(path)
+    with pytest.raises(PermissionError):
+        obj.write(path)
+
+    assert obj.read() == template_stream
+    assert os.listdir(tmp_path) == ["template.pdf"]
+
+
+def test_write_over_memory_mapped(
+    template_stream, sejda_template, data_dict, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(constants, "MMAP_THRESHOLD", 0)
+
+    path = os.path.join(tmp_path, "template.pdf")
+    with open(path, "wb+") as f:
+        f.write(template_stream)
+
+    obj = PdfWrapper(path)
+    assert isinstance(obj.stream, mmap)
+
+    PdfWrapper(sejda_template).write(path)
+    with open(path, "rb+") as f:
+        assert f.read() == sejda_template
+
+    assert obj.read() == template_stream
+    assert (
+        obj.fill(data_dict).read() == PdfWrapper(template_stream).fill(data_dict).read()
+    )
+
+
+def test_write_through_symlink(template_stream, sejda_template, tmp_path):
+    path = os.path.join(tmp_path, "template.pdf")
+    with open(path, "wb+") as f:
+        f.write(template_stream)
+    os.chmod(path, 0o640)
+    link = os.path.join(tmp_path, "link.pdf")
+    os.symlink(path, link)
+
+    PdfWrapper(sejda_template).write(link)
+
+    assert os.path.islink(link)
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    with open(path, "rb+") as f:
+        assert f.read() == sejda_template
+    assert sorted(os.listdir(tmp_path)) == ["link.pdf", "template.pdf"]
+
+
+def test_write(template_stream, pdf_samples, data_dict, tmp_path):
+    expected_path = os.path.join(pdf_samples, "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        path = os.path.join(tmp_path, "output.pdf")
+        obj = PdfWrapper(template_stream).fill(data_dict).write(path)
+        assert isinstance(obj, PdfWrapper)
+
+        with open(path, "rb+") as output:
+            assert output.read() == expected
+
+        output = BytesIO()
+        obj.write(output)
+        assert output.getvalue() == expected
+
+
+def test_merge(template_stream, sejda_template, data_dict, sejda_data):
+    filled = [
+        PdfWrapper(template_stream).fill(data_dict),
+        PdfWrapper(),
+        PdfWrapper(sejda_template).fill(sejda_data),
+        PdfWrapper(template_stream).fill(data_dict),
+    ]
+
+    result = PdfWrapper.merge(filled)
+
+    expected = PdfWrapper()
+    for each in filled:
+        expected += each
+
+    assert isinstance(result, PdfWrapper)
+    assert len(result.read()) < len(expected.read())
+    assert len(result.pages) == len(expected.pages)
+    for i, each in enumerate(result.pages):
+        assert (
+            PdfReader(BytesIO(each.read())).pages[0].extract_text()
+            == PdfReader(BytesIO(expected.pages[i].read())).pages[0].extract_text()
+        )
+
+
+def test_merge_empty():
+    assert PdfWrapper.merge([]).read() == b""
+    assert PdfWrapper.merge([PdfWrapper(), PdfWrapper()]).read() == b""
+
+
+def test_sum(template_stream, sejda_template, data_dict, sejda_data):
+    filled = [
+        PdfWrapper(template_stream).fill(data_dict),
+        PdfWrapper(sejda_template).fill(sejda_data),
+        PdfWrapper(template_stream).fill(data_dict),
+    ]
+
+    assert sum(filled).read() == (filled[0] + filled[1] + filled[2]).read()
+
+    try:
+        _ = 1 + filled[0]
+        raise AssertionError
+    except TypeError:
+        pass
+
+
 def test_schema(sample_template_with_comb_text_field):
     data = {
         "FirstName": "John",
@@ -520,6 +791,43 @@ def test_pages(template_stream, pdf_samples, request):
         assert obj.pages[0].read() == f.read()
 
 
+def test_pages_are_split_lazily(template_stream, pdf_samples, monkeypatch):
+    split = []
+    get_page_stream = wrapper.get_page_stream
+
+    def _get_page_stream(pdf_file, page_number):
+        split.append(page_number)
+        return get_page_stream(pdf_file, page_number)
+
+    monkeypatch.setattr(wrapper, "get_page_stream", _get_page_stream)
+    monkeypatch.setattr(wrapper, "PAGES_CACHE_SIZE", 2)
+    obj = PdfWrapper(template_stream)
+
+    assert len(obj.pages) == 3
+    assert not split
+
+    with open(
+        os.path.join(pdf_samples, "pages", "sample_template_page_1.pdf"), "rb+"
+    ) as f:
+        assert obj.pages[-3].read() == f.read()
+    assert split == [0]
+
+    assert obj.pages[0] is obj.pages[-3]
+    assert split == [0]
+
+    assert [each.read() for each in obj.pages[:2]] == [
+        each.read() for each in obj.pages
+    ][:2]
+    assert split == [0, 1, 2]
+
+    assert obj.pages[0]
+    assert split == [0, 1, 2, 0]
+    assert obj.pages[5:] == []
+
+    with pytest.raises(IndexError):
+        obj.pages[3]
+
+
 def test_generate_coordinate_grid(template_stream, pdf_samples, request):
     expected_path = os.path.join(pdf_samples, "test_generate_coordinate_grid.pdf")
     with open(expected_path, "rb+") as f:
@@ -643,6 +951,77 @@ def test_update_radio_key(template_with_radiobutton_stream, pdf_samples, request
         assert obj.preview == expected
 
 
+def test_update_keys_in_one_pass(template_stream, data_dict):
+    obj = PdfWrapper(template_stream).update_widget_keys(
+        {"test": "test_2", "test_2": "test", ("check", 0): "CHECK", ("check", 1): "foo"}
+    )
+
+    assert obj.widgets.keys() == {
+        "test",
+        "test_2",
+        "test_3",
+        "CHECK",
+        "check_2",
+        "check_3",
+    }
+    filled = PdfReader(BytesIO(obj.fill({"test": "test_2", "test_2": "test_1"}).read()))
+    expected = PdfReader(
+        BytesIO(
+            PdfWrapper(template_stream)
+            .fill({"test": "test_1", "test_2": "test_2"})
+            .read()
+        )
+    )
+    for i, page in enumerate(filled.pages):
+        assert page.extract_text() == expected.pages[i].extract_text()
+
+
+def test_update_radio_keys_swapped(template_with_radiobutton_stream):
+    obj = PdfWrapper(template_with_radiobutton_stream).update_widget_keys(
+        {"radio_1": "radio_3", "radio_3": "radio_1"}
+    )
+
+    assert obj.widgets["radio_1"].number_of_options == 3
+    assert obj.widgets["radio_2"].number_of_options == 2
+    assert obj.widgets["radio_3"].number_of_options == 2
+
+    fields = PdfReader(
+        BytesIO(FormWrapper(obj.read()).fill({"radio_1": 2, "radio_3": 1}).read())
+    ).get_fields()
+    assert fields is not None
+    assert fields["radio_1"]["/V"] == "/2"
+    assert fields["radio_3"]["/V"] == "/1"
+
+
+def test_update_radio_keys_chained(template_with_radiobutton_stream):
+    obj = PdfWrapper(template_with_radiobutton_stream).update_widget_keys(
+        {"radio_1": "radio_2", "radio_2": "radio_3", "radio_3": "RADIO"}
+    )
+
+    assert obj.widgets["radio_2"].number_of_options == 2
+    assert obj.widgets["radio_3"].number_of_options == 2
+    assert obj.widgets["RADIO"].number_of_options == 3
+    assert "radio_1" not in obj.widgets
+
+
+def test_update_sejda_keys(sejda_template, pdf_samples):
+    expected_path = os.path.join(pdf_samples, "test_update_sejda_key.pdf")
+    with open(expected_path, "rb+") as f:
+        obj = PdfWrapper(sejda_template).update_widget_keys(
+            {
+                "year": "YEAR",
+                "at_future_date": "FUTURE_DATE",
+                "purchase_option": "PURCHASE_OPTION",
+                "buyer_signed_date": "BUYER_SIGNED_DATE",
+            }
+        )
+
+        expected = f.read()
+
+        assert len(obj.preview) == len(expected)
+        assert obj.preview == expected
+
+
 def test_update_sejda_key(sejda_template, pdf_samples, request):
     expected_path = os.path.join(pdf_samples, "test_update_sejda_key.pdf")
     with open(expected_path, "rb+") as f:
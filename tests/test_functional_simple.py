@@ -19,6 +19,24 @@ def test_fill(template_stream, pdf_samples, data_dict, request):
         assert obj.stream == expected
 
 
+def test_write(template_stream, pdf_samples, data_dict, tmp_path):
+    expected_path = os.path.join(pdf_samples, "simple", "sample_filled.pdf")
+    with open(expected_path, "rb+") as f:
+        expected = f.read()
+
+        path = os.path.join(tmp_path, "output.pdf")
+        obj = FormWrapper(template_stream).fill(data_dict).write(path)
+        assert isinstance(obj, FormWrapper)
+
+        with open(path, "rb+") as output:
+            assert output.read() == expected
+
+        with open(path, "wb+") as output:
+            obj.write(output)
+            output.seek(0)
+            assert output.read() == expected
+
+
 def test_fill_radiobutton(pdf_samples, template_with_radiobutton_stream, request):
     expected_path = os.path.join(pdf_samples, "simple", "sample_filled_radiobutton.pdf")
     with open(expected_path, "rb+") as f:
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from PyPDFForm import PdfWrapper
+from PyPDFForm.metrics import (FONT_METRICS, clear_font_metrics,
+                               get_font_metrics, string_width, string_widths)
+
+
+@pytest.fixture
+def liberation_serif_italic(font_samples):
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb+") as f:
+        PdfWrapper.register_font("LiberationSerif-Italic", f.read())
+
+    return "LiberationSerif-Italic"
+
+
+@pytest.mark.parametrize(
+    "font", ["Helvetica", "Courier-Bold", "Times-Roman", "Symbol", "ZapfDingbats"]
+)
+def test_string_width_matches_reportlab(font):
+    rnd = random.Random(font)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCXYZ0123456789 .,;\n✓€éα"
+    texts = [
+        "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 100)))
+        for _ in range(100)
+    ]
+
+    for font_size in [0.5, 8.5, 12, 13.86]:
+        expected = [stringWidth(text, font, font_size) for text in texts]
+        assert [string_width(text, font, font_size) for text in texts] == expected
+        assert string_widths(texts, font, font_size) == expected
+
+
+def test_string_width_matches_reportlab_ttf(liberation_serif_italic):
+    rnd = random.Random(liberation_serif_italic)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCXYZ0123456789 .,;\n✓€éα"
+    texts = [
+        "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 100)))
+        for _ in range(100)
+    ]
+
+    for font_size in [0.5, 8.5, 12, 13.86]:
+        assert string_widths(texts, liberation_serif_italic, font_size) == [
+            stringWidth(text, liberation_serif_italic, font_size) for text in texts
+        ]
+
+
+def test_font_metrics_loaded_once():
+    clear_font_metrics("Helvetica")
+    metrics = get_font_metrics("Helvetica")
+
+    assert FONT_METRICS["Helvetica"] is metrics
+    assert get_font_metrics("Helvetica") is metrics
+    a, b = metrics.char_units("a"), metrics.char_units("b")
+    assert metrics.text_units("aba") == a + b + a
+    assert set(metrics.widths) == {"a", "b"}
+
+
+def test_register_font_clears_font_metrics(liberation_serif_italic, font_samples):
+    metrics = get_font_metrics(liberation_serif_italic)
+    assert metrics.is_ttf
+
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb+") as f:
+        PdfWrapper.register_font(liberation_serif_italic, f.read())
+
+    assert liberation_serif_italic not in FONT_METRICS
+    assert get_font_metrics(liberation_serif_italic) is not metrics
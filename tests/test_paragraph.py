@@ -2,8 +2,21 @@
 # pylint: disable=line-too-long
 
 import os
+import random
+from copy import deepcopy
+
+import pytest
+from pypdf.generic import ArrayObject, FloatObject
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
 from PyPDFForm import PdfWrapper
+from PyPDFForm.constants import (FONT_SIZE_REDUCE_STEP, MARGIN_BETWEEN_LINES,
+                                 NEW_LINE_SYMBOL, Rect)
+from PyPDFForm.font import (adjust_paragraph_font_size,
+                            adjust_text_field_font_size)
+from PyPDFForm.middleware.text import Text
+from PyPDFForm.template import (adjust_each_line, get_paragraph_lines,
+                                split_characters_into_lines)
 
 
 def test_paragraph_y_coordinate(sample_template_with_paragraph, pdf_samples, request):
@@ -219,3 +232,156 @@ def test_paragraph_max_length(
         if os.name != "nt":
             assert len(obj.stream) == len(expected)
             assert obj.stream == expected
+
+
+def measure_each_line(text, middleware, width):
+    lines = []
+    split_by_new_line_symbol = text.split(NEW_LINE_SYMBOL)
+    for line in split_by_new_line_symbol:
+        current_line = ""
+        for each in line.split(" "):
+            line_extended = f"{current_line} {each}" if current_line else each
+            if (
+                stringWidth(line_extended, middleware.font, middleware.font_size)
+                <= width
+            ):
+                current_line = line_extended
+            else:
+                lines.append(current_line)
+                current_line = each
+        lines.append(
+            current_line + NEW_LINE_SYMBOL
+            if len(split_by_new_line_symbol) > 1
+            else current_line
+        )
+
+    result = []
+    for each in lines:
+        tracker = ""
+        for char in each:
+            check = tracker + char
+            if stringWidth(check, middleware.font, middleware.font_size) > width:
+                result.append(tracker)
+                tracker = char
+            else:
+                tracker = check
+        if tracker:
+            if (
+                result
+                and stringWidth(
+                    f"{tracker} {result[-1]}", middleware.font, middleware.font_size
+                )
+                <= width
+                and NEW_LINE_SYMBOL not in result[-1]
+            ):
+                result[-1] = f"{result[-1]}{tracker} "
+            else:
+                result.append(f"{tracker} ")
+
+    result = [each.replace(NEW_LINE_SYMBOL, "") for each in result]
+    if result:
+        result[-1] = result[-1][:-1]
+    return result
+
+
+@pytest.mark.parametrize(
+    "font", ["Helvetica", "Courier", "Times-Roman", "LiberationSerif-Italic"]
+)
+def test_paragraph_lines_match_measuring_each_line(font, font_samples):
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb+") as f:
+        PdfWrapper.register_font("LiberationSerif-Italic", f.read())
+
+    rnd = random.Random(font)
+    alphabet = "aaaabcdeefghijklmnoopqrstuvwxyzWM     \n\u2713\u20ac\u00e9"
+    for _ in range(200):
+        middleware = Text("paragraph")
+        middleware.font = font
+        middleware.font_size = rnd.choice([6, 8.5, 12, 13.86, 20])
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 300)))
+        width = rnd.choice([5, 20, 50, 137.3, 300])
+
+        assert adjust_each_line(
+            split_characters_into_lines(text.split(NEW_LINE_SYMBOL), middleware, width),
+            middleware,
+            width,
+        ) == measure_each_line(text, middleware, width)
+
+
+@pytest.mark.parametrize(
+    "font", ["Helvetica", "Courier", "Times-Roman", "LiberationSerif-Italic"]
+)
+def test_font_size_adjustments_match_reducing_step_by_step(font, font_samples):
+    with open(os.path.join(font_samples, "LiberationSerif-Italic.ttf"), "rb+") as f:
+        PdfWrapper.register_font("LiberationSerif-Italic", f.read())
+
+    rnd = random.Random(font)
+    alphabet = "aaaabcdeefghijklmnoopqrstuvwxyzWM     \n\u2713\u20ac\u00e9"
+    for _ in range(200):
+        middleware = Text(
+            "paragraph",
+            "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 400))),
+        )
+        middleware.font = font
+        middleware.font_size = rnd.choice([0.3, 6, 8.5, 12, 13.86, 20])
+        widget = {
+            Rect: ArrayObject(
+                [
+                    FloatObject(0),
+                    FloatObject(0),
+                    FloatObject(rnd.choice([0, 5, 50, 137.3, 300])),
+                    FloatObject(rnd.choice([5, 50, 100, 300])),
+                ]
+            )
+        }
+        width = float(widget[Rect][2])
+        height = float(widget[Rect][3])
+
+        expected = deepcopy(middleware)
+        while (
+            expected.font_size > FONT_SIZE_REDUCE_STEP
+            and stringWidth(expected.value, expected.font, expected.font_size) > width
+        ):
+            expected.font_size -= FONT_SIZE_REDUCE_STEP
+        adjusted = deepcopy(middleware)
+        adjust_text_field_font_size(widget, adjusted)
+        assert adjusted.font_size == expected.font_size
+
+        middleware.text_lines = get_paragraph_lines(widget, middleware)
+        expected = deepcopy(middleware)
+        while (
+            expected.font_size > FONT_SIZE_REDUCE_STEP
+            and len(expected.text_lines) * (expected.font_size + MARGIN_BETWEEN_LINES)
+            > height
+        ):
+            expected.font_size -= FONT_SIZE_REDUCE_STEP
+            expected.text_lines = get_paragraph_lines(widget, expected)
+        adjust_paragraph_font_size(widget, middleware)
+        assert middleware.font_size == expected.font_size
+        assert middleware.text_lines == expected.text_lines
+
+
+@pytest.mark.parametrize(
+    ("value", "font_size", "width"),
+    [
+        ("b", 7.3, 3.2247999999999997),
+        ("cc gbbbddagabgMMeWW dgbf", 8.5, 61.775999999999996),
+    ],
+)
+def test_text_field_font_size_at_rounding_boundaries(value, font_size, width):
+    middleware = Text("text", value)
+    middleware.font = "Helvetica"
+    middleware.font_size = font_size
+    widget = {
+        Rect: ArrayObject(
+            [FloatObject(0), FloatObject(0), FloatObject(width), FloatObject(10)]
+        )
+    }
+
+    expected = font_size
+    while (
+        expected > FONT_SIZE_REDUCE_STEP
+        and stringWidth(value, "Helvetica", expected) > width
+    ):
+        expected -= FONT_SIZE_REDUCE_STEP
+    adjust_text_field_font_size(widget, middleware)
+    assert middleware.font_size == expected
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+from re import findall
+
+import pytest
+from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, NameObject, TextStringObject
+from reportlab.pdfbase.acroform import AcroForm
+from reportlab.pdfbase.pdfmetrics import standardFonts
+
+from PyPDFForm.constants import (DA, DEFAULT_FONT, FONT_COLOR_IDENTIFIER,
+                                 FONT_SIZE_IDENTIFIER, Parent)
+from PyPDFForm.font import (auto_detect_font, get_text_field_font_color,
+                            get_text_field_font_size, parse_text_appearance)
+from PyPDFForm.patterns import TEXT_FIELD_APPEARANCE_PATTERNS
+from PyPDFForm.utils import traverse_pattern
+
+
+def split_each_time(widget):
+    font = DEFAULT_FONT
+    for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
+        text_appearance = traverse_pattern(pattern, widget)
+        if text_appearance:
+            for each in text_appearance.split(" "):
+                if not each.startswith("/"):
+                    continue
+                text_segments = findall("[A-Z][^A-Z]*", each.replace("/", ""))
+                match = None
+                if len(text_segments) == 1:
+                    for k, v in AcroForm.formFontNames.items():
+                        if v == text_segments[0]:
+                            match = k
+                            break
+                for standard_font in standardFonts if match is None else []:
+                    font_segments = findall(
+                        "[A-Z][^A-Z]*", standard_font.replace("-", "")
+                    )
+                    if len(font_segments) == len(text_segments) and all(
+                        val.startswith(text_segments[i])
+                        for i, val in enumerate(font_segments)
+                    ):
+                        match = standard_font
+                        break
+                if match is not None:
+                    font = match
+                    break
+            break
+
+    font_size = None
+    for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
+        text_appearance = traverse_pattern(pattern, widget)
+        if text_appearance and font_size is None:
+            properties = text_appearance.split(" ")
+            for i, val in enumerate(properties):
+                if val.startswith(FONT_SIZE_IDENTIFIER):
+                    font_size = float(properties[i - 1])
+                    break
+
+    font_color = (0, 0, 0)
+    for pattern in TEXT_FIELD_APPEARANCE_PATTERNS:
+        text_appearance = traverse_pattern(pattern, widget)
+        if text_appearance:
+            if FONT_COLOR_IDENTIFIER not in text_appearance:
+                break
+            properties = text_appearance.split(" ")
+            for i, val in enumerate(properties):
+                if val.startswith(FONT_COLOR_IDENTIFIER.replace(" ", "")):
+                    font_color = tuple(float(each) for each in properties[i - 3 : i])
+                    break
+
+    return font, 0 if font_size is None else font_size, font_color
+
+
+def text_field(text_appearance, parent_text_appearance=None):
+    result = DictionaryObject()
+    if text_appearance is not None:
+        result[NameObject(DA)] = TextStringObject(text_appearance)
+    if parent_text_appearance is not None:
+        result[NameObject(Parent)] = DictionaryObject(
+            {NameObject(DA): TextStringObject(parent_text_appearance)}
+        )
+
+    return result
+
+
+def sample_widgets():
+    pdf_samples = os.path.join(os.path.dirname(__file__), "..", "pdf_samples")
+    for path in sorted(glob.glob(os.path.join(pdf_samples, "*.pdf"))):
+        for page in PdfReader(path).pages:
+            for annot in page.get("/Annots") or []:
+                yield annot.get_object()
+
+
+@pytest.mark.parametrize(
+    "widget",
+    [
+        text_field(None),
+        text_field("/Helv 0 Tf 0 g"),
+        text_field("/Helv 0 Tf 0 g", "/Cour 8 Tf 0 g"),
+        text_field("/TiRo 12 Tf 1 0 0 rg"),
+        text_field("0 0.5 1 rg /CoBO 10 Tf"),
+        text_field("/Arial 8 Tf 0 0 1 rg"),
+        text_field("0 g", "/HeBo 9 Tf 1 0 0 rg"),
+        text_field("/Cour 7 Tf 1 1 0 rg", "/HeBo 9 Tf 0 g"),
+        text_field("/Cour 7 Tf 1 1 0 rg", "/HeBo 9 Tf 0 1 0 rg"),
+        text_field(None, "/TimesNewRomanPSMT 11 Tf 0 0 1 rg"),
+    ],
+)
+def test_text_appearance_matches_splitting_each_time(widget):
+    assert (
+        auto_detect_font(widget),
+        get_text_field_font_size(widget),
+        get_text_field_font_color(widget),
+    ) == split_each_time(widget)
+
+
+def test_text_appearance_of_sample_widgets_matches_splitting_each_time():
+    count = 0
+    for widget in sample_widgets():
+        assert (
+            auto_detect_font(widget),
+            get_text_field_font_size(widget),
+            get_text_field_font_color(widget),
+        ) == split_each_time(widget)
+        count += 1
+
+    assert count
+
+
+def test_text_appearance_parsed_once():
+    parse_text_appearance.cache_clear()
+    widgets = [text_field("/Helv 10 Tf 0 0 1 rg") for _ in range(100)]
+
+    for widget in widgets:
+        assert auto_detect_font(widget) == "Helvetica"
+        assert get_text_field_font_size(widget) == 10
+        assert get_text_field_font_color(widget) == (0, 0, 1)
+
+    assert parse_text_appearance.cache_info().misses == 1
+    assert parse_text_appearance("/Helv 10 Tf 0 0 1 rg") == (
+        "Helvetica",
+        10,
+        (0, 0, 1),
+    )
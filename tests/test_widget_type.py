@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import os
+
+from pypdf import PdfReader
+from pypdf.generic import DictionaryObject, NameObject
+
+from PyPDFForm.constants import FT, Subtype, Tx
+from PyPDFForm.patterns import WIDGET_TYPE_PATTERNS, get_widget_type
+from PyPDFForm.utils import find_pattern_match
+
+
+def match_widget_type_patterns(widget):
+    for patterns, _type in WIDGET_TYPE_PATTERNS:
+        if all(find_pattern_match(pattern, widget) for pattern in patterns):
+            return _type
+
+    return None
+
+
+def test_widget_type_matches_patterns_across_pdf_samples(pdf_samples):
+    types = set()
+    for path in sorted(
+        glob.glob(os.path.join(pdf_samples, "**", "*.pdf"), recursive=True)
+    ):
+        for page in PdfReader(path).pages:
+            for annot in page.annotations or []:
+                widget = dict(annot.get_object())
+                expected = match_widget_type_patterns(widget)
+                assert get_widget_type(widget) is expected, path
+                types.add(expected)
+
+    assert types == {_type for _, _type in WIDGET_TYPE_PATTERNS} | {None}
+
+
+def test_widget_type_skips_other_subtypes():
+    widget = DictionaryObject(
+        {
+            NameObject(Subtype): NameObject("/Link"),
+            NameObject(FT): NameObject(Tx),
+        }
+    )
+
+    assert get_widget_type(widget) is None